@@ -5,11 +5,55 @@
 
 import streamlit as st
 import pandas as pd
-from PIL import Image
-import io
-import zipfile
 from datetime import datetime
+import os
+import io
 import random
+import time
+import uuid
+from dataclasses import replace
+from functools import partial, wraps
+
+from converter import (
+    COLUMNAR_CODECS,
+    COLUMNAR_FORMATS,
+    DATA_FORMATS,
+    DEFAULT_PRESET,
+    EXCEL_MAX_ROWS,
+    JobOutput,
+    JobQueueFull,
+    MemoryBudgetExceeded,
+    StreamingZipWriter,
+    conversion_cache,
+    convert_data,
+    convert_dataframe,
+    convert_images_parallel,
+    csv_to_columnar_stream,
+    csv_to_xlsx_stream,
+    encoder_settings,
+    estimate_batch_cost,
+    estimate_data_cost,
+    get_file_extension,
+    make_cache_key,
+    job_manager,
+    make_thumbnail,
+    memory_governor,
+    preview_data,
+    probe_data,
+    probe_image,
+    list_sheets,
+    read_dataframe_compact,
+    merge_csvs_to_xlsx,
+    replace_extension,
+    render_prometheus,
+    read_with_fallback,
+    sheets_to_csv_zip,
+    sniff_csv,
+    stage,
+    start_metrics_server,
+    xlsx_to_csv_stream,
+)
+from converter import metrics
 
 
 # ==================== 쿠팡 파트너스 설정 ====================
@@ -54,6 +98,43 @@ AD_BANNERS = {
 }
 
 
+# ==================== 변환 설정 ====================
+# 이 크기를 넘는 CSV는 대용량 모드를 기본으로 켭니다
+STREAM_MODE_BYTES = 50 * 1024 * 1024
+
+# CSV 읽기 설정에서 고를 수 있는 값
+CSV_ENCODING_OPTIONS = ['utf-8', 'utf-8-sig', 'cp949', 'euc-kr', 'utf-16', 'latin-1']
+CSV_DELIMITER_LABELS = {',': "쉼표 (,)", ';': "세미콜론 (;)", '\t': "탭", '|': "세로선 (|)"}
+
+# 변환 결과 형식별 MIME 타입
+DATA_MIME_TYPES = {
+    'xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    'csv': "text/csv",
+    'parquet': "application/vnd.apache.parquet",
+    'feather': "application/vnd.apache.arrow.file",
+    'arrow': "application/vnd.apache.arrow.file",
+}
+
+# 이미지 인코더 프리셋 표시 이름
+IMAGE_PRESET_LABELS = {
+    "fastest": "속도 우선",
+    "balanced": "균형 (권장)",
+    "smallest": "용량 우선",
+}
+
+# JPEG 색차 샘플링 표시 이름 → Pillow subsampling 값
+JPEG_SUBSAMPLING = {"4:4:4": 0, "4:2:2": 1, "4:2:0": 2}
+
+# 작업 진행 상황을 새로 고치는 간격 (초)
+JOB_POLL_SECONDS = 1.0
+
+# ?admin=<토큰>으로 접속하면 단계별 성능 지표를 보여줍니다 (비워 두면 꺼짐)
+ADMIN_TOKEN = os.environ.get("CONVERTER_ADMIN_TOKEN", "")
+
+# CONVERTER_METRICS_PORT가 지정된 경우에만 /metrics 엔드포인트를 엽니다
+start_metrics_server()
+
+
 def show_context_ad(tab_type: str):
     """탭에 맞는 프리미엄 문맥 광고를 표시합니다."""
     if tab_type in AD_BANNERS:
@@ -97,6 +178,732 @@ def show_loading_ad(tab_type: str):
         )
 
 
+def show_csv_settings(dialect, file_key: str) -> dict:
+    """감지된 CSV 읽기 설정을 보여주고, 사용자가 바꾼 값을 반영해 반환합니다."""
+    encodings = list(dict.fromkeys([dialect.encoding, *CSV_ENCODING_OPTIONS]))
+    delimiters = list(dict.fromkeys([dialect.delimiter, *CSV_DELIMITER_LABELS]))
+    header_text = "있음" if dialect.has_header else "없음"
+    
+    with st.expander(
+        f"⚙️ CSV 읽기 설정 · 감지됨: {dialect.encoding} / "
+        f"{CSV_DELIMITER_LABELS.get(dialect.delimiter, repr(dialect.delimiter))} / 헤더 {header_text}"
+    ):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            encoding = st.selectbox("인코딩", encodings, key=f"csv_encoding_{file_key}")
+        with col2:
+            delimiter = st.selectbox(
+                "구분자",
+                delimiters,
+                format_func=lambda d: CSV_DELIMITER_LABELS.get(d, repr(d)),
+                key=f"csv_delimiter_{file_key}"
+            )
+        with col3:
+            has_header = st.checkbox("첫 행은 헤더", value=dialect.has_header, key=f"csv_header_{file_key}")
+    
+    dialect = replace(dialect, encoding=encoding, delimiter=delimiter, has_header=has_header)
+    return dialect.read_csv_kwargs()
+
+
+def encoder_option_inputs(target_format: str, preset: str) -> dict:
+    """선택한 형식의 인코더 설정 위젯을 그리고 값을 반환합니다 (초깃값은 프리셋 설정)."""
+    save_format = 'JPEG' if target_format == 'JPG' else target_format
+    defaults = encoder_settings(save_format, preset)
+    # 프리셋이나 형식을 바꾸면 초깃값도 바뀌도록 키에 포함합니다
+    suffix = f"{save_format}_{preset}"
+    if save_format == 'JPEG':
+        subsampling_names = list(JPEG_SUBSAMPLING)
+        return {
+            'quality': st.slider("품질", 1, 100, defaults.get('quality', 75), key=f"enc_quality_{suffix}"),
+            'optimize': st.checkbox("허프만 테이블 최적화", defaults.get('optimize', False),
+                                    key=f"enc_optimize_{suffix}"),
+            'progressive': st.checkbox("프로그레시브", defaults.get('progressive', False),
+                                       key=f"enc_progressive_{suffix}"),
+            'subsampling': JPEG_SUBSAMPLING[st.selectbox(
+                "색차 샘플링", subsampling_names, index=defaults.get('subsampling', 2),
+                key=f"enc_subsampling_{suffix}", help="4:4:4는 글자·선이 선명하고, 4:2:0은 파일이 작습니다."
+            )],
+        }
+    if save_format == 'PNG':
+        return {
+            'compress_level': st.slider("압축 수준", 0, 9, defaults.get('compress_level', 6),
+                                        key=f"enc_compress_{suffix}", help="높을수록 작지만 느립니다."),
+            'optimize': st.checkbox("최적화 (가장 느림)", defaults.get('optimize', False),
+                                    key=f"enc_optimize_{suffix}"),
+        }
+    lossless = st.checkbox("무손실", defaults.get('lossless', False), key=f"enc_lossless_{suffix}")
+    return {
+        'lossless': lossless,
+        'quality': st.slider("압축 노력" if lossless else "품질", 0, 100, defaults.get('quality', 80),
+                             key=f"enc_quality_{suffix}"),
+        'method': st.slider("방법 (0 빠름 ~ 6 작음)", 0, 6, defaults.get('method', 4), key=f"enc_method_{suffix}"),
+    }
+
+
+def session_id() -> str:
+    """
+    이 사용자의 세션 식별자.
+
+    작업 결과를 찾는 유일한 열쇠이므로 서버의 세션 상태에만 두고 주소에는 남기지 않습니다
+    (공유한 링크나 방문 기록으로 다른 사람의 결과를 받을 수 없게 합니다).
+    연결이 잠깐 끊겼다 이어지면 같은 세션이 유지되지만, 새 탭이나 새로 고침은 새 세션입니다.
+    """
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return st.session_state.session_id
+
+
+def run_image_job(batch_files: list, target_format: str, image_options: dict, priorities: list,
+                  output, progress) -> JobOutput:
+    """
+    이미지 변환 작업 (작업 스레드에서 실행). 여러 파일이면 결과를 ZIP으로 output에 기록합니다.
+
+    priorities는 파일별 예상 변환 시간으로, 오래 걸리는 파일부터 워커에 보냅니다.
+    """
+    mime = f"image/{target_format.lower()}"
+    # 여러 파일이면 변환이 끝나는 즉시 ZIP에 기록하고 결과 바이트는 버립니다
+    archive = StreamingZipWriter(fileobj=output) if len(batch_files) > 1 else None
+    
+    def converted_filename(name: str) -> str:
+        return replace_extension(name, target_format)
+    
+    def collect_result(result):
+        if result.ok and archive is not None:
+            with stage("zip", "image", bytes_in=len(result.data)):
+                archive.add(converted_filename(result.name), result.data)
+            result.data = None
+    
+    results = convert_images_parallel(
+        batch_files,
+        target_format,
+        on_progress=lambda done, total, name: progress(done, total, f"변환 중... ({done}/{total}) - {name}"),
+        on_result=collect_result,
+        cache=conversion_cache,
+        priorities=priorities,
+        **image_options,
+    )
+    warnings = [f"'{result.name}' 변환 중 문제가 발생했습니다. 파일을 확인해 주세요." for result in results if not result.ok]
+    if len(warnings) == len(results):
+        raise ValueError(warnings[0] if len(warnings) == 1 else "모든 파일 변환에 실패했습니다. 파일을 확인해 주세요.")
+    
+    notes = [f"✅ {len(results) - len(warnings)}개의 파일이 성공적으로 변환되었습니다!"]
+    unchanged = sum(result.passthrough for result in results)
+    if unchanged:
+        notes.append(f"ℹ️ {unchanged}개는 이미 {target_format} 형식이라 원본을 그대로 담았습니다.")
+    if archive is None:
+        result = results[0]
+        with stage("download", "image", bytes_in=len(result.data)):
+            output.write(result.data)
+        return JobOutput(converted_filename(result.name), mime, notes=notes)
+    
+    with stage("zip", "image") as record:
+        archive.finish()
+        record.bytes_out = archive.size
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return JobOutput(f"converted_images_{timestamp}.zip", "application/zip",
+                     members=list(archive.names), notes=notes, warnings=warnings)
+
+
+def run_data_job(data: bytes, file_name: str, file_ext: str, target: str, read_options: dict,
+                 codec, mode: str, sheets: list, sheet_priorities: list, newlines_in_values: bool,
+                 compact: bool, output, progress) -> JobOutput:
+    """
+    CSV/Excel/컬럼 형식 변환 작업 (작업 스레드에서 실행).
+
+    mode는 'sheets'(여러 시트를 CSV ZIP으로), 'stream'(일정한 메모리로 바로 기록),
+    'full'(전체를 읽어 변환, 결과 캐시 사용) 중 하나입니다.
+    compact를 켜면 전체 파싱할 때 dtype을 줄여 읽습니다. 결과는 같으므로 캐시 키에 넣지 않습니다.
+    sheet_priorities는 시트별 셀 수로, 큰 시트부터 워커에 보냅니다.
+    """
+    new_filename = replace_extension(file_name, target)
+    mime_type = DATA_MIME_TYPES[target.lower()]
+    notes = []
+    try:
+        if mode == 'sheets':
+            # 시트를 워커에 나눠 CSV로 만들고, 끝나는 대로 ZIP 하나에 담습니다
+            archive = StreamingZipWriter(fileobj=output)
+            sheet_results = sheets_to_csv_zip(
+                data, archive, sheets,
+                on_progress=lambda done, total, name: progress(done, total, f"시트 변환 중... ({done}/{total}) - {name}"),
+                priorities=sheet_priorities,
+            )
+            warnings = [f"'{result.name}' 시트 변환 중 문제가 발생했습니다." for result in sheet_results if not result.ok]
+            if len(warnings) == len(sheet_results):
+                raise ValueError("모든 시트 변환에 실패했습니다")
+            archive.finish()
+            return JobOutput(replace_extension(file_name, 'zip'), "application/zip",
+                             members=list(archive.names), warnings=warnings)
+        
+        if mode == 'stream':
+            # 결과는 작업 파일에 바로 기록하고, 입력만큼 큰 결과이므로 캐시하지 않습니다
+            with stage("stream", target.lower(), bytes_in=len(data)) as record:
+                source = io.BytesIO(data)
+
+                def rewind() -> None:
+                    # 샘플로 고른 인코딩이 뒤쪽에서 틀리면 쓰던 결과를 버리고 처음부터 다시 씁니다
+                    source.seek(0)
+                    output.seek(0)
+                    output.truncate()
+
+                if file_ext == 'csv' and target == 'XLSX':
+                    sheet_count = read_with_fallback(
+                        lambda options: csv_to_xlsx_stream(source, output, **options), read_options, rewind
+                    )['sheets']
+                    if sheet_count > 1:
+                        notes.append(f"📑 행이 많아 {sheet_count}개 시트로 나누어 저장했습니다.")
+                elif file_ext == 'csv':
+                    read_with_fallback(
+                        lambda options: csv_to_columnar_stream(
+                            source, output, target.lower(), codec,
+                            newlines_in_values=newlines_in_values, **options
+                        ),
+                        read_options, rewind,
+                    )
+                else:
+                    xlsx_to_csv_stream(source, output, **read_options)
+                record.bytes_out = output.tell()
+            return JobOutput(new_filename, mime_type, notes=notes)
+        
+        def compute() -> bytes:
+            if not compact:
+                return convert_data(data, file_ext, target, codec, **read_options)
+            df, report = read_dataframe_compact(data, file_ext, **read_options)
+            if report.bytes_saved > 0:
+                notes.append(
+                    f"🧮 메모리 절약 모드: {report.bytes_before / 1024 / 1024:,.1f} MB → "
+                    f"{report.bytes_after / 1024 / 1024:,.1f} MB ({report.ratio:.0%} 절약)"
+                )
+            return convert_dataframe(df, target, codec)
+        
+        # 같은 파일을 다시 변환하면 파싱 없이 캐시된 결과를 그대로 사용합니다
+        cache_key = make_cache_key(data, target, codec=codec, **read_options)
+        output.write(conversion_cache.get_or_compute(cache_key, compute))
+        return JobOutput(new_filename, mime_type, notes=notes)
+    except UnicodeDecodeError as e:
+        raise ValueError("선택한 인코딩으로 파일을 읽을 수 없습니다. 'CSV 읽기 설정'에서 인코딩을 바꿔 주세요.") from e
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError("변환 중 문제가 발생했습니다. 파일 형식을 확인해 주세요.") from e
+
+
+def run_merge_job(files: list, output, progress) -> JobOutput:
+    """여러 CSV를 시트별로 담은 통합 문서 하나로 합치는 작업 (작업 스레드에서 실행)."""
+    try:
+        # 파일마다 인코딩·구분자를 따로 감지합니다
+        merge_sources = [
+            (name.rsplit('.', 1)[0], io.BytesIO(data), sniff_csv(data).read_csv_kwargs())
+            for name, data in files
+        ]
+        with stage("merge", "xlsx", bytes_in=sum(len(data) for _, data in files)) as record:
+            merge_stats = merge_csvs_to_xlsx(merge_sources, output)
+            record.bytes_out = output.tell()
+    except UnicodeDecodeError as e:
+        raise ValueError("인코딩을 알 수 없는 CSV가 있습니다. 파일을 UTF-8로 저장해 다시 시도해 주세요.") from e
+    except Exception as e:
+        raise ValueError("합치는 중 문제가 발생했습니다. 모든 파일이 올바른 CSV인지 확인해 주세요.") from e
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return JobOutput(
+        f"merged_{timestamp}.xlsx", DATA_MIME_TYPES['xlsx'],
+        notes=[f"✅ CSV {len(files)}개를 시트 {merge_stats['sheets']}개로 합쳤습니다!"],
+    )
+
+
+def submit_job(kind: str, label: str, func, cost: int, hint: str = "") -> bool:
+    """
+    작업을 대기열에 넣습니다. 받을 수 없으면 이유를 보여 주고 False를 반환합니다.
+
+    hint는 메모리 예산을 넘을 때 덧붙일 안내 문구입니다.
+    """
+    try:
+        job_manager.submit(session_id(), kind, label, func, cost)
+    except MemoryBudgetExceeded as e:
+        st.error(f"⚠️ {e}.{hint}")
+        return False
+    except JobQueueFull as e:
+        st.error(f"⚠️ {e}.")
+        return False
+    return True
+
+
+def show_job(job) -> None:
+    """작업 하나의 진행 상황 또는 결과를 그립니다."""
+    with st.container(border=True):
+        col1, col2 = st.columns([5, 1])
+        with col1:
+            st.markdown(f"**{job.label}**")
+        with col2:
+            if job.status != "running" and st.button("✕", key=f"job_discard_{job.id}",
+                                                         help="결과를 지우거나 대기 중인 작업을 취소합니다."):
+                job_manager.discard(job.id)
+                st.rerun(scope="fragment")
+        
+        if job.status == "queued":
+            ahead = job_manager.position(job)
+            if job.message:
+                # 메모리 자리를 기다리는 중입니다 (그동안 다른 작업이 먼저 실행됩니다)
+                st.info(f"⏳ {job.message}")
+            else:
+                st.info(f"⏳ 대기 중입니다 (앞에 {ahead}개)" if ahead else "⏳ 곧 시작합니다")
+        elif job.status == "running":
+            fraction = job.done / job.total if job.total else 0.0
+            st.progress(fraction, text=job.message or "변환 중...")
+        elif job.status == "failed":
+            st.error(f"⚠️ {job.error}")
+        else:
+            for note in job.output.notes:
+                st.info(note)
+            for warning in job.output.warnings:
+                st.warning(f"⚠️ {warning}")
+            # 누를 때 결과 파일을 읽으므로 화면을 다시 그려도 메모리에 사본을 두지 않고,
+            # 눌러도 화면을 다시 실행하지 않습니다
+            st.download_button(
+                label=f"📥 {job.output.file_name} 다운로드",
+                data=job.read,
+                file_name=job.output.file_name,
+                mime=job.output.mime,
+                key=f"job_download_{job.id}",
+                on_click="ignore",
+                use_container_width=True
+            )
+            if job.output.members:
+                with st.expander("📂 개별 파일 다운로드"):
+                    for member in job.output.members:
+                        st.download_button(
+                            label=f"📥 {member}",
+                            data=partial(job.read_member, member),
+                            file_name=member,
+                            key=f"job_download_{job.id}_{member}",
+                            on_click="ignore",
+                        )
+            # finished가 아직 없으면(다른 스레드가 막 끝낸 순간) 지금을 기준으로 보여 줍니다
+            expires = datetime.fromtimestamp((job.finished or time.time()) + job_manager.ttl).strftime("%H:%M")
+            st.caption(f"{job.size / 1024 / 1024:,.1f} MB · {expires}까지 보관됩니다")
+
+
+def show_jobs(kind: str) -> None:
+    """이 세션의 작업 목록을 보여 줍니다. 진행 중인 작업이 있으면 주기적으로 새로 고칩니다."""
+    sid = session_id()
+    polling = any(job.active for job in job_manager.jobs(sid, kind))
+    
+    @st.fragment(run_every=JOB_POLL_SECONDS if polling else None)
+    def panel():
+        jobs = job_manager.jobs(sid, kind)
+        if not jobs:
+            return
+        st.markdown("### 📥 변환 결과")
+        for job in reversed(jobs):
+            show_job(job)
+        if polling and not any(job.active for job in jobs):
+            # 모두 끝났으면 전체를 다시 그려 주기적인 새로 고침을 멈춥니다
+            st.rerun()
+    
+    panel()
+
+
+def remember(slot: str, key, compute):
+    """
+    key가 지난 실행과 같으면 compute를 다시 하지 않고 세션에 보관한 값을 돌려줍니다.
+
+    업로드한 파일의 썸네일·미리보기처럼 다시 실행해도 같은 값이 나오는 작업에 씁니다.
+    slot마다 가장 최근 값 하나만 보관하므로 다른 파일을 올리면 이전 값은 버립니다.
+    """
+    memo = st.session_state.setdefault("remembered", {})
+    cached = memo.get(slot)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    value = compute()
+    memo[slot] = (key, value)
+    return value
+
+
+def timed(name: str, kind: str, func, *args):
+    """func를 실행하며 소요 시간을 단계 지표로 남깁니다."""
+    with stage(name, kind):
+        return func(*args)
+
+
+def probe_uploads(files: list, target_format: str, image_options: dict) -> list:
+    """업로드한 이미지마다 헤더만 읽은 ProbeResult. 파일과 변환 설정이 같으면 다시 읽지 않습니다."""
+    def probe():
+        with stage("probe", "image", bytes_in=sum(f.size for f in files)):
+            return [probe_image(f.name, f.getbuffer(), target_format, **image_options) for f in files]
+    return remember("image_probes", ([f.file_id for f in files], target_format, image_options), probe)
+
+
+def preview_thumbnails(files: list) -> list:
+    """미리보기 썸네일 목록 (만들 수 없는 파일은 None). 같은 파일이면 다시 디코딩하지 않습니다."""
+    def render():
+        thumbnails = []
+        with stage("thumbnail", "image", bytes_in=sum(f.size for f in files)):
+            for img_file in files:
+                try:
+                    # 원본 대신 축소 디코딩한 썸네일만 브라우저로 보냅니다
+                    thumbnails.append(make_thumbnail(img_file.getbuffer()))
+                except Exception:
+                    thumbnails.append(None)
+        return thumbnails
+    return remember("image_thumbnails", [f.file_id for f in files], render)
+
+
+def tab_fragment(kind: str):
+    """
+    탭 내용을 그리는 함수를 fragment로 만듭니다.
+
+    탭 안의 위젯을 조작하면 그 탭만 다시 실행되고 CSS, 헤더, 다른 탭은 다시 그리지 않습니다.
+    실행할 때마다 소요 시간을 'fragment' 단계로 기록해 페이지 전체 실행('rerun')과 비교할 수 있습니다.
+    """
+    def decorate(func):
+        @st.fragment
+        @wraps(func)
+        def run():
+            started = time.perf_counter()
+            try:
+                func()
+            finally:
+                metrics.registry.record(metrics.StageRecord(
+                    kind=kind, stage="fragment", seconds=time.perf_counter() - started
+                ))
+        return run
+    return decorate
+
+
+# ==================== 탭 화면 ====================
+# 탭 안의 위젯을 조작하면 페이지 전체가 아니라 그 탭만 다시 실행됩니다
+
+@tab_fragment("image")
+def image_tab() -> None:
+    """이미지 변환소: 업로드, 변환 설정, 미리보기, 변환 작업."""
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        # 파일 업로드
+        uploaded_images = st.file_uploader(
+            "이미지 파일을 선택하세요 (여러 개 선택 가능)",
+            type=['png', 'jpg', 'jpeg', 'webp'],
+            accept_multiple_files=True,
+            key="image_uploader",
+            help="PNG, JPG, JPEG, WEBP 형식의 이미지를 업로드하세요."
+        )
+    
+    with col2:
+        # 변환 형식 선택
+        target_format = st.selectbox(
+            "변환할 형식 선택",
+            options=['PNG', 'JPG', 'WEBP'],
+            index=0,
+            key="image_format",
+            help="변환하고 싶은 이미지 형식을 선택하세요."
+        )
+        
+        # 크기 조정: 원본 해상도를 만들지 않고 줄여서 디코딩합니다
+        image_options = {}
+        resize_mode = st.selectbox(
+            "📐 크기 조정",
+            options=["원본 크기", "긴 변 최대 길이", "배율"],
+            key="image_resize",
+            help="웹용 이미지처럼 작게 만들 때 사용하세요. 큰 사진일수록 변환이 빨라집니다."
+        )
+        if resize_mode == "긴 변 최대 길이":
+            image_options['max_size'] = st.number_input(
+                "긴 변 최대 길이 (px)", min_value=16, max_value=20000, value=1200, step=100,
+                key="image_max_size"
+            )
+        elif resize_mode == "배율":
+            image_options['scale'] = st.slider(
+                "배율 (%)", min_value=5, max_value=100, value=50, step=5, key="image_scale"
+            ) / 100
+        
+        # JPG는 투명도를 지원하지 않으므로 투명한 부분을 채울 색을 고릅니다
+        if target_format == 'JPG':
+            image_options['background'] = st.color_picker(
+                "🎨 투명 배경 색", value="#FFFFFF", key="image_background",
+                help="PNG·WEBP의 투명한 부분을 이 색으로 채웁니다."
+            )
+        
+        # 인코더 프리셋: 변환 속도와 파일 크기 사이에서 고릅니다
+        image_options['preset'] = st.selectbox(
+            "⚙️ 인코딩",
+            options=list(IMAGE_PRESET_LABELS),
+            format_func=IMAGE_PRESET_LABELS.get,
+            index=list(IMAGE_PRESET_LABELS).index(DEFAULT_PRESET),
+            key="image_preset",
+            help="속도 우선은 변환이 빠르고, 용량 우선은 파일이 작아집니다."
+        )
+        with st.expander("고급 인코더 설정"):
+            if st.checkbox("직접 설정", key="image_custom_encoder"):
+                image_options['encoder_options'] = encoder_option_inputs(target_format, image_options['preset'])
+    
+    if uploaded_images:
+        st.markdown("---")
+        st.subheader(f"📁 업로드된 파일: {len(uploaded_images)}개")
+        
+        # 헤더만 읽어 크기와 변환 비용을 보고, 한도를 넘는 파일은 디코딩하기 전에 뺍니다
+        probes = probe_uploads(uploaded_images, target_format, image_options)
+        accepted = [img_file for img_file, probe in zip(uploaded_images, probes) if probe.ok]
+        for probe in probes:
+            if not probe.ok:
+                st.error(f"⚠️ {probe.error}. 이 파일은 변환하지 않습니다.")
+        
+        # 업로드된 이미지 미리보기
+        if accepted:
+            preview_cols = st.columns(min(len(accepted), 4))
+            thumbnails = preview_thumbnails(accepted[:4])
+            for idx, (img_file, thumbnail) in enumerate(zip(accepted[:4], thumbnails)):
+                with preview_cols[idx % 4]:
+                    if thumbnail is not None:
+                        st.image(thumbnail, caption=img_file.name, use_container_width=True)
+                    else:
+                        st.warning(f"미리보기 불가: {img_file.name}")
+        
+        if len(accepted) > 4:
+            st.info(f"...외 {len(accepted) - 4}개의 파일이 더 있습니다.")
+        
+        st.markdown("---")
+        
+        # 변환 버튼: 작업 대기열에 넣고, 결과는 아래 패널에서 받습니다
+        if st.button("🔄 변환하기", key="convert_images", type="primary", use_container_width=True,
+                     disabled=not accepted):
+            # 업로드 버퍼를 복사하지 않는 bytes로 넘겨 화면이 다시 실행돼도 작업이 원본을 잃지 않게 합니다
+            with stage("upload", "image", bytes_in=sum(f.size for f in accepted)):
+                batch_files = [
+                    (img_file.name, get_file_extension(img_file.name), img_file.getvalue())
+                    for img_file in accepted
+                ]
+            accepted_probes = [probe for probe in probes if probe.ok]
+            # 헤더에서 추정한 메모리로 예약하고 (그대로 담을 파일은 0), 오래 걸리는 파일부터 변환합니다
+            batch_cost = estimate_batch_cost([probe.memory for probe in accepted_probes])
+            if submit_job(
+                "image",
+                f"이미지 {len(batch_files)}개 → {target_format}",
+                partial(run_image_job, batch_files, target_format, image_options,
+                        [probe.seconds for probe in accepted_probes]),
+                batch_cost,
+                hint=" '크기 조정'을 사용하거나 파일을 나눠서 변환해 주세요.",
+            ):
+                # 로딩 중 광고 표시 (작업이 끝나면 화면을 다시 그리며 사라집니다)
+                show_loading_ad("이미지")
+    else:
+        # 안내 메시지
+        st.info("👆 위에서 이미지 파일을 업로드해 주세요.")
+    
+    # 이 세션의 변환 작업 (화면을 다시 그리거나 연결이 잠깐 끊겨도 결과가 남아 있습니다)
+    show_jobs("image")
+
+
+@tab_fragment("data")
+def data_tab() -> None:
+    """엑셀/데이터 변환소: 업로드, 읽기 설정, 미리보기, 변환·합치기 작업."""
+    # 파일 업로드
+    uploaded_data = st.file_uploader(
+        "CSV, Excel, Parquet, Feather, Arrow 파일을 선택하세요",
+        type=['csv', 'xlsx', 'xls', *COLUMNAR_FORMATS],
+        key="data_uploader",
+        help="CSV·Excel과 Parquet·Feather·Arrow 형식을 서로 변환합니다."
+    )
+    
+    if uploaded_data:
+        file_ext = get_file_extension(uploaded_data.name)
+        
+        st.markdown("---")
+        
+        # 파일 정보 표시
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("📄 파일명", uploaded_data.name)
+        with col2:
+            st.metric("📁 현재 형식", file_ext.upper())
+        with col3:
+            # 기존 동작대로 CSV는 Excel로, 나머지는 CSV로 기본 선택합니다
+            target_options = [fmt.upper() for fmt in DATA_FORMATS if fmt != file_ext]
+            target = st.selectbox(
+                "🎯 변환 형식",
+                target_options,
+                index=target_options.index("XLSX" if file_ext == 'csv' else "CSV"),
+                key=f"data_target_{file_ext}"
+            )
+        
+        try:
+            # 데이터 읽기
+            if file_ext == 'csv':
+                # 앞부분 샘플로 읽기 설정을 감지합니다 (파일이 바뀔 때만)
+                dialect = remember("csv_dialect", uploaded_data.file_id,
+                                   lambda: timed("sniff", "csv", sniff_csv, uploaded_data.getbuffer()))
+                read_options = show_csv_settings(dialect, f"{uploaded_data.name}_{uploaded_data.size}")
+            else:
+                read_options = {}
+            
+            # 시트가 여러 개인 Excel: CSV로는 여러 시트를 ZIP 하나로, 다른 형식으로는 한 시트를 고릅니다
+            sheet_names, selected_sheets = [], []
+            if file_ext == 'xlsx':
+                sheet_names = remember("xlsx_sheets", uploaded_data.file_id,
+                                       lambda: timed("sheets", "xlsx", list_sheets, uploaded_data.getbuffer()))
+                sheet_key = f"data_sheets_{uploaded_data.name}_{uploaded_data.size}"
+                if len(sheet_names) > 1 and target == 'CSV':
+                    selected_sheets = st.multiselect(
+                        f"📑 변환할 시트 (전체 {len(sheet_names)}개)",
+                        sheet_names,
+                        default=sheet_names,
+                        key=sheet_key,
+                        help="두 개 이상 고르면 시트마다 CSV를 만들어 ZIP 하나로 받습니다."
+                    )
+                elif len(sheet_names) > 1:
+                    selected_sheets = [st.selectbox("📑 변환할 시트", sheet_names, key=f"{sheet_key}_single")]
+                if selected_sheets:
+                    read_options = {'sheet_name': selected_sheets[0]}
+                elif len(sheet_names) > 1:
+                    st.warning("변환할 시트를 하나 이상 선택해 주세요.")
+            sheets_missing = len(sheet_names) > 1 and not selected_sheets
+            multi_sheet = len(selected_sheets) > 1
+            
+            # 미리보기는 앞부분만 읽고, 전체 파싱은 변환할 때 한 번만 합니다
+            # (읽기 설정이나 시트가 바뀔 때만 다시 읽습니다)
+            def read_preview():
+                with stage("preview", file_ext, bytes_in=uploaded_data.size):
+                    return preview_data(uploaded_data.getbuffer(), file_ext, **read_options)
+            preview = remember("data_preview", (uploaded_data.file_id, read_options), read_preview)
+            
+            # 데이터 미리보기
+            st.subheader("📋 데이터 미리보기")
+            st.dataframe(preview.frame, use_container_width=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                row_label = f"{preview.rows:,}개 행" if preview.exact else f"약 {preview.rows:,}개 행"
+                if multi_sheet:
+                    st.info(f"📊 시트 {len(selected_sheets)}개 · 첫 시트 '{selected_sheets[0]}': {row_label}")
+                else:
+                    st.info(f"📊 총 {row_label}, {len(preview.frame.columns)}개 열")
+            
+            with col2:
+                # 시트 한도를 넘거나 큰 파일이면 기본으로 켭니다
+                if multi_sheet:
+                    # 여러 시트 변환은 항상 시트를 한 행씩 읽어 기록합니다
+                    stream_help = None
+                elif file_ext == 'csv' and target == 'XLSX':
+                    stream_help = (
+                        f"CSV를 나눠 읽어 일정한 메모리로 변환합니다. "
+                        f"{EXCEL_MAX_ROWS - 1:,}행을 넘으면 다음 시트로 자동으로 이어집니다."
+                    )
+                elif file_ext == 'csv':
+                    stream_help = "CSV를 블록 단위로 병렬 파싱해 일정한 메모리로 바로 기록합니다."
+                elif file_ext == 'xlsx' and target == 'CSV':
+                    stream_help = "Excel을 한 행씩 읽으며 바로 CSV로 기록해 일정한 메모리로 변환합니다."
+                else:
+                    stream_help = None
+                
+                if stream_help:
+                    stream_mode = st.checkbox(
+                        "🚀 대용량 모드",
+                        value=preview.rows >= EXCEL_MAX_ROWS or uploaded_data.size > STREAM_MODE_BYTES,
+                        key="stream_mode",
+                        help=stream_help
+                    )
+                else:
+                    stream_mode = False
+                
+                # 전체를 읽어 CSV/XLSX로 쓸 때는 dtype을 줄여 읽어도 결과가 같습니다
+                if not stream_mode and not multi_sheet and target in ('CSV', 'XLSX'):
+                    compact_mode = st.checkbox(
+                        "🧮 메모리 절약 모드",
+                        value=True,
+                        key="compact_mode",
+                        help="정수는 작은 형식으로, 반복되는 글자는 범주형으로 읽어 메모리를 아낍니다. 결과 파일은 같습니다."
+                    )
+                else:
+                    compact_mode = False
+            
+            # 컬럼 기반 형식은 압축 코덱을 고를 수 있습니다 (첫 번째가 기본값)
+            codec = None
+            if target.lower() in COLUMNAR_CODECS:
+                codec = st.selectbox(
+                    "🗜️ 압축 코덱",
+                    COLUMNAR_CODECS[target.lower()],
+                    key=f"data_codec_{target}",
+                    help="zstd는 작고, lz4·snappy는 빠르며, none은 압축하지 않습니다."
+                )
+            
+            st.markdown("---")
+            
+            # 변환 버튼: 작업 대기열에 넣고, 결과는 아래 패널에서 받습니다
+            if st.button("🔄 변환하기", key="convert_data", type="primary", use_container_width=True,
+                         disabled=sheets_missing):
+                data = uploaded_data.getvalue()
+                # 스트리밍 변환은 일정한 메모리만, 전체 파싱은 입력의 몇 배를 씁니다
+                # (Excel은 시트 XML 앞부분의 크기 정보로 셀 수를 보고 추정합니다)
+                sheet_priorities = []
+                if multi_sheet:
+                    mode = 'sheets'
+                    probe = probe_data(uploaded_data.name, data, file_ext, 'csv', stream=True)
+                    data_cost = estimate_batch_cost([probe.memory] * len(selected_sheets))
+                    # 큰 시트부터 워커에 보냅니다
+                    sheet_cells = {sheet[0]: sheet[3] for sheet in probe.sheets}
+                    sheet_priorities = [sheet_cells.get(name, 0) for name in selected_sheets]
+                elif stream_mode:
+                    mode = 'stream'
+                    probe = probe_data(uploaded_data.name, data, file_ext, target, stream=True)
+                    data_cost = probe.memory
+                else:
+                    mode = 'full'
+                    probe = probe_data(uploaded_data.name, data, file_ext, target, compact=compact_mode,
+                                       sheet_name=read_options.get('sheet_name'))
+                    cached = make_cache_key(data, target, codec=codec, **read_options) in conversion_cache
+                    data_cost = 0 if cached else probe.memory
+                
+                job_label = f"{uploaded_data.name} → {target}"
+                if multi_sheet:
+                    job_label += f" (시트 {len(selected_sheets)}개)"
+                hint = " '🚀 대용량 모드'를 켜면 일정한 메모리로 변환합니다." if stream_help and not stream_mode else ""
+                if data_cost and not probe.ok:
+                    st.error(f"⚠️ {probe.error}.{hint}")
+                elif submit_job(
+                    "data",
+                    job_label,
+                    partial(
+                        run_data_job, data, uploaded_data.name, file_ext, target, read_options, codec,
+                        # 따옴표가 없는 파일이면 값 안 줄바꿈이 없으므로 병렬 파싱을 켭니다
+                        mode, selected_sheets, sheet_priorities, not preview.exact, compact_mode,
+                    ),
+                    data_cost,
+                    hint=hint,
+                ):
+                    show_loading_ad("엑셀")
+                        
+        except UnicodeDecodeError:
+            st.error("⚠️ 선택한 인코딩으로 파일을 읽을 수 없습니다. 'CSV 읽기 설정'에서 인코딩을 바꿔 주세요.")
+        except Exception:
+            st.error("⚠️ 파일을 읽는 중 문제가 발생했습니다. 올바른 CSV 또는 Excel 파일인지 확인해 주세요.")
+    else:
+        # 안내 메시지
+        st.info("👆 위에서 CSV 또는 Excel 파일을 업로드해 주세요.")
+    
+    # 여러 CSV를 시트별로 담은 통합 문서 하나로 합치기
+    with st.expander("📚 여러 CSV를 Excel 파일 하나로 합치기"):
+        merge_files = st.file_uploader(
+            "합칠 CSV 파일을 선택하세요 (여러 개 선택 가능)",
+            type=['csv'],
+            accept_multiple_files=True,
+            key="merge_uploader",
+            help="파일마다 시트 하나씩 만들고, 파일명을 시트 이름으로 사용합니다."
+        )
+        
+        if merge_files and st.button("📚 합치기", key="merge_csvs", use_container_width=True):
+            merge_inputs = [(csv_file.name, csv_file.getvalue()) for csv_file in merge_files]
+            merge_size = sum(len(data) for _, data in merge_inputs)
+            submit_job(
+                "data",
+                f"CSV {len(merge_inputs)}개 → Excel 합치기",
+                partial(run_merge_job, merge_inputs),
+                # 시트마다 나눠 읽어 기록하므로 스트리밍 변환과 같은 비용입니다
+                estimate_data_cost(merge_size, 'csv', 'xlsx', stream=True),
+            )
+    
+    show_jobs("data")
+
+
+# 페이지 전체 실행 시간 ('rerun' 단계, 탭만 다시 실행될 때는 'fragment' 단계로 따로 기록합니다)
+page_started = time.perf_counter()
+
 # Google 인증 파일 제공
 query_params = st.query_params
 if "google-verification" in query_params:
@@ -487,73 +1294,6 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-def convert_image(image_bytes: bytes, original_format: str, target_format: str) -> bytes:
-    """
-    이미지를 원하는 포맷으로 변환합니다.
-    
-    Args:
-        image_bytes: 원본 이미지 바이트 데이터
-        original_format: 원본 이미지 형식
-        target_format: 변환할 이미지 형식
-    
-    Returns:
-        변환된 이미지의 바이트 데이터
-    """
-    # 이미지 열기
-    img = Image.open(io.BytesIO(image_bytes))
-    
-    # RGBA 모드인 경우 JPG 변환 시 RGB로 변환 필요
-    if target_format.upper() == "JPG" or target_format.upper() == "JPEG":
-        if img.mode in ('RGBA', 'LA', 'P'):
-            # 알파 채널이 있는 경우 흰색 배경으로 합성
-            background = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'P':
-                img = img.convert('RGBA')
-            background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-            img = background
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
-        save_format = 'JPEG'
-    else:
-        save_format = target_format.upper()
-        if save_format == 'JPG':
-            save_format = 'JPEG'
-    
-    # 메모리에 저장
-    output_buffer = io.BytesIO()
-    
-    if save_format == 'JPEG':
-        img.save(output_buffer, format=save_format, quality=95)
-    else:
-        img.save(output_buffer, format=save_format)
-    
-    output_buffer.seek(0)
-    return output_buffer.getvalue()
-
-
-def get_file_extension(filename: str) -> str:
-    """파일명에서 확장자를 추출합니다."""
-    return filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
-
-
-def create_zip_from_files(files_data: list) -> bytes:
-    """
-    여러 파일을 ZIP으로 압축합니다.
-    
-    Args:
-        files_data: (파일명, 바이트데이터) 튜플의 리스트
-    
-    Returns:
-        ZIP 파일의 바이트 데이터
-    """
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for filename, data in files_data:
-            zip_file.writestr(filename, data)
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue()
-
-
 # 탭 생성
 tab1, tab2 = st.tabs(["🖼️ 이미지 변환소", "📊 엑셀/데이터 변환소"])
 
@@ -573,129 +1313,7 @@ with tab1:
     # 문맥 광고 배너
     show_context_ad("이미지")
     
-    col1, col2 = st.columns([2, 1])
-    
-    with col1:
-        # 파일 업로드
-        uploaded_images = st.file_uploader(
-            "이미지 파일을 선택하세요 (여러 개 선택 가능)",
-            type=['png', 'jpg', 'jpeg', 'webp'],
-            accept_multiple_files=True,
-            key="image_uploader",
-            help="PNG, JPG, JPEG, WEBP 형식의 이미지를 업로드하세요."
-        )
-    
-    with col2:
-        # 변환 형식 선택
-        target_format = st.selectbox(
-            "변환할 형식 선택",
-            options=['PNG', 'JPG', 'WEBP'],
-            index=0,
-            key="image_format",
-            help="변환하고 싶은 이미지 형식을 선택하세요."
-        )
-    
-    if uploaded_images:
-        st.markdown("---")
-        st.subheader(f"📁 업로드된 파일: {len(uploaded_images)}개")
-        
-        # 업로드된 이미지 미리보기
-        preview_cols = st.columns(min(len(uploaded_images), 4))
-        for idx, img_file in enumerate(uploaded_images[:4]):
-            with preview_cols[idx % 4]:
-                try:
-                    img = Image.open(img_file)
-                    st.image(img, caption=img_file.name, use_container_width=True)
-                    # 파일 포인터 초기화
-                    img_file.seek(0)
-                except Exception:
-                    st.warning(f"미리보기 불가: {img_file.name}")
-        
-        if len(uploaded_images) > 4:
-            st.info(f"...외 {len(uploaded_images) - 4}개의 파일이 더 있습니다.")
-        
-        st.markdown("---")
-        
-        # 변환 버튼
-        if st.button("🔄 변환하기", key="convert_images", type="primary", use_container_width=True):
-            converted_files = []
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            # 로딩 중 광고 표시
-            loading_ad_placeholder = st.empty()
-            with loading_ad_placeholder.container():
-                show_loading_ad("이미지")
-            
-            for idx, img_file in enumerate(uploaded_images):
-                try:
-                    status_text.text(f"변환 중... ({idx + 1}/{len(uploaded_images)}) - {img_file.name}")
-                    
-                    # 원본 확장자 확인
-                    original_ext = get_file_extension(img_file.name)
-                    
-                    # 이미지 변환
-                    img_bytes = img_file.read()
-                    converted_bytes = convert_image(img_bytes, original_ext, target_format)
-                    
-                    # 새 파일명 생성
-                    new_filename = img_file.name.rsplit('.', 1)[0] + '.' + target_format.lower()
-                    converted_files.append((new_filename, converted_bytes))
-                    
-                    # 진행률 업데이트
-                    progress_bar.progress((idx + 1) / len(uploaded_images))
-                    
-                except Exception as e:
-                    st.error(f"⚠️ '{img_file.name}' 변환 중 문제가 발생했습니다. 파일을 확인해 주세요.")
-                    continue
-            
-            status_text.empty()
-            progress_bar.empty()
-            loading_ad_placeholder.empty()
-            
-            if converted_files:
-                st.success(f"✅ {len(converted_files)}개의 파일이 성공적으로 변환되었습니다!")
-                
-                # 다운로드 섹션
-                st.markdown("### 📥 다운로드")
-                
-                if len(converted_files) == 1:
-                    # 단일 파일 다운로드
-                    filename, data = converted_files[0]
-                    st.download_button(
-                        label=f"📥 {filename} 다운로드",
-                        data=data,
-                        file_name=filename,
-                        mime=f"image/{target_format.lower()}",
-                        use_container_width=True
-                    )
-                else:
-                    # 여러 파일: ZIP으로 압축 다운로드
-                    zip_data = create_zip_from_files(converted_files)
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    zip_filename = f"converted_images_{timestamp}.zip"
-                    
-                    st.download_button(
-                        label=f"📥 모든 파일 다운로드 (ZIP)",
-                        data=zip_data,
-                        file_name=zip_filename,
-                        mime="application/zip",
-                        use_container_width=True
-                    )
-                    
-                    # 개별 다운로드 옵션
-                    with st.expander("📂 개별 파일 다운로드"):
-                        for filename, data in converted_files:
-                            st.download_button(
-                                label=f"📥 {filename}",
-                                data=data,
-                                file_name=filename,
-                                mime=f"image/{target_format.lower()}",
-                                key=f"download_{filename}"
-                            )
-    else:
-        # 안내 메시지
-        st.info("👆 위에서 이미지 파일을 업로드해 주세요.")
+    image_tab()
 
 
 # ==================== 탭 2: 엑셀/데이터 변환소 ====================
@@ -713,99 +1331,40 @@ with tab2:
     # 문맥 광고 배너
     show_context_ad("엑셀")
     
-    # 파일 업로드
-    uploaded_data = st.file_uploader(
-        "CSV 또는 Excel 파일을 선택하세요",
-        type=['csv', 'xlsx', 'xls'],
-        key="data_uploader",
-        help="CSV 파일은 Excel로, Excel 파일은 CSV로 변환됩니다."
-    )
-    
-    if uploaded_data:
-        file_ext = get_file_extension(uploaded_data.name)
-        
-        st.markdown("---")
-        
-        # 파일 정보 표시
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("📄 파일명", uploaded_data.name)
-        with col2:
-            st.metric("📁 현재 형식", file_ext.upper())
-        with col3:
-            target = "XLSX" if file_ext == 'csv' else "CSV"
-            st.metric("🎯 변환 형식", target)
-        
-        try:
-            # 데이터 읽기
-            if file_ext == 'csv':
-                # CSV 인코딩 자동 감지 시도
-                try:
-                    df = pd.read_csv(uploaded_data, encoding='utf-8')
-                except UnicodeDecodeError:
-                    uploaded_data.seek(0)
-                    try:
-                        df = pd.read_csv(uploaded_data, encoding='cp949')
-                    except UnicodeDecodeError:
-                        uploaded_data.seek(0)
-                        df = pd.read_csv(uploaded_data, encoding='euc-kr')
-            else:
-                df = pd.read_excel(uploaded_data, engine='openpyxl')
-            
-            # 데이터 미리보기
-            st.subheader("📋 데이터 미리보기")
-            st.dataframe(df.head(10), use_container_width=True)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.info(f"📊 총 {len(df):,}개 행, {len(df.columns)}개 열")
-            
-            st.markdown("---")
-            
-            # 변환 버튼
-            if st.button("🔄 변환하기", key="convert_data", type="primary", use_container_width=True):
-                with st.spinner("변환 중..."):
-                    try:
-                        output_buffer = io.BytesIO()
-                        
-                        if file_ext == 'csv':
-                            # CSV → Excel 변환
-                            df.to_excel(output_buffer, index=False, engine='xlsxwriter')
-                            new_filename = uploaded_data.name.rsplit('.', 1)[0] + '.xlsx'
-                            mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        else:
-                            # Excel → CSV 변환
-                            df.to_csv(output_buffer, index=False, encoding='utf-8-sig')
-                            new_filename = uploaded_data.name.rsplit('.', 1)[0] + '.csv'
-                            mime_type = "text/csv"
-                        
-                        output_buffer.seek(0)
-                        
-                        st.success("✅ 변환이 완료되었습니다!")
-                        
-                        st.download_button(
-                            label=f"📥 {new_filename} 다운로드",
-                            data=output_buffer.getvalue(),
-                            file_name=new_filename,
-                            mime=mime_type,
-                            use_container_width=True
-                        )
-                        
-                    except Exception as e:
-                        st.error("⚠️ 변환 중 문제가 발생했습니다. 파일 형식을 확인해 주세요.")
-                        
-        except Exception as e:
-            st.error("⚠️ 파일을 읽는 중 문제가 발생했습니다. 올바른 CSV 또는 Excel 파일인지 확인해 주세요.")
-    else:
-        # 안내 메시지
-        st.info("👆 위에서 CSV 또는 Excel 파일을 업로드해 주세요.")
+    data_tab()
 
 
-# 푸터
-st.markdown("""                                                                                                                                           
+# ==================== 관리자: 성능 지표 ====================
+if ADMIN_TOKEN and st.query_params.get("admin") == ADMIN_TOKEN:
+    with st.expander("📈 단계별 성능 지표", expanded=True):
+        snapshot = metrics.registry.snapshot()
+        if snapshot:
+            st.dataframe(pd.DataFrame(snapshot), use_container_width=True, hide_index=True)
+        else:
+            st.info("아직 기록된 변환이 없습니다.")
+        cache_stats = conversion_cache.stats()
+        st.caption(
+            f"캐시 적중률 {cache_stats['hit_ratio']:.0%} · "
+            f"{cache_stats['entries']}개 · {cache_stats['bytes'] / 1024 / 1024:,.1f} MB"
+        )
+        memory_stats = memory_governor.stats()
+        st.caption(
+            f"메모리 예약 {memory_stats['reserved'] / 1024 / 1024:,.0f} / {memory_stats['budget'] / 1024 / 1024:,.0f} MB · "
+            f"대기 {memory_stats['waiting']}건 · 누적 대기 {memory_stats['queued']}건 · 거절 {memory_stats['rejected']}건"
+        )
+        job_stats = job_manager.stats()
+        st.caption(
+            f"작업 대기 {job_stats['queued']}건 · 실행 {job_stats['running']}건 · 보관 {job_stats['retained']}건 · "
+            f"완료 {job_stats['completed']}건 · 실패 {job_stats['failed']}건 · 만료 {job_stats['expired']}건"
+        )
+        st.code(render_prometheus(), language="text")
+
+
+# 푸터: 큰 결과는 서버의 임시 파일로 보관하므로 보관 시간을 그대로 알립니다
+st.markdown(f"""
 <div class="premium-footer">
     <p class="footer-text">
-        ⚡ 모든 파일은 메모리에서만 처리되어 <strong>빠르고 안전</strong>합니다
+        🔒 변환 결과는 이 창에서만 받을 수 있고, 서버의 임시 파일은 <strong>{job_manager.ttl / 60:,.0f}분 뒤 자동으로 삭제</strong>됩니다
     </p>
     <p class="footer-text" style="margin-top: 8px;">
         Made with ❤️ by <span class="footer-brand">File Converter</span>
@@ -815,3 +1374,5 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+metrics.registry.record(metrics.StageRecord(kind="page", stage="rerun", seconds=time.perf_counter() - page_started))
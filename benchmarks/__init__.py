@@ -0,0 +1,4 @@
+"""
+만능 파일 변환기 - 벤치마크 모음
+`python -m benchmarks --help`로 사용법을 확인하세요.
+"""
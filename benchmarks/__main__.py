@@ -0,0 +1,8 @@
+"""`python -m benchmarks`로 벤치마크를 실행합니다."""
+
+import sys
+
+from benchmarks.run import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+벤치마크용 합성 입력 생성기
+같은 인자에 대해 항상 같은 바이트를 만들도록 난수 시드를 고정합니다.
+"""
+
+import io
+import os
+import zlib
+from typing import Optional
+
+import numpy as np
+
+
+SEED = 20240601
+
+# 한국어 데이터가 많은 실제 업로드를 흉내 낸 문자열 값
+_WORDS = ['서울', '부산', '대구', '인천', '광주', '대전', '울산', '세종', 'alpha', 'beta', 'gamma', 'delta']
+
+
+def _rng(*params) -> np.random.Generator:
+    """인자별로 독립적이고 재현 가능한 난수 생성기를 만듭니다."""
+    # hash()는 프로세스마다 달라지므로 crc32로 시드를 만듭니다
+    return np.random.default_rng([SEED, *(zlib.crc32(str(p).encode()) for p in params)])
+
+
+def make_image(width: int, height: int, mode: str, fmt: str) -> bytes:
+    """
+    사진과 비슷하게 그라디언트와 잡음이 섞인 이미지를 만듭니다.
+
+    Args:
+        width, height: 이미지 크기
+        mode: 'RGB', 'RGBA', 'LA', 'L', 'P' 중 하나
+        fmt: 저장 형식 ('PNG', 'JPEG', 'WEBP')
+
+    Returns:
+        인코딩된 이미지 바이트 데이터
+    """
+    from PIL import Image
+
+    rng = _rng('image', width, height, mode)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack([
+        255 * x / max(width - 1, 1),
+        255 * y / max(height - 1, 1),
+        255 * (x + y) / max(width + height - 2, 1),
+    ], axis=-1)
+    noise = rng.normal(0, 18, size=base.shape).astype(np.float32)
+    rgb = np.clip(base + noise, 0, 255).astype(np.uint8)
+    img = Image.fromarray(rgb, 'RGB')
+
+    if mode in ('RGBA', 'LA'):
+        alpha = np.clip(255 * x / max(width - 1, 1), 0, 255).astype(np.uint8)
+        img.putalpha(Image.fromarray(alpha, 'L'))
+        img = img.convert(mode)
+    elif mode == 'P':
+        img = img.quantize(colors=256)
+        img.info['transparency'] = 0
+    elif mode == 'L':
+        img = img.convert('L')
+
+    output = io.BytesIO()
+    img.save(output, format=fmt)
+    return output.getvalue()
+
+
+def make_dataframe(rows: int):
+    """
+    여러 자료형이 섞인 DataFrame을 만듭니다.
+
+    정수, 결측값이 있는 실수, 반복되는 문자열(범주형), 고유 문자열,
+    불리언, 날짜 열을 포함합니다.
+    """
+    import pandas as pd
+
+    rng = _rng('frame', rows)
+    price = rng.normal(10_000, 2_500, rows).round(2)
+    price[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        'id': np.arange(1, rows + 1, dtype=np.int64),
+        'quantity': rng.integers(0, 1_000, rows),
+        'price': price,
+        'city': np.array(_WORDS, dtype=object)[rng.integers(0, len(_WORDS), rows)],
+        'code': [f"A{v:08d}" for v in rng.integers(0, 10 ** 8, rows)],
+        'active': rng.random(rows) < 0.5,
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D'),
+    })
+
+
+def make_csv(rows: int, encoding: str = 'utf-8') -> bytes:
+    """make_dataframe의 내용을 CSV로 저장합니다."""
+    output = io.BytesIO()
+    make_dataframe(rows).to_csv(output, index=False, encoding=encoding)
+    return output.getvalue()
+
+
+def make_wide_csv(rows: int, columns: int) -> bytes:
+    """make_dataframe의 열을 columns개가 될 때까지 반복한 넓은 CSV를 만듭니다."""
+    import pandas as pd
+
+    base = make_dataframe(rows)
+    copies = -(-columns // base.shape[1])
+    frame = pd.concat([base.add_suffix(f"_{i}") for i in range(copies)], axis=1).iloc[:, :columns]
+    output = io.BytesIO()
+    frame.to_csv(output, index=False)
+    return output.getvalue()
+
+
+def make_xlsx(rows: int) -> bytes:
+    """make_dataframe의 내용을 XLSX로 저장합니다 (시트 한도에 맞춰 행 수를 자릅니다)."""
+    from converter.data import EXCEL_MAX_ROWS
+
+    output = io.BytesIO()
+    make_dataframe(min(rows, EXCEL_MAX_ROWS - 1)).to_excel(output, index=False, engine='xlsxwriter')
+    return output.getvalue()
+
+
+def make_parquet(rows: int) -> bytes:
+    """make_dataframe의 내용을 Parquet으로 저장합니다."""
+    output = io.BytesIO()
+    make_dataframe(rows).to_parquet(output, index=False, engine='pyarrow')
+    return output.getvalue()
+
+
+def load(kind: str, *params, cache_dir: Optional[str] = None) -> bytes:
+    """
+    입력을 만들거나, cache_dir에 저장해 둔 것을 읽습니다.
+
+    큰 CSV/XLSX는 생성에 시간이 오래 걸리므로 실행 간에 재사용합니다.
+    """
+    makers = {'image': make_image, 'csv': make_csv, 'wide_csv': make_wide_csv, 'xlsx': make_xlsx,
+              'parquet': make_parquet}
+    if cache_dir is None:
+        return makers[kind](*params)
+
+    name = '-'.join([kind, *(str(p) for p in params)]) + '.bin'
+    path = os.path.join(cache_dir, name)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    data = makers[kind](*params)
+    os.makedirs(cache_dir, exist_ok=True)
+    partial = f"{path}.{os.getpid()}.part"
+    with open(partial, 'wb') as f:
+        f.write(data)
+    os.replace(partial, path)
+    return data
@@ -0,0 +1,490 @@
+"""
+동시 세션 부하 테스트
+
+    python -m benchmarks.load                          # 동시 세션 1, 2, 4, 8 (app.py를 AppTest로 실행)
+    python -m benchmarks.load --sessions 1,4,16 --rounds 3
+    python -m benchmarks.load --mode direct            # 화면 없이 변환 함수를 바로 호출
+    python -m benchmarks.load -o load.json --baseline load_prev.json
+
+세션마다 이미지 묶음, CSV, XLSX를 올리고 변환하기를 누른 뒤 결과가 나올 때까지 기다립니다.
+동시 세션 수마다 새 프로세스에서 실행해 지연 시간 분포(p50/p95/p99), 처리량,
+CPU 사용률, 최대 RSS(변환 워커 프로세스 포함)를 측정하고 동시 세션 수에 따라 비교합니다.
+
+- app 모드: 세션마다 Streamlit AppTest로 app.py를 열어 실제 위젯을 조작합니다.
+  변환 지연 시간은 변환하기를 누른 순간부터 백그라운드 작업이 끝날 때까지이며
+  작업 대기열에서 기다린 시간을 포함합니다. 화면 재실행 시간은 'rerun'으로 따로 봅니다.
+- direct 모드: 세션 스레드가 화면과 작업 대기열 없이 변환 함수를 바로 호출합니다.
+
+사용자마다 다른 파일을 올리는 상황을 재현하도록 변환 결과 캐시는 끕니다 (--cache로 켬).
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+from benchmarks import fixtures
+from benchmarks.run import DEFAULT_CACHE_DIR, _peak_rss, _reset_peak_rss, environment
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+DEFAULT_SESSIONS = [1, 2, 4, 8]
+DEFAULT_OUTPUT = 'load_results.json'
+
+# 세션 하나가 올리는 이미지 묶음: 휴대폰 사진, 화면 캡처, 큰 카메라 사진
+IMAGE_BATCH = [
+    (1920, 1080, 'RGB', 'JPEG'),
+    (1920, 1080, 'RGB', 'JPEG'),
+    (1280, 720, 'RGBA', 'PNG'),
+    (4000, 3000, 'RGB', 'JPEG'),
+]
+IMAGE_TARGET = 'WEBP'
+
+# 세션 하나가 올리는 데이터 파일 크기 (행 수)
+CSV_ROWS = 100_000
+XLSX_ROWS = 20_000
+
+# 지연 시간 분포에 포함하는 변환 (app 모드의 'rerun'은 따로 보여 줍니다)
+OPERATIONS = ('image', 'csv', 'xlsx')
+
+# 변환 결과를 기다리는 최대 시간 (초)
+JOB_TIMEOUT = 600
+
+# CPU·메모리를 읽는 간격 (초)
+SAMPLE_INTERVAL = 0.1
+
+_EXTENSIONS = {'PNG': 'png', 'JPEG': 'jpg', 'WEBP': 'webp'}
+_MIME_TYPES = {'PNG': 'image/png', 'JPEG': 'image/jpeg', 'WEBP': 'image/webp'}
+
+
+# ==================== CPU·메모리 측정 ====================
+
+def _children(pid: int) -> list:
+    """pid의 모든 하위 프로세스 (리눅스 /proc 기준)."""
+    found = []
+    try:
+        tasks = os.listdir(f'/proc/{pid}/task')
+    except OSError:
+        return found
+    for tid in tasks:
+        try:
+            with open(f'/proc/{pid}/task/{tid}/children') as f:
+                children = [int(child) for child in f.read().split()]
+        except OSError:
+            continue
+        for child in children:
+            found.append(child)
+            found.extend(_children(child))
+    return found
+
+
+def _process_usage(pid: int) -> Optional[tuple]:
+    """(RSS 바이트, 누적 CPU 초). 읽을 수 없으면 None."""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        with open(f'/proc/{pid}/stat') as f:
+            # 실행 파일 이름에 공백이 있을 수 있으므로 마지막 ')' 뒤부터 셉니다
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+    return rss, cpu
+
+
+class ResourceSampler:
+    """
+    이 프로세스와 하위 프로세스(변환 워커)의 RSS 합과 CPU 시간을 주기적으로 읽습니다.
+
+    /proc이 없는 환경에서는 peak_rss와 cpu_seconds가 None입니다.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak_rss: Optional[int] = None
+        self._cpu: dict = {}
+        self._start_cpu: dict = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="resource-sampler", daemon=True)
+
+    def __enter__(self):
+        self._start_cpu = {pid: cpu for pid, (_, cpu) in self._sample().items()}
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._record(self._sample())
+
+    def _sample(self) -> dict:
+        pid = os.getpid()
+        usage = {}
+        for process in [pid, *_children(pid)]:
+            result = _process_usage(process)
+            if result is not None:
+                usage[process] = result
+        return usage
+
+    def _record(self, usage: dict) -> None:
+        if not usage:
+            return
+        total = sum(rss for rss, _ in usage.values())
+        self.peak_rss = max(self.peak_rss or 0, total)
+        for pid, (_, cpu) in usage.items():
+            self._cpu[pid] = max(self._cpu.get(pid, 0.0), cpu)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._record(self._sample())
+
+    @property
+    def cpu_seconds(self) -> Optional[float]:
+        """측정하는 동안 쓴 CPU 시간 합 (이미 있던 프로세스는 시작 시점부터)."""
+        if not self._cpu:
+            return None
+        return sum(cpu - self._start_cpu.get(pid, 0.0) for pid, cpu in self._cpu.items())
+
+
+# ==================== 세션 시나리오 ====================
+
+def _inputs(cache_dir: Optional[str], csv_rows: int, xlsx_rows: int) -> dict:
+    images = [
+        (f"photo{i}.{_EXTENSIONS[fmt]}", _EXTENSIONS[fmt], fixtures.load('image', w, h, mode, fmt, cache_dir=cache_dir),
+         _MIME_TYPES[fmt])
+        for i, (w, h, mode, fmt) in enumerate(IMAGE_BATCH)
+    ]
+    return {
+        'images': images,
+        'csv': fixtures.load('csv', csv_rows, cache_dir=cache_dir),
+        'xlsx': fixtures.load('xlsx', xlsx_rows, cache_dir=cache_dir),
+    }
+
+
+class DirectSession:
+    """화면 없이 app.py와 같은 변환 함수를 바로 호출하는 세션."""
+
+    def __init__(self, inputs: dict):
+        self.inputs = inputs
+
+    def open(self) -> None:
+        pass
+
+    def run(self, operation: str, record) -> None:
+        from converter.batch import convert_images_parallel
+        from converter.data import convert_data
+        from converter.sniff import sniff_csv
+
+        started = time.perf_counter()
+        ok = True
+        if operation == 'image':
+            files = [(name, ext, data) for name, ext, data, _ in self.inputs['images']]
+            results = convert_images_parallel(files, IMAGE_TARGET)
+            ok = all(result.ok for result in results)
+        elif operation == 'csv':
+            data = self.inputs['csv']
+            convert_data(data, 'csv', 'XLSX', **sniff_csv(data).read_csv_kwargs())
+        else:
+            convert_data(self.inputs['xlsx'], 'xlsx', 'CSV')
+        record(operation, time.perf_counter() - started, ok)
+
+
+class AppSession:
+    """
+    Streamlit AppTest로 app.py를 열어 사용자처럼 조작하는 세션.
+
+    AppTest는 실행할 때마다 프로세스 전역 상태(Runtime, 설정)를 바꾸므로 스크립트 실행은
+    세션끼리 한 번에 하나씩 합니다. 변환 작업은 실제 서버처럼 작업 스레드에서 동시에 실행되며,
+    'rerun' 지연 시간에는 다른 세션의 스크립트 실행을 기다린 시간이 들어갑니다.
+    """
+
+    _run_lock = threading.Lock()
+
+    def __init__(self, inputs: dict, app_path: str = APP_PATH):
+        from streamlit.testing.v1 import AppTest
+
+        self.inputs = inputs
+        self.at = AppTest.from_file(app_path, default_timeout=JOB_TIMEOUT)
+
+    def open(self) -> None:
+        self._rerun(None)
+        self.at.selectbox(key='image_format').set_value(IMAGE_TARGET)
+        self._rerun(None)
+
+    def _rerun(self, record) -> None:
+        started = time.perf_counter()
+        with self._run_lock:
+            self.at.run()
+        if record is not None:
+            record('rerun', time.perf_counter() - started, not self.at.exception)
+        if self.at.exception:
+            raise RuntimeError(self.at.exception[0].value)
+
+    def run(self, operation: str, record) -> None:
+        if operation == 'image':
+            self.at.file_uploader(key='image_uploader').set_value(
+                [(name, data, mime) for name, _, data, mime in self.inputs['images']]
+            )
+            button, kind = 'convert_images', 'image'
+        else:
+            name = f"data.{operation}"
+            mime = 'text/csv' if operation == 'csv' else 'application/octet-stream'
+            self.at.file_uploader(key='data_uploader').set_value((name, self.inputs[operation], mime))
+            button, kind = 'convert_data', 'data'
+        self._rerun(record)
+
+        # 작업의 시각 기록(time.time)과 맞춰 누른 순간부터 작업이 끝난 순간까지 잽니다
+        started = time.time()
+        job = self._click(button, kind)
+        if job is None:
+            record(operation, time.time() - started, False)
+            return
+        deadline = time.monotonic() + JOB_TIMEOUT
+        while job.active and time.monotonic() < deadline:
+            time.sleep(0.02)
+        record(operation, (job.finished or time.time()) - started, job.ok)
+
+    def _click(self, button: str, kind: str):
+        """변환하기를 누르고 새로 만든 작업을 돌려줍니다. 대기열이 가득 차 거절되면 None."""
+        from converter.jobs import job_manager
+
+        sid = self.at.session_state['session_id']
+        before = {job.id for job in job_manager.jobs(sid, kind)}
+        self.at.button(key=button).click()
+        with self._run_lock:
+            self.at.run()
+        created = [job for job in job_manager.jobs(sid, kind) if job.id not in before]
+        return created[-1] if created else None
+
+
+# ==================== 동시 세션 실행 ====================
+
+def _percentiles(seconds: list) -> dict:
+    if not seconds:
+        return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None}
+    p50, p95, p99 = np.percentile(np.array(seconds) * 1000, [50, 95, 99])
+    return {'count': len(seconds), 'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+
+def run_level(mode: str, sessions: int, rounds: int, options: dict) -> dict:
+    """동시 세션 수 하나를 측정합니다. 새 프로세스에서 호출됩니다."""
+    if not options['cache']:
+        os.environ['CONVERTER_CACHE_BYTES'] = '0'
+
+    if mode == 'app':
+        # 세션 스레드마다 나오는 'missing ScriptRunContext'와 사용 중단 안내는 측정과 관계없습니다.
+        # AppTest는 실행마다 설정을 다시 적용해 로그 수준을 되돌리므로 로거를 끕니다.
+        for name in ('streamlit.deprecation_util', 'streamlit.runtime.scriptrunner_utils.script_run_context'):
+            logging.getLogger(name).disabled = True
+    inputs = _inputs(options['cache_dir'], options['csv_rows'], options['xlsx_rows'])
+    session_class = AppSession if mode == 'app' else DirectSession
+
+    # 워커 풀 시작과 첫 가져오기가 첫 세션의 지연 시간에 섞이지 않도록 한 번 미리 돌립니다
+    warmup = session_class(inputs)
+    warmup.open()
+    for operation in OPERATIONS:
+        warmup.run(operation, lambda *_: None)
+
+    clients = [session_class(inputs) for _ in range(sessions)]
+    records = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(sessions)
+
+    def record(operation: str, seconds: float, ok: bool) -> None:
+        with lock:
+            records.append((operation, seconds, ok))
+
+    def drive(client) -> None:
+        try:
+            client.open()
+            barrier.wait()
+            for _ in range(rounds):
+                for operation in OPERATIONS:
+                    client.run(operation, record)
+        except Exception as e:
+            barrier.abort()
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    threads = [threading.Thread(target=drive, args=(client,), name=f"session-{i}") for i, client in enumerate(clients)]
+    peak_resettable = _reset_peak_rss()
+    with ResourceSampler() as sampler:
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+    conversions = [(operation, seconds) for operation, seconds, ok in records if ok and operation in OPERATIONS]
+    failed = sum(not ok for operation, _, ok in records if operation in OPERATIONS)
+    input_bytes = (
+        sum(len(data) for _, _, data, _ in inputs['images']) + len(inputs['csv']) + len(inputs['xlsx'])
+    )
+    cpu_seconds = sampler.cpu_seconds
+    return {
+        'mode': mode,
+        'sessions': sessions,
+        'rounds': rounds,
+        'wall_s': wall,
+        'scenarios_per_s': len(conversions) / len(OPERATIONS) / wall,
+        'conversions_per_s': len(conversions) / wall,
+        'mb_per_s': input_bytes * len(conversions) / len(OPERATIONS) / 1024 / 1024 / wall,
+        'latency': _percentiles([seconds for _, seconds in conversions]),
+        'operations': {
+            operation: _percentiles([seconds for name, seconds, ok in records if name == operation and ok])
+            for operation in (*OPERATIONS, 'rerun')
+        },
+        'failed': failed,
+        'errors': errors,
+        'cpu_seconds': cpu_seconds,
+        'cpu_percent': cpu_seconds / (wall * (os.cpu_count() or 1)) * 100 if cpu_seconds is not None else None,
+        'peak_rss_mb': sampler.peak_rss / 1024 / 1024 if sampler.peak_rss else None,
+        'peak_rss_main_mb': _peak_rss() / 1024 / 1024 if peak_resettable else None,
+    }
+
+
+def _run_isolated(mode: str, sessions: int, rounds: int, options: dict) -> dict:
+    """동시 세션 수마다 새 프로세스에서 실행해 메모리와 워커 풀이 섞이지 않게 합니다."""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(run_level, (mode, sessions, rounds, options))
+
+
+# ==================== 결과 출력·비교 ====================
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:,.0f} ms" if value is not None else "-"
+
+
+def _format_level(result: dict) -> str:
+    latency = result['latency']
+    cpu = f"{result['cpu_percent']:.0f}%" if result['cpu_percent'] is not None else "-"
+    rss = f"{result['peak_rss_mb']:,.0f} MB" if result['peak_rss_mb'] is not None else "-"
+    return (
+        f"{result['sessions']:>4} {result['scenarios_per_s']:>10.2f} {result['conversions_per_s']:>8.2f} "
+        f"{_ms(latency['p50_ms']):>10} {_ms(latency['p95_ms']):>10} {_ms(latency['p99_ms']):>10} "
+        f"{cpu:>6} {rss:>10} {result['failed'] + len(result['errors']):>5}"
+    )
+
+
+def _format_operations(result: dict) -> list:
+    lines = []
+    for operation, stats in result['operations'].items():
+        if stats['count']:
+            lines.append(
+                f"       {operation:<6} {stats['count']:>4}회  p50 {_ms(stats['p50_ms'])}  "
+                f"p95 {_ms(stats['p95_ms'])}  p99 {_ms(stats['p99_ms'])}"
+            )
+    return lines
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    기준 결과보다 p95 지연 시간이 늘어난 동시 세션 수와 변환을 찾습니다.
+
+    Returns:
+        (이름, 기준 p95, 현재 p95, 변화율) 리스트 (단위: ms)
+    """
+    previous = {(r['mode'], r['sessions']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        old = previous.get((result['mode'], result['sessions']))
+        if not old:
+            continue
+        for operation in OPERATIONS:
+            old_p95 = old['operations'].get(operation, {}).get('p95_ms')
+            new_p95 = result['operations'][operation]['p95_ms']
+            if not old_p95 or new_p95 is None:
+                continue
+            change = new_p95 / old_p95 - 1
+            if change > tolerance:
+                regressions.append((f"{result['mode']} 세션 {result['sessions']}개 {operation}", old_p95, new_p95, change))
+    return regressions
+
+
+def _session_counts(text: str) -> list:
+    try:
+        counts = sorted({int(part) for part in text.split(',') if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"쉼표로 구분한 정수여야 합니다: {text}")
+    if not counts or counts[0] < 1:
+        raise argparse.ArgumentTypeError("동시 세션 수는 1 이상이어야 합니다")
+    return counts
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description="동시 세션 부하 테스트")
+    parser.add_argument("--mode", choices=('app', 'direct'), default='app',
+                        help="app: AppTest로 app.py 조작, direct: 변환 함수 직접 호출 (기본값: app)")
+    parser.add_argument("-s", "--sessions", type=_session_counts, default=DEFAULT_SESSIONS,
+                        help="측정할 동시 세션 수 (쉼표로 구분, 기본값: 1,2,4,8)")
+    parser.add_argument("-r", "--rounds", type=int, default=2, help="세션마다 시나리오를 반복할 횟수")
+    parser.add_argument("--csv-rows", type=int, default=CSV_ROWS, help="세션이 올리는 CSV 행 수")
+    parser.add_argument("--xlsx-rows", type=int, default=XLSX_ROWS, help="세션이 올리는 XLSX 행 수")
+    parser.add_argument("--cache", action="store_true", help="변환 결과 캐시를 켭니다 (같은 파일 반복 업로드 상황)")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="결과 JSON 경로")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="생성한 입력을 재사용할 폴더")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="기준보다 p95가 이 비율 이상 늘면 실패 처리 (기본값: 0.25)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="변환 종류별 지연 시간도 출력")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    options = {
+        'cache': args.cache,
+        'cache_dir': args.cache_dir,
+        'csv_rows': args.csv_rows,
+        'xlsx_rows': args.xlsx_rows,
+    }
+
+    print(f"{'세션':>4} {'시나리오/s':>10} {'변환/s':>8} {'p50':>10} {'p95':>10} {'p99':>10} "
+          f"{'CPU':>6} {'최대 RSS':>10} {'오류':>5}")
+    results = []
+    for sessions in args.sessions:
+        result = _run_isolated(args.mode, sessions, args.rounds, options)
+        results.append(result)
+        print(_format_level(result), flush=True)
+        if args.verbose:
+            print('\n'.join(_format_operations(result)), flush=True)
+        for error in result['errors']:
+            print(f"       ⚠️ {error}", file=sys.stderr)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'mode': args.mode,
+        'options': options,
+        'image_batch': IMAGE_BATCH,
+        'environment': environment(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output} (동시 세션 {len(results)}단계)")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, old, new, change in regressions:
+            print(f"⚠️ 느려짐: {name} p95 {old:,.0f} ms → {new:,.0f} ms (+{change:.0%})")
+        if regressions:
+            return 1
+        print("✅ 기준 대비 느려진 항목이 없습니다.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+화면 상호작용별 재실행 비용 측정
+
+    python -m benchmarks.reruns
+    python -m benchmarks.reruns --rows 200000 --images 8
+    python -m benchmarks.reruns --app 이전버전/app.py      # 바꾸기 전과 비교
+
+Streamlit AppTest로 app.py를 실행하며 실제 사용 순서대로 위젯을 조작하고, 상호작용마다
+다시 실행되는 범위, 걸린 시간, 그 사이 화면 스레드에서 한 일(converter.metrics 단계)을 보여 줍니다.
+
+AppTest는 언제나 스크립트 전체를 다시 실행합니다. 탭이 fragment로 나뉜 앱이면 브라우저에서는
+그 탭만 다시 실행되므로 탭의 'fragment' 기록을, 아니면 스크립트 전체 실행 시간을 비용으로 봅니다.
+다운로드 버튼이 다시 실행하지 않도록 설정돼 있으면(on_click="ignore") 비용은 0입니다.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from collections import Counter
+from typing import Optional
+
+from benchmarks import fixtures
+
+
+DEFAULT_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+# 변환 작업이 끝나기를 기다리는 최대 시간 (초)
+JOB_TIMEOUT = 300
+
+# 앱 스크립트를 실행하는 동안 화면 스레드에서 기록된 단계 (작업 스레드의 단계는 섞이지 않습니다)
+_captured: list = []
+
+_WRAPPER = """
+from benchmarks import reruns
+from converter import metrics
+import runpy
+
+with metrics.capture() as records:
+    try:
+        runpy.run_path({app!r}, run_name="__main__")
+    finally:
+        reruns._captured.extend(records)
+"""
+
+
+def _wait_for_jobs() -> None:
+    from converter.jobs import job_manager
+
+    deadline = time.monotonic() + JOB_TIMEOUT
+    while any(job.active for job in list(job_manager._jobs.values())):
+        if time.monotonic() > deadline:
+            raise TimeoutError("변환 작업이 끝나지 않았습니다")
+        time.sleep(0.05)
+
+
+def _latest_download(at):
+    buttons = [button for button in at.get('download_button') if button.key.startswith('job_download_')]
+    # 패널은 최근 작업을 위에 그리므로 첫 버튼이 방금 만든 결과입니다
+    return buttons[0]
+
+
+def _interactions(images: list, csv: bytes) -> list:
+    """(이름, 탭, 조작 함수) 목록. 조작 함수가 '다운로드'를 돌려주면 그 버튼을 누른 것으로 봅니다."""
+    return [
+        ("첫 화면", None, lambda at: None),
+        ("이미지 업로드", 'image', lambda at: at.file_uploader(key='image_uploader').set_value(images)),
+        ("이미지 형식 변경", 'image', lambda at: at.selectbox(key='image_format').set_value('WEBP')),
+        ("이미지 크기 조정 변경", 'image', lambda at: at.selectbox(key='image_resize').set_value("배율")),
+        ("이미지 변환하기", 'image', lambda at: at.button(key='convert_images').click()),
+        ("이미지 다운로드", 'image', lambda at: _latest_download(at)),
+        ("CSV 업로드", 'data', lambda at: at.file_uploader(key='data_uploader').set_value(
+            ('data.csv', csv, 'text/csv'))),
+        ("변환 형식 변경", 'data', lambda at: at.selectbox(key='data_target_csv').set_value('PARQUET')),
+        ("압축 코덱 변경", 'data', lambda at: at.selectbox(key='data_codec_PARQUET').set_value('lz4')),
+        ("데이터 변환하기", 'data', lambda at: at.button(key='convert_data').click()),
+        ("데이터 다운로드", 'data', lambda at: _latest_download(at)),
+    ]
+
+
+def measure(app_path: str, images: list, csv: bytes, timeout: float = 120) -> list:
+    """
+    상호작용마다 비용을 잽니다.
+
+    Returns:
+        {'name', 'scope', 'ms', 'page_ms', 'work'} dict 리스트.
+        work는 화면 스레드에서 실행된 단계 이름별 횟수입니다.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    from converter import metrics
+
+    # `python -m`으로 실행하면 이 파일은 __main__이므로 앱 쪽이 채우는 모듈의 리스트를 씁니다
+    captured = importlib.import_module('benchmarks.reruns')._captured
+    at = AppTest.from_string(_WRAPPER.format(app=os.path.abspath(app_path)), default_timeout=timeout)
+    results = []
+    for name, tab, interact in _interactions(images, csv):
+        target = interact(at)
+        if getattr(target, 'type', None) == 'download_button':
+            if target.proto.ignore_rerun:
+                results.append({'name': name, 'scope': "없음", 'ms': 0.0, 'page_ms': None, 'work': {}})
+                continue
+            target.click()
+
+        captured.clear()
+        metrics.registry.reset()
+        started = time.perf_counter()
+        at.run()
+        page_ms = (time.perf_counter() - started) * 1000
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception[0].value}")
+
+        fragments = {
+            row['kind']: row['total_s'] * 1000
+            for row in metrics.registry.snapshot() if row['stage'] == 'fragment'
+        }
+        work = Counter(
+            record.stage for record in captured
+            if record.stage not in ('rerun', 'fragment') and not (tab and record.kind == 'page')
+        )
+        if tab in fragments:
+            scope, ms = f"{tab} 탭", fragments[tab]
+        else:
+            scope, ms = "페이지 전체", page_ms
+        results.append({'name': name, 'scope': scope, 'ms': ms, 'page_ms': page_ms, 'work': dict(work)})
+
+        if name.endswith("변환하기"):
+            # 작업이 끝난 뒤 결과 패널을 그려 다운로드 버튼이 나타나게 합니다 (측정하지 않음)
+            _wait_for_jobs()
+            at.run()
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.reruns", description="화면 상호작용별 재실행 비용")
+    parser.add_argument("--app", default=DEFAULT_APP, help="측정할 Streamlit 앱 (기본값: app.py)")
+    parser.add_argument("--images", type=int, default=4, help="업로드할 이미지 수")
+    parser.add_argument("--image-size", default="1920x1080", help="업로드할 이미지 크기 (가로x세로)")
+    parser.add_argument("--rows", type=int, default=100_000, help="업로드할 CSV 행 수")
+    parser.add_argument("--cache-dir", default='.bench_cache', help="생성한 입력을 재사용할 폴더")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    width, height = (int(v) for v in args.image_size.lower().split('x'))
+    image = fixtures.load('image', width, height, 'RGB', 'PNG', cache_dir=args.cache_dir)
+    images = [(f"photo{i}.png", image, 'image/png') for i in range(args.images)]
+    csv = fixtures.load('csv', args.rows, cache_dir=args.cache_dir)
+
+    results = measure(args.app, images, csv)
+    print(f"{'상호작용':<16} {'다시 실행되는 범위':<12} {'비용':>12} {'스크립트 전체':>14}  한 일")
+    for result in results:
+        page = f"{result['page_ms']:,.1f} ms" if result['page_ms'] is not None else "-"
+        work = ', '.join(f"{stage}×{count}" for stage, count in sorted(result['work'].items())) or "-"
+        print(f"{result['name']:<16} {result['scope']:<12} {result['ms']:>9,.1f} ms {page:>14}  {work}")
+    total = sum(result['ms'] for result in results)
+    print(f"\n상호작용 {len(results)}개 합계: {total:,.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,432 @@
+"""
+변환 경로별 벤치마크 실행기
+
+    python -m benchmarks                       # quick 프로필, 결과를 bench_results.json에 저장
+    python -m benchmarks --profile full -o full.json
+    python -m benchmarks -k csv --baseline bench_results.json
+
+각 항목은 새 프로세스에서 실행해 최대 메모리를 서로 섞이지 않게 측정합니다.
+결과는 JSON으로 저장되며 --baseline으로 이전 결과와 비교할 수 있습니다.
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Optional
+
+from benchmarks import fixtures
+
+
+# 프로필별 입력 크기와 반복 횟수
+PROFILES = {
+    'quick': {
+        'image_sizes': [(640, 480), (1920, 1080)],
+        'rows': [10_000, 100_000],
+        'wide_rows': [100_000],
+        'repeats': 3,
+    },
+    'full': {
+        'image_sizes': [(640, 480), (1920, 1080), (4000, 3000)],
+        'rows': [10_000, 100_000, 1_000_000, 5_000_000],
+        'wide_rows': [100_000, 1_000_000],
+        'repeats': 3,
+    },
+}
+
+# 모드별로 의미 있는 원본 형식
+IMAGE_SOURCES = {
+    'RGBA': ['PNG', 'WEBP'],
+    'LA': ['PNG'],
+    'P': ['PNG'],
+    'L': ['PNG', 'JPEG'],
+    'RGB': ['PNG', 'JPEG', 'WEBP'],
+}
+IMAGE_TARGETS = ['PNG', 'JPG', 'WEBP']
+
+# 크기 조정 항목의 긴 변 최대 길이
+RESIZE_MAX_SIZE = 1200
+
+# 인코더 프리셋 비교 항목 (기본 항목은 기본 프리셋으로 인코딩합니다)
+ENCODER_PRESETS = ['fastest', 'balanced', 'smallest']
+
+# 일괄 변환·압축 항목에 쓰는 파일 수
+BATCH_FILES = 16
+
+# 이보다 큰 입력은 예열 실행을 생략합니다
+LARGE_INPUT_BYTES = 50 * 1024 * 1024
+
+DEFAULT_CACHE_DIR = '.bench_cache'
+DEFAULT_OUTPUT = 'bench_results.json'
+
+_EXTENSIONS = {'PNG': 'png', 'JPEG': 'jpg', 'WEBP': 'webp'}
+
+# (원본, 대상, 스트리밍 경로가 있는지)
+DATA_PAIRS = [
+    ('csv', 'xlsx', True),
+    ('xlsx', 'csv', True),
+    ('csv', 'parquet', True),
+    ('csv', 'feather', True),
+    ('parquet', 'csv', False),
+]
+
+# 넓은 CSV → XLSX 항목의 열 수 (셀 수에 비례하는 XLSX 작성 시간 측정)
+WIDE_COLUMNS = 20
+
+
+def build_cases(profile: str) -> list:
+    """프로필에 맞는 벤치마크 항목 목록을 만듭니다."""
+    config = PROFILES[profile]
+    cases = []
+
+    for width, height in config['image_sizes']:
+        for mode, sources in IMAGE_SOURCES.items():
+            for source in sources:
+                for target in IMAGE_TARGETS:
+                    cases.append({
+                        'name': f"image/{_EXTENSIONS[source]}-{mode}-{width}x{height}->{target.lower()}",
+                        'kind': 'image',
+                        'params': {'width': width, 'height': height, 'mode': mode,
+                                   'source': source, 'target': target},
+                    })
+
+    # 큰 원본을 웹용 크기로 줄이는 경우 (축소 디코딩 효과 측정)
+    width, height = config['image_sizes'][-1]
+    for source in ('JPEG', 'PNG'):
+        cases.append({
+            'name': f"image/{_EXTENSIONS[source]}-RGB-{width}x{height}->jpg@{RESIZE_MAX_SIZE}",
+            'kind': 'image',
+            'params': {'width': width, 'height': height, 'mode': 'RGB', 'source': source,
+                       'target': 'JPG', 'max_size': RESIZE_MAX_SIZE},
+        })
+
+    # 프리셋별 인코딩 시간과 출력 크기 (같은 형식은 원본을 그대로 돌려주므로 PNG 대상은 JPEG에서 변환)
+    for target in IMAGE_TARGETS:
+        source = 'JPEG' if target == 'PNG' else 'PNG'
+        for preset in ENCODER_PRESETS:
+            cases.append({
+                'name': f"image/{_EXTENSIONS[source]}-RGB-{width}x{height}->{target.lower()}[{preset}]",
+                'kind': 'image',
+                'params': {'width': width, 'height': height, 'mode': 'RGB', 'source': source,
+                           'target': target, 'preset': preset},
+            })
+
+    cases.append({
+        'name': f"batch/{BATCH_FILES}x{width}x{height}-RGBA->jpg",
+        'kind': 'batch',
+        'params': {'width': width, 'height': height, 'mode': 'RGBA', 'target': 'JPG',
+                   'files': BATCH_FILES},
+    })
+    cases.append({
+        'name': f"zip/{BATCH_FILES}x{width}x{height}-jpg",
+        'kind': 'zip',
+        'params': {'width': width, 'height': height, 'files': BATCH_FILES},
+    })
+
+    for rows in config['rows']:
+        for source, target, streamable in DATA_PAIRS:
+            for stream in (False, True) if streamable else (False,):
+                suffix = '[stream]' if stream else ''
+                cases.append({
+                    'name': f"data/{source}-{rows}->{target}{suffix}",
+                    'kind': 'data',
+                    'params': {'rows': rows, 'source': source, 'target': target, 'stream': stream},
+                })
+    for rows in config['wide_rows']:
+        for stream in (False, True):
+            suffix = '[stream]' if stream else ''
+            cases.append({
+                'name': f"data/csv-{rows}x{WIDE_COLUMNS}->xlsx{suffix}",
+                'kind': 'data',
+                'params': {'rows': rows, 'columns': WIDE_COLUMNS, 'source': 'csv', 'target': 'xlsx',
+                           'stream': stream},
+            })
+    return cases
+
+
+# ==================== 항목 실행 (자식 프로세스) ====================
+
+def _prepare(case: dict, cache_dir: Optional[str]) -> tuple:
+    """
+    항목의 입력을 준비하고 측정할 함수를 만듭니다.
+
+    Returns:
+        (실행 함수, 입력 바이트 수, 처리 단위 수, 단위 이름)
+    """
+    params = case['params']
+    kind = case['kind']
+
+    if kind == 'image':
+        from converter.image import convert_image
+
+        data = fixtures.load('image', params['width'], params['height'], params['mode'],
+                             params['source'], cache_dir=cache_dir)
+        source = _EXTENSIONS[params['source']]
+        options = {name: params[name] for name in ('max_size', 'preset') if name in params}
+        return (lambda: convert_image(data, source, params['target'], **options)), len(data), 1, 'images'
+
+    if kind == 'batch':
+        from converter.batch import convert_images_parallel
+
+        data = fixtures.load('image', params['width'], params['height'], params['mode'], 'PNG',
+                             cache_dir=cache_dir)
+        files = [(f"{i}.png", 'png', data) for i in range(params['files'])]
+        return (
+            (lambda: convert_images_parallel(files, params['target'])),
+            len(data) * params['files'],
+            params['files'],
+            'images',
+        )
+
+    if kind == 'zip':
+        from converter.archive import create_zip_from_files
+        from converter.image import convert_image
+
+        data = fixtures.load('image', params['width'], params['height'], 'RGB', 'PNG',
+                             cache_dir=cache_dir)
+        encoded = convert_image(data, 'png', 'JPG')
+        files = [(f"{i}.jpg", encoded) for i in range(params['files'])]
+        return (lambda: create_zip_from_files(files)), len(encoded) * params['files'], params['files'], 'files'
+
+    if kind == 'data':
+        from converter import data as data_module
+        from converter.sniff import sniff_csv
+
+        if 'columns' in params:
+            data = fixtures.load('wide_csv', params['rows'], params['columns'], cache_dir=cache_dir)
+        else:
+            data = fixtures.load(params['source'], params['rows'], cache_dir=cache_dir)
+        rows = params['rows'] if params['source'] == 'csv' else min(params['rows'], data_module.EXCEL_MAX_ROWS - 1)
+
+        if not params['stream']:
+            def run():
+                return data_module.convert_data(data, params['source'], params['target'])
+        elif params['source'] == 'csv' and params['target'] == 'xlsx':
+            read_options = sniff_csv(data).read_csv_kwargs()
+
+            def run():
+                with tempfile.TemporaryFile() as output:
+                    data_module.csv_to_xlsx_stream(io.BytesIO(data), output, **read_options)
+                    return output.tell()
+        elif params['source'] == 'csv':
+            from converter.columnar import csv_to_columnar_stream
+
+            read_options = sniff_csv(data).read_csv_kwargs()
+
+            def run():
+                with tempfile.TemporaryFile() as output:
+                    csv_to_columnar_stream(io.BytesIO(data), output, params['target'], **read_options)
+                    return output.tell()
+        else:
+            def run():
+                with tempfile.TemporaryFile() as output:
+                    return data_module.xlsx_to_csv_stream(io.BytesIO(data), output)
+        return run, len(data), rows, 'rows'
+
+    raise ValueError(f"알 수 없는 항목 종류: {kind}")
+
+
+def _current_rss() -> int:
+    """현재 RSS (바이트). /proc이 없으면 0."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def _reset_peak_rss() -> bool:
+    """리눅스에서 최대 RSS 기록(VmHWM)을 현재 값으로 되돌립니다."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> int:
+    """프로세스의 최대 RSS (바이트)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, 리눅스는 KB 단위입니다
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return 0
+
+
+def run_case(case: dict, repeats: int, cache_dir: Optional[str]) -> dict:
+    """항목 하나를 측정합니다. 새 프로세스에서 호출됩니다."""
+    run, input_bytes, items, unit = _prepare(case, cache_dir)
+
+    # 최대 메모리는 입력 준비가 끝난 뒤부터 잽니다
+    baseline_rss = _current_rss()
+    peak_resettable = _reset_peak_rss()
+
+    # 작은 입력은 tracemalloc을 켠 예열 실행으로 파이썬 할당량을 따로 잽니다.
+    # tracemalloc은 실행 속도를 떨어뜨리므로 시간 측정과 분리합니다.
+    traced_peak = None
+    if input_bytes < LARGE_INPUT_BYTES:
+        tracemalloc.start()
+        run()
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    seconds = []
+    output = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        output = run()
+        seconds.append(time.perf_counter() - started)
+    peak_rss = _peak_rss()
+
+    median = statistics.median(seconds)
+    output_bytes = output if isinstance(output, int) else len(output) if isinstance(output, bytes) else None
+    return {
+        'name': case['name'],
+        'kind': case['kind'],
+        'params': case['params'],
+        'seconds': seconds,
+        'median_s': median,
+        'input_bytes': input_bytes,
+        'output_bytes': output_bytes,
+        'mb_per_s': input_bytes / 1024 / 1024 / median if median else None,
+        'items': items,
+        'unit': unit,
+        'items_per_s': items / median if median else None,
+        'peak_rss_mb': peak_rss / 1024 / 1024,
+        'peak_rss_delta_mb': (
+            max(peak_rss - baseline_rss, 0) / 1024 / 1024 if peak_resettable and baseline_rss else None
+        ),
+        'peak_traced_mb': traced_peak / 1024 / 1024 if traced_peak is not None else None,
+    }
+
+
+def _run_isolated(case: dict, repeats: int, cache_dir: Optional[str]) -> dict:
+    """항목을 새 프로세스에서 실행합니다."""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(run_case, (case, repeats, cache_dir))
+
+
+# ==================== 결과 저장·비교 ====================
+
+def environment() -> dict:
+    """결과를 비교할 때 참고할 실행 환경 정보."""
+    versions = {}
+    for module in ('PIL', 'pandas', 'numpy', 'openpyxl', 'xlsxwriter'):
+        try:
+            versions[module] = __import__(module).__version__
+        except (ImportError, AttributeError):
+            versions[module] = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'versions': versions,
+    }
+
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    기준 결과보다 느려진 항목을 찾습니다.
+
+    Returns:
+        (항목 이름, 기준 중앙값, 현재 중앙값, 변화율) 리스트
+    """
+    previous = {r['name']: r for r in baseline.get('results', [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result['name'])
+        if not old or not old.get('median_s'):
+            continue
+        change = result['median_s'] / old['median_s'] - 1
+        if change > tolerance:
+            regressions.append((result['name'], old['median_s'], result['median_s'], change))
+    return regressions
+
+
+def _format_result(result: dict) -> str:
+    rate = f"{result['items_per_s']:,.1f} {result['unit']}/s" if result['items_per_s'] else '-'
+    if result['peak_rss_delta_mb'] is not None:
+        peak_text = f"{result['peak_rss_delta_mb']:,.1f} MB"
+    elif result['peak_traced_mb'] is not None:
+        peak_text = f"{result['peak_traced_mb']:,.1f} MB (traced)"
+    else:
+        peak_text = f"{result['peak_rss_mb']:,.1f} MB (rss)"
+    return (
+        f"{result['name']:<52} {result['median_s'] * 1000:>10,.1f} ms "
+        f"{result['mb_per_s']:>9,.1f} MB/s {rate:>20} {peak_text:>14}"
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="변환 경로별 벤치마크")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default='quick', help="입력 크기 프로필")
+    parser.add_argument("-k", dest="keyword", action="append", default=[],
+                        help="이름에 이 문자열이 들어간 항목만 실행 (여러 번 지정 가능)")
+    parser.add_argument("-r", "--repeats", type=int, help="반복 횟수 (기본값은 프로필 설정)")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="결과 JSON 경로")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="생성한 입력을 재사용할 폴더")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="기준보다 이 비율 이상 느려지면 실패 처리 (기본값: 0.10)")
+    parser.add_argument("--list", action="store_true", help="항목 이름만 출력")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    cases = build_cases(args.profile)
+    if args.keyword:
+        cases = [c for c in cases if any(k in c['name'] for k in args.keyword)]
+    if args.list:
+        for case in cases:
+            print(case['name'])
+        return 0
+
+    repeats = args.repeats or PROFILES[args.profile]['repeats']
+    results = []
+    for case in cases:
+        result = _run_isolated(case, repeats, args.cache_dir)
+        results.append(result)
+        print(_format_result(result), flush=True)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'profile': args.profile,
+        'repeats': repeats,
+        'environment': environment(),
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {args.output} ({len(results)}개 항목)")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, old, new, change in regressions:
+            print(f"⚠️ 느려짐: {name} {old * 1000:,.1f} ms → {new * 1000:,.1f} ms (+{change:.0%})")
+        if regressions:
+            return 1
+        print("✅ 기준 대비 느려진 항목이 없습니다.")
+    return 0
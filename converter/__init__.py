@@ -0,0 +1,114 @@
+"""
+만능 파일 변환기 - 변환 엔진 패키지
+Streamlit UI와 분리된 변환 로직을 제공합니다.
+
+Pillow와 pandas는 실제로 필요한 이름에 처음 접근할 때 가져옵니다.
+그래서 `python -m converter`로 짧은 작업을 돌려도 빠르게 시작합니다.
+"""
+
+import importlib
+
+# 공개 이름 → 정의된 하위 모듈
+_EXPORTS = {
+    # 이미지
+    "DEFAULT_BACKGROUND": "converter.image",
+    "DEFAULT_PRESET": "converter.image",
+    "ENCODER_OPTIONS": "converter.image",
+    "ENCODER_PRESETS": "converter.image",
+    "can_passthrough": "converter.image",
+    "convert_image": "converter.image",
+    "encoder_settings": "converter.image",
+    "flatten_alpha": "converter.image",
+    "parse_background": "converter.image",
+    "BatchResult": "converter.batch",
+    "convert_images_parallel": "converter.batch",
+    "make_thumbnail": "converter.thumbnail",
+    "render_thumbnail": "converter.thumbnail",
+    # 압축
+    "SPILL_THRESHOLD": "converter.archive",
+    "StreamingZipWriter": "converter.archive",
+    "create_zip_from_files": "converter.archive",
+    "download_stream": "converter.archive",
+    # 캐시
+    "ConversionCache": "converter.cache",
+    "conversion_cache": "converter.cache",
+    "make_cache_key": "converter.cache",
+    # 메모리 예산
+    "MemoryBudgetExceeded": "converter.governor",
+    "MemoryGovernor": "converter.governor",
+    "estimate_batch_cost": "converter.governor",
+    "estimate_data_cost": "converter.governor",
+    "estimate_image_cost": "converter.governor",
+    "memory_governor": "converter.governor",
+    # 백그라운드 작업
+    "Job": "converter.jobs",
+    "JobManager": "converter.jobs",
+    "JobOutput": "converter.jobs",
+    "JobQueueFull": "converter.jobs",
+    "job_manager": "converter.jobs",
+    # CSV/Excel
+    "CsvDialect": "converter.sniff",
+    "detect_encoding": "converter.sniff",
+    "read_with_fallback": "converter.sniff",
+    "sniff_csv": "converter.sniff",
+    "COLUMNAR_FORMATS": "converter.data",
+    "DATA_FORMATS": "converter.data",
+    "EXCEL_MAX_ROWS": "converter.data",
+    "convert_data": "converter.data",
+    "convert_dataframe": "converter.data",
+    "read_dataframe": "converter.data",
+    "csv_to_xlsx_stream": "converter.data",
+    "iter_xlsx_to_csv": "converter.data",
+    "merge_csvs_to_xlsx": "converter.data",
+    "xlsx_to_csv_stream": "converter.data",
+    "BulkXlsxWriter": "converter.xlsx",
+    "write_xlsx": "converter.xlsx",
+    "list_sheets": "converter.sheets",
+    "sheets_to_csv_zip": "converter.sheets",
+    "COLUMNAR_CODECS": "converter.columnar",
+    "csv_to_columnar_stream": "converter.columnar",
+    "read_columnar": "converter.columnar",
+    "write_columnar": "converter.columnar",
+    "CompactReport": "converter.compact",
+    "compact_dataframe": "converter.compact",
+    "read_csv_compact": "converter.compact",
+    "read_dataframe_compact": "converter.compact",
+    "DataPreview": "converter.preview",
+    "count_csv_rows": "converter.preview",
+    "count_xlsx_rows": "converter.preview",
+    "preview_data": "converter.preview",
+    # 변환 전 헤더 검사
+    "ProbeResult": "converter.probe",
+    "probe_data": "converter.probe",
+    "probe_image": "converter.probe",
+    "probe_sheets": "converter.probe",
+    # HTTP API
+    "RequestLimiter": "converter.server",
+    "create_app": "converter.server",
+    # 성능 지표
+    "MetricsRegistry": "converter.metrics",
+    "capture": "converter.metrics",
+    "render_prometheus": "converter.metrics",
+    "stage": "converter.metrics",
+    "start_metrics_server": "converter.metrics",
+    # 공용
+    "MAX_WORKERS": "converter.utils",
+    "detect_format": "converter.utils",
+    "get_file_extension": "converter.utils",
+    "replace_extension": "converter.utils",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module 'converter' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,8 @@
+"""`python -m converter`로 일괄 변환 명령줄 도구를 실행합니다."""
+
+import sys
+
+from converter.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
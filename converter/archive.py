@@ -0,0 +1,161 @@
+"""
+스트리밍 ZIP 작성기
+변환이 끝난 파일을 바로 압축 파일에 추가하고, 일정 크기를 넘으면 디스크로 내립니다.
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+from typing import BinaryIO, Iterable, Optional
+
+
+# 이 크기를 넘으면 메모리 대신 임시 파일에 기록합니다
+SPILL_THRESHOLD = int(os.environ.get("CONVERTER_ZIP_SPILL_BYTES", 32 * 1024 * 1024))
+
+# 이미 압축된 형식은 다시 deflate해도 줄지 않으므로 그대로 저장합니다
+STORED_EXTENSIONS = {'jpg', 'jpeg', 'webp', 'png', 'zip', 'xlsx'}
+
+
+class _RawFileReader(io.RawIOBase):
+    """임의의 파일 객체를 읽기 전용 RawIOBase로 감쌉니다."""
+
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._fileobj.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._fileobj.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._fileobj.tell()
+
+
+def download_stream(fileobj) -> io.BufferedReader:
+    """
+    SpooledTemporaryFile 등을 st.download_button이 받는 파일 객체로 바꿉니다.
+
+    Streamlit은 bytes, BytesIO, BufferedReader, RawIOBase만 받으므로
+    내용을 복사하지 않고 BufferedReader로 감싸 처음 위치부터 읽게 합니다.
+    """
+    fileobj.seek(0)
+    return io.BufferedReader(_RawFileReader(fileobj))
+
+
+def _compress_type(filename: str) -> int:
+    """파일 확장자에 맞는 ZIP 압축 방식을 고릅니다."""
+    ext = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+class StreamingZipWriter:
+    """
+    파일을 하나씩 추가하는 ZIP 작성기.
+
+    내용은 SpooledTemporaryFile에 기록되므로 작은 압축 파일은 메모리에,
+    큰 압축 파일은 임시 파일에 놓이며 전체를 bytes로 복사하지 않습니다.
+    fileobj를 주면 그 파일에 바로 기록하며, 파일을 닫는 것은 호출한 쪽의 몫입니다.
+    """
+
+    def __init__(self, spill_threshold: int = SPILL_THRESHOLD, fileobj: Optional[BinaryIO] = None):
+        self._owns_file = fileobj is None
+        self._file = fileobj if fileobj is not None else tempfile.SpooledTemporaryFile(
+            max_size=spill_threshold, suffix='.zip'
+        )
+        self._zip: Optional[zipfile.ZipFile] = zipfile.ZipFile(self._file, 'w', zipfile.ZIP_DEFLATED)
+        self._reader: Optional[zipfile.ZipFile] = None
+        self.names: list = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, filename: str, data: bytes) -> None:
+        """파일 하나를 압축 파일에 추가합니다."""
+        if self._zip is None:
+            raise ValueError("이미 완료된 압축 파일에는 추가할 수 없습니다")
+        self._zip.writestr(filename, data, compress_type=_compress_type(filename))
+        self.names.append(filename)
+
+    def add_file(self, filename: str, path: str) -> None:
+        """디스크에 있는 파일을 메모리에 올리지 않고 조금씩 읽어 추가합니다."""
+        if self._zip is None:
+            raise ValueError("이미 완료된 압축 파일에는 추가할 수 없습니다")
+        self._zip.write(path, arcname=filename, compress_type=_compress_type(filename))
+        self.names.append(filename)
+
+    def finish(self) -> BinaryIO:
+        """
+        중앙 디렉터리를 기록하고 처음 위치부터 읽는 파일 객체를 반환합니다.
+
+        반환된 객체는 st.download_button의 data로 바로 넘길 수 있습니다.
+        """
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        return download_stream(self._file)
+
+    @property
+    def size(self) -> int:
+        """현재까지 기록된 압축 파일 크기 (바이트)."""
+        pos = self._file.tell()
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        self._file.seek(pos)
+        return size
+
+    @property
+    def spilled(self) -> bool:
+        """임시 파일로 넘어갔는지 여부."""
+        return bool(getattr(self._file, '_rolled', False))
+
+    def read(self, filename: str) -> bytes:
+        """완료된 압축 파일에서 항목 하나를 꺼냅니다."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._reader is None:
+            self._reader = zipfile.ZipFile(self._file, 'r')
+        return self._reader.read(filename)
+
+    def close(self) -> None:
+        """임시 파일을 정리합니다."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+        if self._owns_file:
+            self._file.close()
+
+
+def create_zip_from_files(files_data: Iterable) -> bytes:
+    """
+    여러 파일을 ZIP으로 압축합니다.
+
+    Args:
+        files_data: (파일명, 바이트데이터) 튜플의 리스트
+
+    Returns:
+        ZIP 파일의 바이트 데이터
+    """
+    with StreamingZipWriter() as writer:
+        for filename, data in files_data:
+            writer.add(filename, data)
+        return writer.finish().read()
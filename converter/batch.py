@@ -0,0 +1,185 @@
+"""
+병렬 일괄 이미지 변환 엔진
+공유 프로세스 풀(converter.pool)에서 convert_image를 실행하고, 큰 원본은 공유 메모리로 넘깁니다.
+"""
+
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from converter import metrics
+from converter.cache import ConversionCache, make_cache_key
+from converter.image import DEFAULT_PRESET, can_passthrough, convert_image, parse_background
+from converter.pool import BROKEN_POOL_ERROR, attach, free_payloads, get_pool, make_payload, reset_pool, submit_limited
+from converter.utils import MAX_WORKERS
+
+
+@dataclass
+class BatchResult:
+    """일괄 변환의 파일별 결과."""
+    index: int
+    name: str
+    data: Optional[bytes] = None
+    error: Optional[str] = None
+    # 이미 대상 형식이라 원본을 그대로 쓴 경우
+    passthrough: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _convert_worker(payload, original_format: str, target_format: str, options: dict) -> tuple:
+    """
+    워커 프로세스에서 실행되는 변환 함수.
+
+    워커의 단계별 측정값은 부모 프로세스의 레지스트리에 보이지 않으므로
+    (결과 바이트, 오류 메시지, 측정값 리스트)로 함께 돌려보냅니다.
+    """
+    result, error = None, None
+    with metrics.capture() as records, attach(payload) as data:
+        # 예외의 traceback이 공유 메모리 뷰를 붙잡지 않도록 attach 안에서 처리합니다
+        try:
+            result = convert_image(data, original_format, target_format, **options)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+    return result, error, records
+
+
+def _key_options(target_format: str, options: dict) -> dict:
+    """
+    캐시 키에 넣을 설정. 같은 결과를 내는 설정은 같은 키가 되도록 정규화합니다.
+
+    - 프리셋: 기본 프리셋이 바뀌어도 예전 결과를 돌려주지 않도록 None 대신 실제 이름
+    - 배경색: 'white', '#FFFFFF', (255, 255, 255)는 같은 (R, G, B). JPG가 아니면 쓰지 않으므로 뺍니다
+    """
+    key_options = {**options, 'preset': options.get('preset') or DEFAULT_PRESET}
+    if target_format.upper() in ('JPG', 'JPEG'):
+        try:
+            key_options['background'] = parse_background(options.get('background'))
+        except ValueError:
+            # 잘못된 색은 파일마다 변환할 때 같은 오류로 알려 줍니다
+            pass
+    else:
+        key_options.pop('background', None)
+    return key_options
+
+
+def convert_images_parallel(
+    files: Sequence[tuple],
+    target_format: str,
+    max_workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int, str], None]] = None,
+    on_result: Optional[Callable[[BatchResult], None]] = None,
+    cache: Optional[ConversionCache] = None,
+    priorities: Optional[Sequence[float]] = None,
+    **options,
+) -> list:
+    """
+    여러 이미지를 프로세스 풀에서 병렬로 변환합니다.
+
+    Args:
+        files: (파일명, 원본 확장자, 바이트데이터) 튜플의 리스트.
+            바이트데이터는 bytes 또는 memoryview 등 버퍼 객체입니다.
+        target_format: 변환할 이미지 형식
+        max_workers: 최대 워커 수 (None이면 MAX_WORKERS)
+        on_progress: (완료 수, 전체 수, 파일명)을 받는 진행률 콜백.
+            호출한 스레드에서 실행되므로 Streamlit 요소를 갱신해도 됩니다.
+        on_result: 파일 하나가 끝날 때마다 완료 순서대로 호출되는 콜백.
+            결과를 바로 압축 파일에 쓰고 result.data를 비우면 메모리를 아낄 수 있습니다.
+        cache: 변환 결과 캐시. 적중한 파일은 워커로 보내지 않습니다.
+        priorities: 파일별 예상 변환 시간 (converter.probe). 주면 오래 걸리는 파일부터
+            워커에 보내 마지막에 남은 큰 파일 하나가 배치 전체를 붙잡지 않게 합니다.
+        **options: convert_image에 그대로 넘길 설정 (max_size, scale, preset, encoder_options 등).
+            캐시 키에도 포함됩니다.
+
+    Returns:
+        업로드 순서대로 정렬된 BatchResult 리스트
+    """
+    total = len(files)
+    results = [BatchResult(index=i, name=name) for i, (name, _, _) in enumerate(files)]
+    cache_keys = {}
+    done = 0
+
+    def finish(idx: int) -> None:
+        nonlocal done
+        result = results[idx]
+        if cache is not None and result.ok and idx in cache_keys:
+            cache.put(cache_keys[idx], result.data)
+        if on_result:
+            on_result(result)
+        done += 1
+        if on_progress:
+            on_progress(done, total, result.name)
+
+    key_options = _key_options(target_format, options)
+
+    # 그대로 쓸 파일과 캐시에 있는 결과는 바로 채우고 나머지만 변환 대상으로 남깁니다
+    pending = []
+    for idx, (name, original_format, data) in enumerate(files):
+        if can_passthrough(data, target_format, **options):
+            # 이미 대상 형식이면 캐시나 워커를 거치지 않고 원본을 그대로 씁니다
+            try:
+                results[idx].data = convert_image(data, original_format, target_format, **options)
+                results[idx].passthrough = True
+            except Exception as e:
+                results[idx].error = str(e) or type(e).__name__
+            finish(idx)
+            continue
+        if cache is not None:
+            key = make_cache_key(data, target_format, **key_options)
+            cached = cache.get(key)
+            if cached is not None:
+                results[idx].data = cached
+                finish(idx)
+                continue
+            cache_keys[idx] = key
+        pending.append(idx)
+    if priorities is not None:
+        pending.sort(key=lambda idx: priorities[idx], reverse=True)
+
+    workers = min(max_workers or MAX_WORKERS, MAX_WORKERS, len(pending))
+
+    if workers <= 1:
+        # 파일이 하나뿐이거나 병렬화가 꺼진 경우: 풀 없이 현재 스레드에서 변환
+        for idx in pending:
+            _, original_format, data = files[idx]
+            try:
+                results[idx].data = convert_image(data, original_format, target_format, **options)
+            except Exception as e:
+                results[idx].error = str(e) or type(e).__name__
+            finish(idx)
+        return results
+
+    pool = get_pool()
+    segments = {}
+
+    def jobs():
+        for idx in pending:
+            _, original_format, data = files[idx]
+            segments[idx] = []
+            yield idx, (make_payload(data, segments[idx]), original_format, target_format, options)
+
+    try:
+        for idx, future in submit_limited(pool, _convert_worker, jobs(), workers):
+            try:
+                results[idx].data, results[idx].error, records = future.result()
+                metrics.registry.merge(records)
+            except BrokenProcessPool:
+                results[idx].error = BROKEN_POOL_ERROR
+            except Exception as e:
+                results[idx].error = str(e) or type(e).__name__
+            free_payloads(segments.pop(idx))
+            finish(idx)
+    except BrokenProcessPool:
+        # 제출 도중 풀이 깨진 경우: 남은 파일은 실패로 표시
+        for result in results:
+            if result.data is None and result.error is None:
+                result.error = BROKEN_POOL_ERROR
+    finally:
+        for shms in segments.values():
+            free_payloads(shms)
+
+    if any(r.error == BROKEN_POOL_ERROR for r in results):
+        reset_pool(pool)
+    return results
@@ -0,0 +1,227 @@
+"""
+변환 결과 캐시
+입력 바이트, 대상 형식, 인코더 설정의 해시를 키로 변환 결과를 재사용합니다.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+# 메모리 캐시 전체 용량 (CONVERTER_CACHE_BYTES 환경 변수로 조정)
+CACHE_MAX_BYTES = int(os.environ.get("CONVERTER_CACHE_BYTES", 256 * 1024 * 1024))
+
+# 디스크 캐시 위치와 용량 (CONVERTER_CACHE_DIR을 지정해야 켜집니다)
+CACHE_DIR = os.environ.get("CONVERTER_CACHE_DIR") or None
+CACHE_DISK_MAX_BYTES = int(os.environ.get("CONVERTER_CACHE_DISK_BYTES", 2 * 1024 * 1024 * 1024))
+
+# 이보다 오래된 디스크 캐시의 .tmp 파일은 쓰다가 중단된 것으로 보고 시작할 때 지웁니다
+# (같은 폴더를 쓰는 다른 프로세스가 지금 쓰고 있는 파일은 남겨 둡니다)
+STALE_TMP_SECONDS = 60 * 60
+
+
+def make_cache_key(data, target_format: str, **params) -> str:
+    """
+    변환 결과 캐시 키를 만듭니다.
+
+    Args:
+        data: 원본 바이트 데이터 (bytes 또는 memoryview)
+        target_format: 변환할 형식
+        **params: 결과에 영향을 주는 인코더 설정
+
+    Returns:
+        16진수 해시 문자열
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(memoryview(data).cast('B'))
+    digest.update(target_format.upper().encode())
+    for name in sorted(params):
+        value = params[name]
+        if isinstance(value, dict):
+            # 같은 설정이면 넣은 순서와 관계없이 같은 키가 되도록 정렬합니다
+            value = sorted(value.items())
+        digest.update(f"\0{name}={value!r}".encode())
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """
+    바이트 예산 기반 LRU 캐시.
+
+    한 프로세스 안의 모든 Streamlit 세션이 같은 인스턴스를 공유하므로
+    모든 연산은 잠금으로 보호합니다. disk_dir을 주면 메모리에서 밀려난
+    결과를 로컬 디스크에 두었다가 다시 올립니다.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_MAX_BYTES,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = CACHE_DISK_MAX_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._disk_entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """캐시된 결과를 반환합니다. 없으면 None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            if key in self._disk_entries:
+                value = self._read_disk(key)
+                if value is not None:
+                    self.disk_hits += 1
+                    self._store_memory(key, value)
+                    return value
+
+            self.misses += 1
+            return None
+
+    def __contains__(self, key: str) -> bool:
+        """적중률 통계를 바꾸지 않고 캐시에 있는지만 확인합니다."""
+        with self._lock:
+            return key in self._entries or key in self._disk_entries
+
+    def put(self, key: str, value: bytes) -> None:
+        """결과를 캐시에 저장합니다. 예산보다 큰 결과는 디스크에만 둡니다."""
+        with self._lock:
+            if len(value) <= self.max_bytes:
+                self._store_memory(key, value)
+            elif self.disk_dir:
+                self._write_disk(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> bytes:
+        """캐시에 있으면 그대로, 없으면 compute()를 실행해 저장 후 반환합니다."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self) -> dict:
+        """적중/실패 횟수와 사용량을 반환합니다."""
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "disk_entries": len(self._disk_entries),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self) -> None:
+        """메모리와 디스크의 모든 항목을 지웁니다."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for key in list(self._disk_entries):
+                self._remove_disk(key)
+
+    # ---------- 내부 구현 (잠금을 잡은 상태에서 호출) ----------
+
+    def _store_memory(self, key: str, value: bytes) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = value
+        self._bytes += len(value)
+
+        while self._bytes > self.max_bytes and self._entries:
+            old_key, old_value = self._entries.popitem(last=False)
+            self._bytes -= len(old_value)
+            self.evictions += 1
+            if self.disk_dir and old_key not in self._disk_entries:
+                self._write_disk(old_key, old_value)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + ".bin")
+
+    def _load_disk_index(self) -> None:
+        found = []
+        stale_before = time.time() - STALE_TMP_SECONDS
+        for entry in os.scandir(self.disk_dir):
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+            if entry.name.endswith(".bin"):
+                found.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+            elif entry.name.endswith(".tmp") and stat.st_mtime < stale_before:
+                # 프로세스가 _write_disk 도중에 죽으면 남는 파일입니다
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+        for _, key, size in sorted(found):
+            self._disk_entries[key] = size
+            self._disk_bytes += size
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = f.read()
+            os.utime(path)
+        except OSError:
+            self._disk_bytes -= self._disk_entries.pop(key, 0)
+            return None
+        self._disk_entries.move_to_end(key)
+        return value
+
+    def _write_disk(self, key: str, value: bytes) -> None:
+        if len(value) > self.disk_max_bytes:
+            return
+        # 쓰는 도중의 파일이 읽히지 않도록 임시 파일에 쓰고 이름을 바꿉니다
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(value)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        self._disk_bytes -= self._disk_entries.pop(key, 0)
+        self._disk_entries[key] = len(value)
+        self._disk_bytes += len(value)
+
+        while self._disk_bytes > self.disk_max_bytes and self._disk_entries:
+            self._remove_disk(next(iter(self._disk_entries)))
+
+    def _remove_disk(self, key: str) -> None:
+        self._disk_bytes -= self._disk_entries.pop(key, 0)
+        try:
+            os.unlink(self._disk_path(key))
+        except OSError:
+            pass
+
+
+# 프로세스 전체에서 공유하는 기본 캐시
+conversion_cache = ConversionCache(disk_dir=CACHE_DIR)
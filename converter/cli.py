@@ -0,0 +1,328 @@
+"""
+일괄 변환 명령줄 도구
+
+    python -m converter 사진폴더 --to webp -o 변환결과
+    python -m converter 보고서.csv 데이터폴더 --to xlsx -o 변환결과 --workers 8
+    python -m converter 로그.csv --to parquet --codec zstd -o 변환결과
+    python -m converter 사진폴더 --to jpg --max-size 1200 -o 웹용
+    python -m converter 스크린샷 --to png --preset fastest -o 변환결과
+    python -m converter 사진폴더 --to webp -E quality=70 -E method=6 -o 변환결과
+    python -m converter 로고폴더 --to jpg --background '#f0f0f0' -o 변환결과
+
+폴더는 하위 폴더까지 모두 찾아 같은 구조로 출력 폴더에 저장합니다. 원본 폴더 안에 있는
+출력 폴더는 탐색하지 않고, 출력 이름이 겹치는 파일(a.png와 a.jpg → a.webp)은 덮어쓰지 않고 실패로 알립니다.
+출력 파일이 원본보다 새로우면 건너뜁니다 (--force로 다시 변환).
+Pillow와 pandas는 워커가 실제로 변환할 때만 가져옵니다.
+"""
+
+import argparse
+import mmap
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator, Optional
+
+from converter.utils import MAX_WORKERS, get_file_extension, replace_extension
+
+
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp'}
+IMAGE_TARGETS = ('png', 'jpg', 'webp')
+
+# 데이터 변환 대상 형식 → 받을 수 있는 원본 확장자
+# (converter.data.DATA_FORMATS와 같지만, 시작할 때 pandas를 가져오지 않도록 다시 적습니다)
+DATA_FORMATS = ('csv', 'xlsx', 'parquet', 'feather', 'arrow')
+DATA_SOURCES = {target: set(DATA_FORMATS) - {target} for target in DATA_FORMATS}
+
+TARGETS = IMAGE_TARGETS + tuple(DATA_SOURCES)
+
+# converter.image.ENCODER_PRESETS의 이름 (시작할 때 Pillow를 가져오지 않도록 다시 적습니다)
+ENCODER_PRESETS = ('fastest', 'balanced', 'smallest')
+
+# 워커당 동시에 제출해 두는 작업 수 (수십만 개 파일도 Future를 한꺼번에 만들지 않습니다)
+_TASKS_PER_WORKER = 4
+
+
+def source_extensions(target: str) -> set:
+    """대상 형식으로 변환할 수 있는 원본 확장자를 반환합니다."""
+    return IMAGE_EXTENSIONS if target in IMAGE_TARGETS else DATA_SOURCES[target]
+
+
+def iter_tasks(sources: list, target: str, output_dir: str) -> Iterator[tuple]:
+    """
+    (원본 경로, 출력 경로) 쌍을 차례로 만듭니다.
+
+    폴더는 하위 폴더까지 탐색하고, 원본 폴더 기준 상대 경로를 출력 폴더에 그대로 씁니다.
+    출력 폴더가 원본 폴더 안에 있으면 그 폴더는 탐색하지 않습니다 (지난 실행의 결과를 다시 변환하지 않게).
+
+    Raises:
+        ValueError: 출력 폴더가 원본 폴더와 같을 때
+    """
+    extensions = source_extensions(target)
+    output_real = os.path.realpath(output_dir)
+    for source in sources:
+        if os.path.isfile(source):
+            name = os.path.basename(source)
+            yield source, os.path.join(output_dir, replace_extension(name, target))
+            continue
+
+        if os.path.realpath(source) == output_real:
+            raise ValueError(f"출력 폴더는 원본 폴더와 달라야 합니다: {source}")
+        for root, dirs, files in os.walk(source):
+            dirs[:] = sorted(d for d in dirs if os.path.realpath(os.path.join(root, d)) != output_real)
+            relative_root = os.path.relpath(root, source)
+            for name in sorted(files):
+                if get_file_extension(name) not in extensions:
+                    continue
+                destination = os.path.normpath(
+                    os.path.join(output_dir, relative_root, replace_extension(name, target))
+                )
+                yield os.path.join(root, name), destination
+
+
+def is_up_to_date(source: str, destination: str) -> bool:
+    """출력 파일이 있고 원본보다 새로우면 True."""
+    try:
+        return os.stat(destination).st_mtime >= os.stat(source).st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def convert_file(
+    source: str,
+    destination: str,
+    target: str,
+    codec: Optional[str] = None,
+    **image_options,
+) -> int:
+    """
+    파일 하나를 변환해 저장합니다. 워커 프로세스에서 실행됩니다.
+
+    중간에 중단돼도 반쯤 쓴 파일이 최신으로 보이지 않도록
+    임시 파일에 쓴 뒤 이름을 바꿉니다.
+
+    Returns:
+        출력 파일 크기 (바이트)
+    """
+    os.makedirs(os.path.dirname(destination) or '.', exist_ok=True)
+    partial = f"{destination}.{os.getpid()}.part"
+    source_format = get_file_extension(source)
+    try:
+        if target in IMAGE_TARGETS:
+            from converter.image import convert_image
+
+            with open(source, 'rb') as f:
+                data = f.read()
+            with open(partial, 'wb') as f:
+                f.write(convert_image(data, get_file_extension(source), target, **image_options))
+        elif source_format == 'csv' and target == 'xlsx':
+            from converter.data import csv_to_xlsx_stream
+
+            csv_to_xlsx_stream(source, partial, **_sniff_file(source))
+        elif source_format == 'csv' and target != 'xlsx':
+            from converter.columnar import csv_to_columnar_stream
+
+            csv_to_columnar_stream(source, partial, target, codec, **_sniff_file(source))
+        elif source_format == 'xlsx' and target == 'csv':
+            from converter.data import xlsx_to_csv_stream
+
+            with open(partial, 'wb') as f:
+                xlsx_to_csv_stream(source, f)
+        else:
+            # 컬럼 기반 형식이 섞인 나머지 조합은 DataFrame을 거쳐 변환합니다
+            from converter.data import convert_data
+
+            with open(source, 'rb') as f:
+                data = convert_data(f.read(), source_format, target, codec)
+            with open(partial, 'wb') as f:
+                f.write(data)
+        os.replace(partial, destination)
+    finally:
+        if os.path.exists(partial):
+            os.unlink(partial)
+    return os.path.getsize(destination)
+
+
+def _sniff_file(source: str) -> dict:
+    """파일 전체를 읽지 않고 메모리 매핑으로 샘플만 훑어 CSV 읽기 설정을 정합니다."""
+    from converter.sniff import sniff_csv
+
+    with open(source, 'rb') as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return sniff_csv(mapped).read_csv_kwargs()
+    return sniff_csv(b'').read_csv_kwargs()
+
+
+def run_batch(
+    sources: list,
+    target: str,
+    output_dir: str,
+    workers: int = MAX_WORKERS,
+    force: bool = False,
+    verbose: bool = False,
+    codec: Optional[str] = None,
+    image_options: Optional[dict] = None,
+) -> dict:
+    """
+    여러 파일을 병렬로 변환합니다.
+
+    Returns:
+        {'converted': 변환 수, 'skipped': 건너뛴 수, 'failed': 실패 수, 'bytes': 출력 바이트}
+    """
+    stats = {'converted': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+    image_options = image_options or {}
+
+    # 출력 경로 → 그 경로로 변환할 첫 원본 (다른 원본이 같은 출력을 덮어쓰지 않게)
+    claimed = {}
+
+    def pending_tasks():
+        for source, destination in iter_tasks(sources, target, output_dir):
+            key = os.path.normcase(os.path.abspath(destination))
+            first = claimed.setdefault(key, source)
+            if first != source:
+                record(source, None, ValueError(f"'{first}'와(과) 출력 파일이 같아 건너뜁니다: {destination}"))
+                continue
+            if not force and is_up_to_date(source, destination):
+                stats['skipped'] += 1
+                continue
+            yield source, destination
+
+    def record(source: str, size: Optional[int], error: Optional[BaseException]):
+        if error is None:
+            stats['converted'] += 1
+            stats['bytes'] += size
+            if verbose:
+                print(f"✅ {source}")
+        else:
+            stats['failed'] += 1
+            print(f"⚠️ {source}: {error}", file=sys.stderr)
+
+    if workers <= 1:
+        for source, destination in pending_tasks():
+            try:
+                record(source, convert_file(source, destination, target, codec, **image_options), None)
+            except Exception as e:
+                record(source, None, e)
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = {}
+        for source, destination in pending_tasks():
+            future = pool.submit(convert_file, source, destination, target, codec, **image_options)
+            in_flight[future] = source
+            if len(in_flight) < workers * _TASKS_PER_WORKER:
+                continue
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                record(in_flight.pop(future), *_outcome(future))
+        for future in wait(in_flight).done:
+            record(in_flight.pop(future), *_outcome(future))
+    return stats
+
+
+def _outcome(future) -> tuple:
+    try:
+        return future.result(), None
+    except Exception as e:
+        return None, e
+
+
+def parse_encoder_option(text: str) -> tuple:
+    """'이름=값' 형식의 인코더 설정을 (이름, 값)으로 바꿉니다. 값은 정수·불리언·문자열 순으로 해석합니다."""
+    name, sep, value = text.partition('=')
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"'이름=값' 형식이어야 합니다: {text}")
+    lowered = value.lower()
+    if lowered in ('true', 'yes', 'on'):
+        return name, True
+    if lowered in ('false', 'no', 'off'):
+        return name, False
+    try:
+        return name, int(value)
+    except ValueError:
+        return name, value
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m converter",
+        description="이미지와 CSV/Excel 파일을 폴더 단위로 일괄 변환합니다.",
+    )
+    parser.add_argument("sources", nargs="+", help="변환할 파일 또는 폴더")
+    parser.add_argument("--to", dest="target", required=True, choices=TARGETS, type=str.lower,
+                        help="변환할 형식")
+    parser.add_argument("-o", "--output", required=True, help="출력 폴더")
+    parser.add_argument("--codec", type=str.lower,
+                        help="Parquet/Feather/Arrow 압축 코덱 (예: snappy, zstd, lz4, none)")
+    parser.add_argument("--max-size", type=int, metavar="PX",
+                        help="이미지의 긴 변 최대 길이 (더 크면 비율을 유지해 줄임)")
+    parser.add_argument("--scale", type=float,
+                        help="이미지 축소 배율 (0~1, 예: 0.5)")
+    parser.add_argument("--preset", choices=ENCODER_PRESETS, default=None,
+                        help="이미지 인코더 프리셋: 속도 우선, 균형(기본값), 크기 우선")
+    parser.add_argument("-E", "--encoder-option", dest="encoder_options", action="append", default=[],
+                        type=parse_encoder_option, metavar="이름=값",
+                        help="프리셋 위에 덮어쓸 인코더 설정 (예: quality=80, compress_level=1, lossless=true)")
+    parser.add_argument("--background", metavar="색",
+                        help="JPG로 바꿀 때 투명한 부분을 채울 배경색 (예: white, #f0f0f0, 기본값: 흰색)")
+    parser.add_argument("-j", "--workers", type=int, default=MAX_WORKERS,
+                        help=f"동시에 실행할 워커 수 (기본값: {MAX_WORKERS})")
+    parser.add_argument("--force", action="store_true", help="최신 출력 파일이 있어도 다시 변환")
+    parser.add_argument("-v", "--verbose", action="store_true", help="변환한 파일을 모두 출력")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.scale is not None and not 0 < args.scale <= 1:
+        parser.error("--scale은 0보다 크고 1 이하여야 합니다")
+    encoder_options = dict(args.encoder_options) or None
+    if encoder_options and args.target in IMAGE_TARGETS:
+        # 파일마다 같은 오류가 나지 않도록 미리 확인합니다
+        from converter.image import encoder_settings
+
+        try:
+            encoder_settings('JPEG' if args.target == 'jpg' else args.target.upper(), args.preset, encoder_options)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.background is not None:
+        from converter.image import parse_background
+
+        try:
+            parse_background(args.background)
+        except ValueError as e:
+            parser.error(f"--background: {e}")
+    missing = [source for source in args.sources if not os.path.exists(source)]
+    if missing:
+        print(f"⚠️ 경로를 찾을 수 없습니다: {', '.join(missing)}", file=sys.stderr)
+        return 2
+    if os.path.isdir(args.output) and any(
+        os.path.isdir(source) and os.path.samefile(source, args.output) for source in args.sources
+    ):
+        parser.error("출력 폴더는 원본 폴더와 달라야 합니다")
+
+    started = time.perf_counter()
+    stats = run_batch(
+        args.sources,
+        args.target,
+        args.output,
+        workers=args.workers,
+        force=args.force,
+        verbose=args.verbose,
+        codec=args.codec,
+        image_options={
+            'max_size': args.max_size,
+            'scale': args.scale,
+            'preset': args.preset,
+            'encoder_options': encoder_options,
+            'background': args.background,
+        },
+    )
+    elapsed = time.perf_counter() - started
+    print(
+        f"변환 {stats['converted']:,}개 · 건너뜀 {stats['skipped']:,}개 · "
+        f"실패 {stats['failed']:,}개 · {stats['bytes'] / 1024 / 1024:,.1f} MB · {elapsed:.1f}초"
+    )
+    return 1 if stats['failed'] else 0
@@ -0,0 +1,232 @@
+"""
+컬럼 기반 형식 (Parquet / Feather / Arrow IPC) 읽기·쓰기
+pyarrow의 멀티스레드 리더와 라이터를 사용합니다.
+
+Feather v2는 Arrow IPC 파일 형식과 같습니다. 두 형식은 확장자와
+기본 압축 코덱만 다릅니다.
+"""
+
+import re
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# 형식별로 고를 수 있는 압축 코덱 (첫 번째가 기본값)
+COLUMNAR_CODECS = {
+    'parquet': ('snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none'),
+    'feather': ('lz4', 'zstd', 'none'),
+    'arrow': ('none', 'lz4', 'zstd'),
+}
+
+# 스트리밍 CSV 변환 시 pyarrow가 한 번에 읽는 블록 크기 (바이트)
+CSV_BLOCK_BYTES = 8 * 1024 * 1024
+
+_COLUMN_INDEX = re.compile(r"column #(\d+)")
+
+
+def _codec(target_format: str, codec: Optional[str]) -> Optional[str]:
+    """코덱 이름을 확인하고 pyarrow에 넘길 값으로 바꿉니다 ('none'은 None)."""
+    codecs = COLUMNAR_CODECS.get(target_format)
+    if codecs is None:
+        raise ValueError(f"지원하지 않는 데이터 형식입니다: {target_format}")
+    codec = (codec or codecs[0]).lower()
+    if codec not in codecs:
+        raise ValueError(f"{target_format}에서 지원하지 않는 압축 코덱입니다: {codec}")
+    return None if codec == 'none' else codec
+
+
+def _input(data) -> pa.BufferReader:
+    """bytes/memoryview를 복사 없이 pyarrow 입력으로 감쌉니다."""
+    return pa.BufferReader(pa.py_buffer(data))
+
+
+def _open_ipc(data):
+    """Arrow IPC 파일을 엽니다. 파일 형식이 아니면 스트림 형식으로 다시 시도합니다."""
+    try:
+        return ipc.open_file(_input(data))
+    except pa.ArrowInvalid:
+        return ipc.open_stream(_input(data))
+
+
+def read_columnar(data, source_format: str) -> pd.DataFrame:
+    """
+    Parquet/Feather/Arrow 바이트 데이터를 DataFrame으로 읽습니다.
+
+    Args:
+        data: 원본 바이트 데이터 (bytes 또는 memoryview)
+        source_format: 'parquet', 'feather', 'arrow' 중 하나
+
+    Returns:
+        읽어 들인 DataFrame
+    """
+    if source_format == 'parquet':
+        table = pq.read_table(_input(data), use_threads=True)
+    else:
+        table = _open_ipc(data).read_all()
+    return table.to_pandas(use_threads=True)
+
+
+def preview_columnar(data, source_format: str, rows: int) -> tuple:
+    """
+    앞부분 행만 읽은 DataFrame과 메타데이터에 기록된 전체 행 수를 반환합니다.
+
+    Returns:
+        (DataFrame, 행 수)
+    """
+    if source_format == 'parquet':
+        parquet_file = pq.ParquetFile(_input(data))
+        total = parquet_file.metadata.num_rows
+        batch = next(parquet_file.iter_batches(batch_size=rows), None)
+        schema = parquet_file.schema_arrow
+    else:
+        reader = _open_ipc(data)
+        schema = reader.schema
+        if isinstance(reader, ipc.RecordBatchFileReader):
+            total = reader.count_rows()
+            batch = reader.get_batch(0) if reader.num_record_batches else None
+        else:
+            # 스트림 형식은 메타데이터가 없어 끝까지 읽어야 합니다
+            table = reader.read_all()
+            total = table.num_rows
+            batch = table.slice(0, rows)
+    if batch is None:
+        return schema.empty_table().to_pandas(), total
+    return batch.slice(0, rows).to_pandas(), total
+
+
+def _arrow_table(df: pd.DataFrame) -> pa.Table:
+    """
+    DataFrame을 Arrow 테이블로 바꿉니다.
+
+    Excel에서 읽은 열처럼 숫자와 문자열이 섞인 object 열은 Arrow 타입이
+    하나로 정해지지 않으므로 문자열 열로 바꿉니다.
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df = df.copy()
+        for column in df.columns[df.dtypes == object]:
+            try:
+                pa.array(df[column], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                df[column] = df[column].map(lambda v: v if v is None or pd.isna(v) else str(v))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _writer(output, schema: pa.Schema, target_format: str, codec: Optional[str]):
+    """형식에 맞는 배치 라이터를 엽니다."""
+    if target_format == 'parquet':
+        return pq.ParquetWriter(output, schema, compression=codec or 'none')
+    return ipc.new_file(output, schema, options=ipc.IpcWriteOptions(compression=codec))
+
+
+def write_columnar(df: pd.DataFrame, output, target_format: str, codec: Optional[str] = None) -> None:
+    """
+    DataFrame을 Parquet/Feather/Arrow 형식으로 output에 기록합니다.
+
+    Args:
+        df: 기록할 DataFrame
+        output: 파일 경로 또는 쓰기 가능한 바이너리 파일 객체
+        target_format: 'parquet', 'feather', 'arrow' 중 하나
+        codec: 압축 코덱 (None이면 형식별 기본값)
+    """
+    codec = _codec(target_format, codec)
+    table = _arrow_table(df)
+    with _writer(output, table.schema, target_format, codec) as writer:
+        writer.write_table(table)
+
+
+def _csv_options(encoding: str, sep: str, quotechar: str, header, newlines_in_values: bool,
+                 column_types: dict) -> tuple:
+    """pandas.read_csv 인자를 pyarrow CSV 옵션으로 옮깁니다."""
+    read_options = pa_csv.ReadOptions(
+        # pyarrow는 UTF-8 BOM을 스스로 건너뜁니다
+        encoding='utf8' if encoding.lower().replace('_', '-') in ('utf-8', 'utf-8-sig', 'utf8') else encoding,
+        use_threads=True,
+        block_size=CSV_BLOCK_BYTES,
+        autogenerate_column_names=header is None,
+    )
+    parse_options = pa_csv.ParseOptions(
+        delimiter=sep,
+        quote_char=quotechar or False,
+        newlines_in_values=newlines_in_values,
+    )
+    # pandas처럼 빈 문자열도 결측값으로 읽습니다
+    convert_options = pa_csv.ConvertOptions(strings_can_be_null=True, column_types=column_types)
+    return read_options, parse_options, convert_options
+
+
+def _widen(data_type: pa.DataType) -> pa.DataType:
+    """뒤쪽 블록에서 변환에 실패한 열의 타입을 한 단계 넓힙니다."""
+    if pa.types.is_integer(data_type):
+        return pa.float64()
+    return pa.string()
+
+
+def csv_to_columnar_stream(
+    source,
+    output,
+    target_format: str,
+    codec: Optional[str] = None,
+    encoding: str = 'utf-8',
+    sep: str = ',',
+    quotechar: str = '"',
+    header=0,
+    newlines_in_values: bool = True,
+) -> dict:
+    """
+    CSV를 블록 단위로 읽어 일정한 메모리로 Parquet/Feather/Arrow를 작성합니다.
+
+    pyarrow 스트리밍 리더는 첫 블록으로 열 타입을 정하므로, 뒤쪽 블록에서
+    변환에 실패하면 그 열의 타입을 넓혀(정수 → 실수 → 문자열) 처음부터 다시 씁니다.
+
+    Args:
+        source: CSV 파일 경로 또는 seek 가능한 파일 객체
+        output: 파일 경로 또는 seek 가능한 바이너리 파일 객체
+        target_format: 'parquet', 'feather', 'arrow' 중 하나
+        codec: 압축 코덱 (None이면 형식별 기본값)
+        encoding, sep, quotechar, header: CsvDialect.read_csv_kwargs()와 같은 CSV 읽기 설정
+        newlines_in_values: 따옴표 안 줄바꿈 허용 여부. 없다고 확실할 때
+            False로 두면 블록을 병렬로 파싱해 더 빠릅니다.
+
+    Returns:
+        {'rows': 데이터 행 수, 'columns': 열 수}
+    """
+    codec = _codec(target_format, codec)
+    column_types = {}
+    while True:
+        options = _csv_options(encoding, sep, quotechar, header, newlines_in_values, column_types)
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        if hasattr(output, 'seek'):
+            output.seek(0)
+            output.truncate()
+
+        reader = pa_csv.open_csv(source, *options)
+        schema = reader.schema
+        if header is None:
+            # pandas처럼 열 이름을 0, 1, 2 ...로 붙입니다
+            schema = pa.schema([field.with_name(str(i)) for i, field in enumerate(schema)])
+        rows = 0
+        try:
+            with _writer(output, schema, target_format, codec) as writer:
+                for batch in reader:
+                    if header is None:
+                        batch = pa.RecordBatch.from_arrays(batch.columns, schema=schema)
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+        except pa.ArrowInvalid as e:
+            match = _COLUMN_INDEX.search(str(e))
+            if match is None:
+                raise
+            field = reader.schema.field(int(match.group(1)))
+            if field.type == pa.string():
+                raise
+            column_types[field.name] = _widen(field.type)
+            continue
+        return {'rows': rows, 'columns': len(schema)}
+
@@ -0,0 +1,254 @@
+"""
+메모리를 아끼는 DataFrame 읽기
+값을 바꾸지 않는 범위에서 열마다 더 작은 dtype으로 바꿔, 같은 메모리로 더 큰 파일을 전체 파싱합니다.
+
+- 정수: 값 범위에 맞는 가장 작은 정수 (int64 → int8/uint16 등)
+- 문자열: Arrow 문자열, 같은 값이 많이 반복되면 범주형(category)
+- 실수: float32로 줄이면 CSV에 쓰이는 숫자 표기가 달라지므로 그대로 둡니다
+
+CSV는 CSV_CHUNK_ROWS행씩 나눠 읽고 블록마다 줄이므로, 기본 dtype으로
+파일 전체를 한꺼번에 만드는 순간이 없습니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pandas as pd
+from pandas.api.types import (
+    infer_dtype,
+    is_integer_dtype,
+    is_numeric_dtype,
+    is_object_dtype,
+    is_string_dtype,
+    union_categoricals,
+)
+
+from converter.metrics import stage
+
+
+# 서로 다른 값이 행 수의 이 비율 이하인 문자열 열은 범주형으로 바꿉니다
+CATEGORY_MAX_RATIO = 0.5
+
+# 범주형은 코드 배열을 따로 두므로 너무 짧은 열에서는 이득이 없습니다
+CATEGORY_MIN_ROWS = 1_000
+
+# pandas 2에서도 문자열을 Arrow로 보관합니다 (pandas 3은 기본값)
+_ARROW_STRING = pd.StringDtype("pyarrow")
+
+
+@dataclass
+class CompactReport:
+    """dtype을 줄여 절약한 메모리."""
+    bytes_before: int = 0
+    bytes_after: int = 0
+    # 열 이름 → (원래 dtype, 바꾼 dtype)
+    columns: dict = field(default_factory=dict)
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def ratio(self) -> float:
+        """원래 크기 대비 절약한 비율 (0~1)."""
+        return self.bytes_saved / self.bytes_before if self.bytes_before else 0.0
+
+
+def _memory(frame) -> int:
+    return int(frame.memory_usage(index=False, deep=True).sum())
+
+
+def _smallest_integer(series: pd.Series) -> pd.Series:
+    if series.empty:
+        return series
+    downcast = 'unsigned' if series.min() >= 0 else 'integer'
+    return pd.to_numeric(series, downcast=downcast)
+
+
+def _is_text(series: pd.Series) -> bool:
+    """문자열(과 결측값)만 있는 object 열인지 확인합니다."""
+    return infer_dtype(series, skipna=True) in ('string', 'empty')
+
+
+def _few_unique(series: pd.Series) -> bool:
+    """서로 다른 값이 충분히 적어 범주형이 이득인 열인지 확인합니다."""
+    if len(series) < CATEGORY_MIN_ROWS:
+        return False
+    limit = len(series) * CATEGORY_MAX_RATIO
+    try:
+        # 값이 거의 다 다른 열(ID 등)은 앞부분만 보고 걸러 전체 해시 표를 만들지 않습니다
+        if series.iloc[:CATEGORY_MIN_ROWS].nunique(dropna=True) > CATEGORY_MIN_ROWS * CATEGORY_MAX_RATIO:
+            return False
+        return series.nunique(dropna=True) <= limit
+    except TypeError:
+        # 해시할 수 없는 값이 섞인 열
+        return False
+
+
+def _is_category_candidate(series: pd.Series) -> bool:
+    dtype = series.dtype
+    return (
+        (is_object_dtype(dtype) or is_string_dtype(dtype))
+        and not isinstance(dtype, pd.CategoricalDtype)
+        and _few_unique(series)
+    )
+
+
+def _compact_column(series: pd.Series, category: bool) -> Optional[pd.Series]:
+    """더 작은 dtype으로 바꾼 열을 반환합니다. 바꿀 것이 없으면 None."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return None
+    if is_integer_dtype(dtype):
+        compact = _smallest_integer(series)
+        return compact if compact.dtype != dtype else None
+    if not (is_object_dtype(dtype) or is_string_dtype(dtype)):
+        return None
+    if category:
+        # 범주에는 원래 값이 그대로 들어가므로 숫자와 문자가 섞인 열도 값이 바뀌지 않습니다
+        return series.astype('category')
+    if is_object_dtype(dtype) and _is_text(series):
+        return series.astype(_ARROW_STRING)
+    return None
+
+
+def _compact(df: pd.DataFrame, category_columns) -> CompactReport:
+    report = CompactReport(bytes_before=_memory(df))
+    for position, name in enumerate(df.columns):
+        series = df.iloc[:, position]
+        compact = _compact_column(series, name in category_columns)
+        if compact is not None:
+            # 이름이 같은 열이 있어도 정확히 이 열만 바꿉니다
+            df.isetitem(position, compact)
+            report.columns[name] = (str(series.dtype), str(compact.dtype))
+    report.bytes_after = _memory(df)
+    return report
+
+
+def compact_dataframe(df: pd.DataFrame, categories: bool = True) -> CompactReport:
+    """
+    값을 바꾸지 않고 열마다 더 작은 dtype으로 바꿉니다. df를 직접 수정합니다.
+
+    Args:
+        df: 줄일 DataFrame
+        categories: 반복되는 문자열 열을 범주형으로 바꿀지 여부
+
+    Returns:
+        바꾸기 전후 메모리와 바뀐 열 목록
+    """
+    category_columns = set()
+    if categories:
+        category_columns = {name for name, series in df.items() if _is_category_candidate(series)}
+    return _compact(df, category_columns)
+
+
+def _concat_column(parts: list) -> pd.Series:
+    """블록별 열을 하나로 합칩니다. 범주형은 범주를 합쳐 범주형으로 유지합니다."""
+    if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+        try:
+            return pd.Series(union_categoricals(parts), name=parts[0].name)
+        except TypeError:
+            # 블록마다 값의 종류가 달랐던 열 (숫자만 있던 블록 등): 한꺼번에 읽은 것처럼 object로 둡니다
+            parts = [part.astype(object) for part in parts]
+    return pd.concat(parts, ignore_index=True)
+
+
+def read_csv_compact(source, chunk_rows: Optional[int] = None, **read_csv_kwargs) -> tuple:
+    """
+    CSV를 블록 단위로 읽으며 dtype을 줄여 DataFrame 하나로 합칩니다.
+
+    범주형으로 바꿀 열은 첫 블록을 보고 정하고, 블록마다 바로 바꿔 원래 dtype의
+    블록이 쌓이지 않게 합니다. 정수 범위처럼 블록마다 달라지는 dtype은 합칠 때
+    pandas가 공통 dtype으로 맞춥니다. 숫자였다가 문자가 나오는 열이 있으면
+    한꺼번에 읽은 결과와 같도록 전체를 다시 읽습니다.
+
+    Args:
+        source: CSV 파일 경로 또는 파일 객체
+        chunk_rows: 한 번에 읽는 행 수 (None이면 CSV_CHUNK_ROWS)
+        **read_csv_kwargs: pandas.read_csv에 그대로 전달할 인자
+
+    Returns:
+        (DataFrame, CompactReport). 줄이기 전 크기는 블록마다 기본 dtype으로 읽었을 때의 합입니다.
+    """
+    from converter.data import CSV_CHUNK_ROWS
+
+    bytes_before = 0
+    category_columns = None
+    # 열마다 블록에서 기본으로 추론된 dtype과, 값이 있는 블록의 종류 (숫자/문자)
+    original_dtypes: dict = {}
+    kinds: dict = {}
+    mixed = False
+    chunks = []
+    with pd.read_csv(source, chunksize=chunk_rows or CSV_CHUNK_ROWS, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            if category_columns is None:
+                category_columns = {name for name, series in chunk.items() if _is_category_candidate(series)}
+            for name, series in chunk.items():
+                original_dtypes.setdefault(name, set()).add(str(series.dtype))
+                kind = 'number' if is_numeric_dtype(series.dtype) else 'text'
+                seen = kinds.setdefault(name, set())
+                if kind not in seen and series.notna().any():
+                    seen.add(kind)
+                    mixed = mixed or len(seen) > 1
+            if mixed:
+                break
+            bytes_before += _compact(chunk, category_columns).bytes_before
+            chunks.append(chunk)
+
+    if mixed:
+        # 앞 블록은 숫자, 뒤 블록은 문자인 열: 한꺼번에 읽으면 원래 글자 그대로 문자열 열이 되므로
+        # 블록을 합쳐서는 같은 값을 만들 수 없습니다. 전체를 기본 방식으로 다시 읽고 줄입니다.
+        del chunks
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        df = pd.read_csv(source, **read_csv_kwargs)
+        return df, compact_dataframe(df)
+
+    if len(chunks) == 1:
+        df = chunks[0]
+    else:
+        columns = [
+            _concat_column([chunk.iloc[:, position] for chunk in chunks])
+            for position in range(chunks[0].shape[1])
+        ]
+        del chunks
+        df = pd.concat(columns, axis=1)
+        del columns
+        # 합치면서 넓어진 정수 열과 object가 된 열(참/거짓 뒤에 빈 값이 온 열 등)을 다시 줄입니다
+        _compact(df, {
+            name for name, series in df.items()
+            if is_object_dtype(series.dtype) and _is_category_candidate(series)
+        })
+
+    report = CompactReport(bytes_before=bytes_before, bytes_after=_memory(df))
+    for name, dtype in df.dtypes.items():
+        seen = original_dtypes[name]
+        original = seen.pop() if len(seen) == 1 else 'object'
+        if original != str(dtype):
+            report.columns[name] = (original, str(dtype))
+    return df, report
+
+
+def read_dataframe_compact(data, source_format: str, **read_options) -> tuple:
+    """
+    read_dataframe와 같지만 dtype을 줄여 읽고 절약한 메모리를 함께 반환합니다.
+
+    Returns:
+        (DataFrame, CompactReport)
+    """
+    from converter.data import read_dataframe
+    from converter.sniff import read_with_fallback, sniff_csv
+    from converter.utils import as_file
+
+    source_format = source_format.lower()
+    if source_format == 'csv':
+        if not read_options:
+            read_options = sniff_csv(data).read_csv_kwargs()
+        with stage("parse", source_format, bytes_in=memoryview(data).nbytes):
+            df, report = read_with_fallback(lambda options: read_csv_compact(as_file(data), **options), read_options)
+    else:
+        df = read_dataframe(data, source_format, **read_options)
+        with stage("compact", source_format) as record:
+            report = compact_dataframe(df)
+            record.bytes_in, record.bytes_out = report.bytes_before, report.bytes_after
+    return df, report
@@ -0,0 +1,395 @@
+"""
+CSV/Excel 데이터 변환 로직
+"""
+
+import codecs
+import collections
+import csv
+import datetime
+import io
+import itertools
+import math
+import os
+import re
+from typing import Iterator, Optional
+
+import openpyxl
+import pandas as pd
+
+from converter.metrics import stage
+from converter.sniff import read_with_fallback, sniff_csv
+from converter.utils import as_file
+
+
+# Excel 시트 하나에 들어가는 최대 행 수 (헤더 포함)
+EXCEL_MAX_ROWS = 1_048_576
+
+# 스트리밍 변환 시 한 번에 읽는 CSV 행 수
+CSV_CHUNK_ROWS = 50_000
+
+# 스트리밍 CSV 출력 시 한 번에 내보내는 크기 (바이트)
+CSV_OUTPUT_CHUNK_BYTES = 64 * 1024
+
+# pyarrow로 읽고 쓰는 컬럼 기반 형식 (converter.columnar)
+COLUMNAR_FORMATS = ('parquet', 'feather', 'arrow')
+
+# 데이터 탭과 CLI에서 다루는 모든 형식
+DATA_FORMATS = ('csv', 'xlsx') + COLUMNAR_FORMATS
+
+# Excel 시트 이름 규칙: 31자 이하, 금지 문자 제외
+_SHEET_NAME_MAX = 31
+_SHEET_NAME_INVALID = re.compile(r'[\[\]:*?/\\]')
+
+
+def read_dataframe(data, source_format: str, **read_options) -> pd.DataFrame:
+    """
+    CSV, Excel 또는 컬럼 기반 형식의 바이트 데이터를 DataFrame으로 읽습니다.
+
+    Args:
+        data: 원본 바이트 데이터 (bytes 또는 memoryview)
+        source_format: 원본 형식 ('csv', 'xlsx', 'xls', 'parquet', 'feather', 'arrow')
+        **read_options: CSV 읽기 설정. 없으면 sniff_csv로 감지합니다.
+            Excel은 sheet_name으로 읽을 시트를 고릅니다 (기본값은 첫 시트).
+
+    Returns:
+        읽어 들인 DataFrame
+    """
+    source_format = source_format.lower()
+    with stage("parse", source_format, bytes_in=memoryview(data).nbytes):
+        if source_format == 'csv':
+            if not read_options:
+                read_options = sniff_csv(data).read_csv_kwargs()
+            return read_with_fallback(lambda options: pd.read_csv(as_file(data), **options), read_options)
+        if source_format in COLUMNAR_FORMATS:
+            from converter.columnar import read_columnar
+            return read_columnar(data, source_format)
+        return pd.read_excel(as_file(data), engine='openpyxl', **read_options)
+
+
+def convert_dataframe(df: pd.DataFrame, target_format: str, codec: Optional[str] = None) -> bytes:
+    """
+    DataFrame을 XLSX, CSV 또는 컬럼 기반 형식의 바이트 데이터로 저장합니다.
+
+    Args:
+        df: 변환할 DataFrame
+        target_format: 변환할 형식 ('xlsx', 'csv', 'parquet', 'feather', 'arrow')
+        codec: 컬럼 기반 형식의 압축 코덱 (None이면 형식별 기본값)
+
+    Returns:
+        변환된 파일의 바이트 데이터
+    """
+    output_buffer = io.BytesIO()
+    with stage("encode", target_format.lower()) as record:
+        if target_format.lower() == 'xlsx':
+            from converter.xlsx import write_xlsx
+            write_xlsx(df, output_buffer)
+        elif target_format.lower() == 'csv':
+            df.to_csv(output_buffer, index=False, encoding='utf-8-sig')
+        elif target_format.lower() in COLUMNAR_FORMATS:
+            from converter.columnar import write_columnar
+            write_columnar(df, output_buffer, target_format.lower(), codec)
+        else:
+            raise ValueError(f"지원하지 않는 데이터 형식입니다: {target_format}")
+        record.bytes_out = output_buffer.tell()
+    return output_buffer.getvalue()
+
+
+def convert_data(
+    data,
+    source_format: str,
+    target_format: str,
+    codec: Optional[str] = None,
+    compact: bool = False,
+    **read_options,
+) -> bytes:
+    """
+    CSV, Excel, Parquet, Feather, Arrow 파일을 서로 변환합니다.
+
+    Args:
+        data: 원본 바이트 데이터 (bytes 또는 memoryview)
+        source_format: 원본 형식 ('csv', 'xlsx', 'xls', 'parquet', 'feather', 'arrow')
+        target_format: 변환할 형식 ('xlsx', 'csv', 'parquet', 'feather', 'arrow')
+        codec: 컬럼 기반 형식의 압축 코덱
+        compact: dtype을 줄여 읽어 메모리를 아낄지 여부 (converter.compact).
+            CSV/XLSX 결과는 같고, 컬럼 기반 형식은 줄인 dtype이 스키마에 남습니다.
+        **read_options: CSV 읽기 설정
+
+    Returns:
+        변환된 파일의 바이트 데이터
+    """
+    if compact:
+        from converter.compact import read_dataframe_compact
+        df, _ = read_dataframe_compact(data, source_format, **read_options)
+    else:
+        df = read_dataframe(data, source_format, **read_options)
+    return convert_dataframe(df, target_format, codec)
+
+
+def csv_to_xlsx_stream(
+    source,
+    output,
+    encoding: str = 'utf-8',
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    max_rows_per_sheet: int = EXCEL_MAX_ROWS,
+    sheet_name: str = 'Sheet',
+    **read_csv_kwargs,
+) -> dict:
+    """
+    CSV를 청크 단위로 읽어 일정한 메모리로 XLSX를 작성합니다.
+
+    청크마다 시트 XML을 바로 만들어 압축하며 기록하고 (converter.xlsx),
+    시트가 행 한도에 도달하면 헤더를 반복한 새 시트로 넘어갑니다.
+
+    Args:
+        source: CSV 파일 경로 또는 파일 객체
+        output: XLSX를 기록할 파일 경로 또는 쓰기 가능한 파일 객체
+        encoding: CSV 인코딩
+        chunk_rows: 한 번에 읽을 행 수
+        max_rows_per_sheet: 시트당 최대 행 수 (헤더 포함)
+        sheet_name: 시트 이름 접두어 (Sheet1, Sheet2, ...)
+        **read_csv_kwargs: pandas.read_csv에 그대로 전달할 인자
+
+    Returns:
+        {'rows': 데이터 행 수, 'sheets': 시트 수}
+    """
+    from converter.xlsx import BulkXlsxWriter
+
+    sheet_names = (f"{sheet_name}{i}" for i in itertools.count(1))
+    with BulkXlsxWriter(output, header_style=True) as writer:
+        rows, sheets = _append_csv(
+            writer, source, sheet_names, encoding, chunk_rows, max_rows_per_sheet, **read_csv_kwargs
+        )
+
+    return {'rows': rows, 'sheets': sheets}
+
+
+def _append_csv(
+    writer,
+    source,
+    sheet_names: Iterator[str],
+    encoding: str,
+    chunk_rows: int,
+    max_rows_per_sheet: int,
+    **read_csv_kwargs,
+) -> tuple:
+    """
+    CSV 하나를 청크 단위로 읽어 통합 문서 끝에 시트로 덧붙입니다.
+
+    시트가 행 한도에 도달하면 sheet_names에서 다음 이름을 받아 헤더를 반복한
+    새 시트로 넘어갑니다.
+
+    Returns:
+        (데이터 행 수, 추가한 시트 수)
+    """
+    header = None
+    total_rows = 0
+    sheets = 0
+
+    def new_sheet():
+        nonlocal sheets
+        sheets += 1
+        writer.add_sheet(next(sheet_names), header)
+
+    with pd.read_csv(source, encoding=encoding, chunksize=chunk_rows, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            if header is None:
+                header = [str(column) for column in chunk.columns]
+                new_sheet()
+            start = 0
+            while start < len(chunk):
+                if writer.rows >= max_rows_per_sheet:
+                    new_sheet()
+                stop = start + max_rows_per_sheet - writer.rows
+                writer.write_frame(chunk.iloc[start:stop])
+                start = stop
+            total_rows += len(chunk)
+
+    return total_rows, sheets
+
+
+def _sheet_title(name: str, used: set) -> str:
+    """
+    파일명으로 Excel 규칙에 맞는 고유한 시트 이름을 만듭니다.
+
+    금지 문자 []:*?/\\ 는 '_'로 바꾸고 31자로 자르며, 대소문자만 다른
+    이름이 이미 있으면 ' (2)', ' (3)' ...을 붙입니다.
+    """
+    base = _SHEET_NAME_INVALID.sub('_', name).strip("'") or 'Sheet'
+    title = base[:_SHEET_NAME_MAX]
+    suffix = 1
+    while title.lower() in used:
+        suffix += 1
+        tail = f" ({suffix})"
+        title = base[:_SHEET_NAME_MAX - len(tail)] + tail
+    used.add(title.lower())
+    return title
+
+
+def merge_csvs_to_xlsx(
+    sources: list,
+    output,
+    chunk_rows: int = CSV_CHUNK_ROWS,
+    max_rows_per_sheet: int = EXCEL_MAX_ROWS,
+) -> dict:
+    """
+    여러 CSV를 시트 하나씩 차지하는 통합 문서 하나로 합칩니다.
+
+    csv_to_xlsx_stream과 같이 일정한 메모리로 기록하며, 행 한도를 넘는 CSV는
+    '이름 (2)'처럼 이어지는 시트로 나뉩니다.
+
+    Args:
+        sources: (시트 이름, CSV 파일 경로 또는 파일 객체, read_csv 인자 dict) 튜플의 리스트.
+            read_csv 인자는 CsvDialect.read_csv_kwargs()의 결과를 그대로 넘기면 됩니다.
+        output: XLSX를 기록할 파일 경로 또는 쓰기 가능한 파일 객체
+        chunk_rows: 한 번에 읽을 행 수
+        max_rows_per_sheet: 시트당 최대 행 수 (헤더 포함)
+
+    Returns:
+        {'rows': 전체 데이터 행 수, 'sheets': 시트 수}
+    """
+    from converter.xlsx import BulkXlsxWriter
+
+    used = set()
+    total_rows = 0
+    total_sheets = 0
+    with BulkXlsxWriter(output, header_style=True) as writer:
+        for name, source, read_csv_kwargs in sources:
+            read_csv_kwargs = dict(read_csv_kwargs)
+            encoding = read_csv_kwargs.pop('encoding', 'utf-8')
+            sheet_names = (_sheet_title(name, used) for _ in itertools.count())
+            rows, sheets = _append_csv(
+                writer, source, sheet_names, encoding, chunk_rows, max_rows_per_sheet, **read_csv_kwargs
+            )
+            total_rows += rows
+            total_sheets += sheets
+
+    return {'rows': total_rows, 'sheets': total_sheets}
+
+
+def _csv_text(value):
+    """
+    openpyxl 셀 값을 pandas.to_csv와 같은 문자열 규칙으로 바꿉니다.
+
+    pandas는 날짜 열의 모든 값이 자정이면 '2024-01-01'처럼 날짜만 씁니다. 행 단위로
+    읽을 때는 열 전체를 미리 볼 수 없으므로 값마다 자정이면 날짜만 씁니다.
+    자정과 다른 시각이 섞인 열만 pandas('2024-01-01 00:00:00')와 다릅니다.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float) and math.isnan(value):
+        return ''
+    if isinstance(value, datetime.datetime) and value.time() == datetime.time():
+        return value.date().isoformat()
+    return value
+
+
+def _trimmed_width(values) -> int:
+    """행에서 마지막으로 값이 있는 셀까지의 너비를 돌려줍니다 (pandas가 행 끝의 빈 셀을 버리는 규칙)."""
+    width = len(values)
+    while width and values[width - 1] is None:
+        width -= 1
+    return width
+
+
+def _header_names(header: list) -> list:
+    """
+    헤더 행을 pandas.read_excel과 같은 열 이름으로 바꿉니다.
+
+    빈 제목은 'Unnamed: n'이 되고, 중복 제목은 'a.1', 'a.2'처럼 번호가 붙습니다.
+    이미 있는 이름('a.1')은 건너뛰며, 이름 있는 열에 먼저 번호를 매깁니다.
+    """
+    names = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+    unnamed = [i for i, name in enumerate(header) if name is None]
+    counts = collections.defaultdict(int)
+    for i in [i for i in range(len(names)) if header[i] is not None] + unnamed:
+        name = original = names[i]
+        count = counts[name]
+        while count > 0:
+            counts[original] = count + 1
+            name = f"{original}.{count}"
+            count = count + 1 if name in names else counts[name]
+        names[i] = name
+        counts[name] = count + 1
+    return names
+
+
+def iter_xlsx_to_csv(
+    source,
+    sheet_name: Optional[str] = None,
+    encoding: str = 'utf-8-sig',
+    chunk_bytes: int = CSV_OUTPUT_CHUNK_BYTES,
+) -> Iterator[bytes]:
+    """
+    XLSX 시트를 한 행씩 읽어 CSV 바이트 조각을 차례로 내보냅니다.
+
+    openpyxl 읽기 전용 모드로 행을 순회하므로 통합 문서 전체를 메모리에
+    올리지 않고, 첫 조각은 첫 행들을 읽자마자 준비됩니다. 시트 범위(dimension)가
+    헤더보다 넓거나 기록되어 있지 않으면 열 수를 정하려고 시트를 한 번 더 읽습니다.
+
+    Args:
+        source: XLSX 파일 경로 또는 파일 객체
+        sheet_name: 변환할 시트 이름 (None이면 첫 번째 시트)
+        encoding: 출력 인코딩 (기본값은 Excel 호환 BOM이 붙는 utf-8-sig)
+        chunk_bytes: 한 번에 내보낼 대략적인 크기
+
+    Yields:
+        CSV 바이트 조각
+    """
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        encoder = codecs.getincrementalencoder(encoding)()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator=os.linesep)
+        rows = worksheet.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        width = _trimmed_width(header)
+        if worksheet.max_column is None or worksheet.max_column > width:
+            # 헤더보다 넓은 행이 있을 수 있으면 한 번 더 훑어 가장 넓은 행을 찾습니다.
+            # pandas도 가장 넓은 행에 맞춰 열을 늘리므로 그 열까지 내보내야 같습니다.
+            width = max(itertools.chain([width], map(_trimmed_width, worksheet.iter_rows(values_only=True))))
+        header = (header + [None] * width)[:width]
+        writer.writerow(_header_names(header))
+        blank_rows = 0
+
+        for values in rows:
+
+            row = [_csv_text(v) for v in values[:width]]
+            if all(v == '' for v in row):
+                # 빈 행은 뒤에 데이터가 이어질 때만 기록합니다 (끝의 빈 행은 버림)
+                blank_rows += 1
+                continue
+            for _ in range(blank_rows):
+                writer.writerow([''] * width)
+            blank_rows = 0
+            row.extend([''] * (width - len(row)))
+            writer.writerow(row)
+
+            if buffer.tell() >= chunk_bytes:
+                yield encoder.encode(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+
+        yield encoder.encode(buffer.getvalue(), final=True)
+    finally:
+        workbook.close()
+
+
+def xlsx_to_csv_stream(source, output, sheet_name: Optional[str] = None, encoding: str = 'utf-8-sig') -> int:
+    """
+    XLSX를 행 단위로 읽으며 CSV를 output에 바로 기록합니다.
+
+    Args:
+        source: XLSX 파일 경로 또는 파일 객체
+        output: CSV를 기록할 바이너리 파일 객체
+        sheet_name: 변환할 시트 이름 (None이면 첫 번째 시트)
+        encoding: 출력 인코딩
+
+    Returns:
+        기록한 바이트 수
+    """
+    written = 0
+    for chunk in iter_xlsx_to_csv(source, sheet_name=sheet_name, encoding=encoding):
+        output.write(chunk)
+        written += len(chunk)
+    return written
@@ -0,0 +1,293 @@
+"""
+메모리 예산 관리
+변환을 시작하기 전에 필요한 메모리를 업로드만 보고 추정하고,
+프로세스 전체 예산과 세션별 예산 안에서만 실행합니다.
+
+예산이 모자라면 다른 변환이 끝나기를 잠시 기다리고(대기열),
+그래도 자리가 나지 않거나 혼자서 예산을 넘는 작업이면 MemoryBudgetExceeded로 거절합니다.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional, Sequence
+
+from converter.utils import MAX_WORKERS, as_file, env_megabytes, format_bytes
+
+
+def _memory_limit() -> int:
+    """컨테이너(cgroup) 메모리 한도, 없으면 물리 메모리 크기."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        # cgroup v2의 'max'나 v1의 매우 큰 값은 한도가 없다는 뜻입니다
+        if value.isdigit() and int(value) < 1 << 60:
+            return int(value)
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+# 변환에 쓸 수 있는 프로세스 전체 메모리 (기본값: 한도의 절반)
+MEMORY_BUDGET = env_megabytes("CONVERTER_MEMORY_BUDGET_MB", _memory_limit() // 2)
+
+# 한 세션이 동시에 쓸 수 있는 메모리 (기본값: 전체 예산의 절반)
+SESSION_BUDGET = env_megabytes("CONVERTER_SESSION_BUDGET_MB", MEMORY_BUDGET // 2)
+
+# 예산이 빌 때까지 기다리는 최대 시간 (초)
+ADMISSION_TIMEOUT = float(os.environ.get("CONVERTER_ADMISSION_TIMEOUT", 30))
+
+# 6000x4000 이미지를 변환하며 잰 최대 RSS 증가량을 바탕으로 한 추정 계수.
+# Pillow는 RGB도 픽셀당 4바이트로 저장하며, 디코딩한 원본과 변환한 사본이
+# 함께 살아 있습니다. libwebp는 출력 픽셀당 약 8배의 작업 버퍼를 씁니다.
+#   JPEG RGB→PNG 198 MB, PNG RGBA→JPG 288 MB, PNG RGBA→WEBP 983 MB,
+#   JPEG RGB→JPG(1200px) 15 MB
+IMAGE_WORKING_COPIES = 2
+IMAGE_ENCODER_FACTOR = {'WEBP': 8}
+
+# 전체 파싱 변환의 입력 바이트 대비 최대 RSS 증가량 (10만~20만 행 합성 데이터 측정).
+# 원본을 DataFrame으로 읽는 비용에 결과 형식을 쓰는 비용을 곱합니다.
+#   CSV→XLSX 24배, CSV→Parquet 8배, CSV→CSV 4배, XLSX→CSV 7배,
+#   Parquet→CSV 5배, Parquet→XLSX 59배
+DATA_EXPANSION = {'csv': 4, 'xlsx': 7, 'xls': 7, 'parquet': 8, 'feather': 4, 'arrow': 4}
+DATA_ENCODE_FACTOR = {'xlsx': 6}
+
+# XLSX를 전체 파싱할 때 셀 하나당 최대 RSS 증가량 (10만 행 × 7열 측정: CSV로 105 B, Parquet으로 127 B).
+# 시트 XML은 압축률이 높아(26 MB → 4 MB) 파일 크기만으로는 2~3배 적게 봅니다.
+XLSX_CELL_BYTES = 128
+
+# dtype을 줄여 CSV를 블록 단위로 읽을 때 (converter.compact). 100만 행 CSV→CSV 최대 RSS가
+# 입력의 4.2배에서 2.7배로 줄었습니다. XLSX 결과는 인코딩 비용이 대부분이라 그대로 둡니다.
+DATA_COMPACT_EXPANSION = {'csv': 3}
+
+# 스트리밍 변환은 입력 크기와 관계없이 블록 몇 개만 메모리에 둡니다
+# (CSV→XLSX 40만 행 16 MB, CSV→Parquet 100만 행 107 MB)
+STREAM_WORKING_BYTES = 128 * 1024 * 1024
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """메모리 예산 안에서 변환을 시작할 수 없을 때 발생합니다."""
+
+    def __init__(self, message: str, requested: int, budget: int):
+        super().__init__(message)
+        self.requested = requested
+        self.budget = budget
+
+
+def image_cost(img, target_format: str, max_size: Optional[int] = None,
+                scale: Optional[float] = None) -> tuple:
+    """
+    헤더만 읽은 이미지의 (예상 메모리, 디코딩할 픽셀 수, 출력 픽셀 수).
+
+    JPEG 축소 디코딩(draft)도 픽셀을 읽지 않고 크기만 바꾸므로 그대로 반영합니다.
+    """
+    from converter.image import fit_size
+
+    target_size = fit_size(img.size, max_size, scale) or img.size
+    if target_size != img.size:
+        img.draft(img.mode, target_size)
+    decoded_pixels = img.width * img.height
+    bytes_per_pixel = 1 if img.mode in ('1', 'L', 'P') else 4
+
+    save_format = target_format.upper().replace('JPG', 'JPEG')
+    output_pixels = target_size[0] * target_size[1]
+    cost = (
+        decoded_pixels * bytes_per_pixel * IMAGE_WORKING_COPIES
+        + output_pixels * 4 * IMAGE_ENCODER_FACTOR.get(save_format, 1)
+    )
+    return cost, decoded_pixels, output_pixels
+
+
+def estimate_image_cost(data, target_format: str, max_size: Optional[int] = None,
+                        scale: Optional[float] = None, encoder_options: Optional[dict] = None,
+                        preset: Optional[str] = None) -> int:
+    """
+    이미지 한 장을 변환할 때 필요한 메모리를 헤더만 읽어 추정합니다.
+
+    원본을 그대로 돌려줄 파일은 디코딩하지 않으므로 0입니다.
+    헤더를 읽을 수 없으면 원본 크기를 반환하고 변환 단계에서 오류를 내게 둡니다.
+    """
+    from PIL import Image
+
+    from converter.image import can_passthrough
+
+    if can_passthrough(data, target_format, max_size, scale, preset, encoder_options):
+        return 0
+
+    try:
+        return image_cost(Image.open(as_file(data)), target_format, max_size, scale)[0]
+    except Exception:
+        return memoryview(data).nbytes
+
+
+def estimate_batch_cost(costs: Sequence[int], workers: Optional[int] = None) -> int:
+    """
+    여러 파일을 병렬로 변환할 때의 최대 메모리를 추정합니다.
+
+    한 번에 워커 수만큼만 변환하므로 가장 큰 작업 몇 개의 합으로 봅니다.
+    """
+    workers = max(1, min(workers or MAX_WORKERS, len(costs) or 1))
+    return sum(sorted(costs, reverse=True)[:workers])
+
+
+def estimate_data_cost(size: int, source_format: str, target_format: str, stream: bool = False,
+                       compact: bool = False, cells: Optional[int] = None) -> int:
+    """
+    CSV/Excel/컬럼 형식 변환에 필요한 메모리를 입력 크기로 추정합니다.
+
+    XLSX 시트의 셀 수(cells, converter.probe가 dimension에서 읽은 값)를 알면
+    압축된 파일 크기보다 셀 수로 본 추정을 우선합니다.
+    """
+    if stream:
+        return min(size * 2, STREAM_WORKING_BYTES)
+    expansion = DATA_EXPANSION.get(source_format.lower(), 8)
+    if compact and target_format.lower() not in DATA_ENCODE_FACTOR:
+        expansion = DATA_COMPACT_EXPANSION.get(source_format.lower(), expansion)
+    encode = DATA_ENCODE_FACTOR.get(target_format.lower(), 1)
+    cost = size * expansion * encode
+    if cells is not None:
+        cost = max(cost, cells * XLSX_CELL_BYTES * encode)
+    return cost
+
+
+class MemoryGovernor:
+    """
+    프로세스 전체와 세션별 메모리 예약을 관리합니다.
+
+    한 프로세스 안의 모든 Streamlit 세션이 같은 인스턴스를 공유하므로
+    모든 연산은 잠금으로 보호합니다.
+    """
+
+    def __init__(self, budget: int = MEMORY_BUDGET, session_budget: int = SESSION_BUDGET):
+        self.budget = budget
+        self.session_budget = min(session_budget, budget)
+        self._cond = threading.Condition()
+        self._reserved = 0
+        self._sessions: dict = {}
+        self._waiting = 0
+        self._admitted = 0
+        self._queued = 0
+        self._rejected = 0
+
+    def _fits(self, session: str, nbytes: int) -> bool:
+        return (
+            self._reserved + nbytes <= self.budget
+            and self._sessions.get(session, 0) + nbytes <= self.session_budget
+        )
+
+    def _reject(self, message: str, nbytes: int, budget: int):
+        self._rejected += 1
+        return MemoryBudgetExceeded(message, nbytes, budget)
+
+    def check(self, nbytes: int) -> None:
+        """기다려도 예약할 수 없는 크기면 바로 MemoryBudgetExceeded를 발생시킵니다."""
+        if nbytes > self.session_budget:
+            with self._cond:
+                raise self._reject(
+                    f"예상 메모리 {format_bytes(nbytes)}가 한 번에 변환할 수 있는 "
+                    f"{format_bytes(self.session_budget)}를 넘습니다",
+                    nbytes, self.session_budget,
+                )
+
+    def _admit(self, session: str, nbytes: int) -> None:
+        self._admitted += 1
+        self._reserved += nbytes
+        self._sessions[session] = self._sessions.get(session, 0) + nbytes
+
+    def _gave_up(self, nbytes: int, timeout: float) -> MemoryBudgetExceeded:
+        return self._reject(
+            f"사용자가 많아 {timeout:g}초 안에 메모리 {format_bytes(nbytes)}를 확보하지 못했습니다",
+            nbytes, self.budget,
+        )
+
+    @contextmanager
+    def reserve(
+        self,
+        session: str,
+        nbytes: int,
+        timeout: float = ADMISSION_TIMEOUT,
+        on_wait: Optional[Callable[[], None]] = None,
+    ):
+        """
+        nbytes만큼 예약한 동안 with 블록을 실행합니다.
+
+        Args:
+            session: 세션 식별자
+            nbytes: estimate_*_cost로 추정한 메모리
+            timeout: 자리가 날 때까지 기다릴 최대 시간 (초)
+            on_wait: 기다려야 할 때 한 번 호출되는 콜백 (대기 안내 표시용)
+
+        Raises:
+            MemoryBudgetExceeded: 작업 하나가 예산보다 크거나, timeout 안에 자리가 나지 않을 때
+        """
+        self.check(nbytes)
+        with self._cond:
+            if not self._fits(session, nbytes):
+                self._queued += 1
+                self._waiting += 1
+                try:
+                    if on_wait:
+                        on_wait()
+                    admitted = self._cond.wait_for(lambda: self._fits(session, nbytes), timeout)
+                finally:
+                    self._waiting -= 1
+                if not admitted:
+                    raise self._gave_up(nbytes, timeout)
+            self._admit(session, nbytes)
+        try:
+            yield
+        finally:
+            self.release(session, nbytes)
+
+    def try_reserve(self, session: str, nbytes: int, first_attempt: bool = True) -> bool:
+        """
+        기다리지 않고 nbytes를 예약해 봅니다. True이면 끝난 뒤 release로 돌려줘야 합니다.
+
+        작업 대기열처럼 자리가 날 때까지 스레드를 붙잡지 않고 다른 작업을 먼저 실행하다가
+        다시 시도하는 쪽에서 씁니다. 처음 시도(first_attempt)에서 자리가 없으면 대기 건수로 셉니다.
+
+        Raises:
+            MemoryBudgetExceeded: 작업 하나가 예산보다 클 때
+        """
+        self.check(nbytes)
+        with self._cond:
+            if not self._fits(session, nbytes):
+                if first_attempt:
+                    self._queued += 1
+                return False
+            self._admit(session, nbytes)
+            return True
+
+    def release(self, session: str, nbytes: int) -> None:
+        """try_reserve로 예약한 메모리를 돌려줍니다."""
+        with self._cond:
+            self._reserved -= nbytes
+            remaining = self._sessions[session] - nbytes
+            if remaining:
+                self._sessions[session] = remaining
+            else:
+                del self._sessions[session]
+            self._cond.notify_all()
+
+    def give_up(self, nbytes: int, timeout: float) -> MemoryBudgetExceeded:
+        """try_reserve로 timeout 동안 자리를 얻지 못한 요청을 거절로 세고, 알릴 예외를 돌려줍니다."""
+        with self._cond:
+            return self._gave_up(nbytes, timeout)
+
+    def stats(self) -> dict:
+        """예약 현황과 누적 승인·대기·거절 수."""
+        with self._cond:
+            return {
+                "budget": self.budget,
+                "session_budget": self.session_budget,
+                "reserved": self._reserved,
+                "sessions": len(self._sessions),
+                "waiting": self._waiting,
+                "admitted": self._admitted,
+                "queued": self._queued,
+                "rejected": self._rejected,
+            }
+
+
+memory_governor = MemoryGovernor()
@@ -0,0 +1,297 @@
+"""
+이미지 변환 로직
+"""
+
+import io
+from typing import Optional
+
+from PIL import Image, ImageColor
+
+from converter.metrics import stage
+from converter.utils import MAX_IMAGE_PIXELS, as_file, detect_format
+
+# converter.probe와 같은 한도를 Pillow에도 씁니다. 헤더 검사를 거치지 않는 경로(CLI 등)도
+# 이 값을 넘으면 경고를, 두 배를 넘으면 DecompressionBombError를 받습니다.
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+
+# 인코더 프리셋별 형식 설정. 1920x1080 RGB 한 장을 인코딩한 측정값
+# (사진: 약한 잡음이 있는 그라디언트, 화면: 글자가 있는 캡처):
+#
+#              PNG 사진 / 화면            WEBP 사진 / 화면           JPEG 사진 / 화면
+#   fastest    135 ms 3.6 MB / 18 ms 124 KB   15 ms 18 KB / 34 ms 343 KB    3 ms 147 KB / 3 ms 502 KB
+#   balanced   182 ms 3.5 MB / 18 ms 117 KB   83 ms 16 KB / 101 ms 293 KB   7 ms 189 KB / 5 ms 542 KB
+#   smallest   433 ms 3.0 MB / 73 ms  95 KB   90 ms 15 KB / 215 ms 292 KB  12 ms 117 KB / 18 ms 445 KB
+#
+# 이전 고정 설정(PNG 기본값 compress_level=6, JPEG quality=95)은
+# PNG 350 ms 3.1 MB / 26 ms 100 KB, JPEG 4 ms 442 KB / 4 ms 750 KB 였습니다.
+ENCODER_PRESETS = {
+    'fastest': {
+        'PNG': {'compress_level': 1},
+        'WEBP': {'quality': 80, 'method': 0},
+        'JPEG': {'quality': 85, 'subsampling': 2},
+    },
+    'balanced': {
+        'PNG': {'compress_level': 3},
+        'WEBP': {'quality': 80, 'method': 4},
+        'JPEG': {'quality': 90, 'optimize': True, 'subsampling': 2},
+    },
+    'smallest': {
+        'PNG': {'compress_level': 9, 'optimize': True},
+        'WEBP': {'quality': 80, 'method': 6},
+        'JPEG': {'quality': 85, 'optimize': True, 'progressive': True, 'subsampling': 2},
+    },
+}
+DEFAULT_PRESET = 'balanced'
+
+# 형식별로 직접 덮어쓸 수 있는 인코더 설정
+ENCODER_OPTIONS = {
+    'PNG': ('compress_level', 'optimize'),
+    'WEBP': ('quality', 'method', 'lossless'),
+    'JPEG': ('quality', 'optimize', 'progressive', 'subsampling'),
+}
+
+# JPG처럼 투명도가 없는 형식으로 바꿀 때 투명한 부분을 채울 기본 배경색
+DEFAULT_BACKGROUND = (255, 255, 255)
+
+# Image.reduce가 팔레트 변환 없이 바로 처리할 수 있는 모드
+REDUCIBLE_MODES = ('L', 'LA', 'RGB', 'RGBA', 'CMYK', 'I', 'F')
+
+
+def has_alpha(img: Image.Image) -> bool:
+    """투명도 정보가 있는 이미지인지 확인합니다."""
+    return img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+
+
+def fit_size(size: tuple, max_size: Optional[int] = None, scale: Optional[float] = None) -> Optional[tuple]:
+    """
+    긴 변 최대 길이와 배율 중 더 작게 만드는 쪽으로 목표 크기를 계산합니다.
+
+    Returns:
+        줄일 필요가 없으면 None, 아니면 (너비, 높이)
+    """
+    if (max_size is not None and max_size <= 0) or (scale is not None and scale <= 0):
+        raise ValueError("크기 조정 값은 0보다 커야 합니다")
+    ratio = 1.0
+    if max_size:
+        ratio = min(ratio, max_size / max(size))
+    if scale:
+        ratio = min(ratio, scale)
+    if ratio >= 1:
+        return None
+    return max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio))
+
+
+def downscale(img: Image.Image, target_size: tuple, mode: Optional[str] = None) -> Image.Image:
+    """
+    정수 배율로 먼저 줄인 뒤 마지막에만 LANCZOS로 리샘플링합니다.
+
+    Image.reduce는 픽셀 블록 평균이라 매우 빠르므로, 목표 크기의 2배 이상이
+    남는 만큼만 줄여 최종 리샘플링의 품질은 유지합니다.
+
+    Args:
+        img: 원본 이미지 (draft로 이미 줄여 디코딩했을 수 있음)
+        target_size: 최종 (너비, 높이)
+        mode: 리샘플링 전에 맞출 모드 (None이면 투명도에 따라 RGB/RGBA, 가능한 모드는 유지)
+    """
+    if mode is None:
+        mode = img.mode if img.mode in REDUCIBLE_MODES else ('RGBA' if has_alpha(img) else 'RGB')
+    factor = min(img.width // target_size[0], img.height // target_size[1]) // 2
+    if factor > 1:
+        if img.mode not in REDUCIBLE_MODES:
+            img = img.convert(mode)
+        img = img.reduce(factor)
+    if img.mode != mode:
+        img = img.convert(mode)
+    return img.resize(target_size, Image.Resampling.LANCZOS)
+
+
+def parse_background(value=None) -> tuple:
+    """
+    배경색을 (R, G, B)로 바꿉니다.
+
+    Args:
+        value: None(흰색), '#RRGGBB'나 'white' 같은 색 이름, 또는 (R, G, B)
+
+    Raises:
+        ValueError: 알 수 없는 색일 때
+    """
+    if value is None:
+        return DEFAULT_BACKGROUND
+    if isinstance(value, str):
+        return ImageColor.getrgb(value)[:3]
+    if len(value) < 3 or not all(isinstance(c, int) and 0 <= c <= 255 for c in value[:3]):
+        raise ValueError(f"배경색은 0~255 사이의 (R, G, B)여야 합니다: {value!r}")
+    return tuple(value[:3])
+
+
+def _flatten_palette(img: Image.Image, background: tuple) -> Image.Image:
+    """팔레트 색을 배경과 미리 합성해 두고 인덱스를 한 번에 RGB로 펼칩니다."""
+    palette = img.getpalette('RGB')
+    transparency = img.info.pop('transparency')
+    alpha = [255] * (len(palette) // 3)
+    if isinstance(transparency, int):
+        if transparency < len(alpha):
+            alpha[transparency] = 0
+    else:
+        alpha[:len(transparency)] = transparency[:len(alpha)]
+    img.putpalette([
+        (palette[i] * alpha[i // 3] + background[i % 3] * (255 - alpha[i // 3]) + 127) // 255
+        for i in range(len(palette))
+    ])
+    try:
+        return img.convert('RGB')
+    finally:
+        # 호출한 쪽의 이미지는 그대로 둡니다
+        img.putpalette(palette)
+        img.info['transparency'] = transparency
+
+
+def flatten_alpha(img: Image.Image, background: tuple = DEFAULT_BACKGROUND) -> Image.Image:
+    """
+    투명도가 있는 이미지를 배경색 위에 합성해 RGB 이미지로 만듭니다.
+
+    결과 크기의 RGB 이미지 하나만 새로 만듭니다. RGBA/LA는 이미지 자체를 마스크로 넘겨
+    알파 채널을 따로 떼어 내지 않고, 투명색이 있는 팔레트(P) 이미지는 RGBA로 바꾸는 대신
+    팔레트 색(최대 256개)만 배경과 합성합니다. 6000x4000 기준 측정값 (이전 방식 대비):
+    RGBA 71 → 59 ms, 추가 메모리 156 → 78 MB / P 97 → 21 ms, 129 → 0 MB.
+
+    Args:
+        img: 변환할 이미지 (RGBA, LA, PA, P 등 어떤 모드든 가능)
+        background: 투명한 부분을 채울 (R, G, B)
+    """
+    if img.mode == 'P' and 'transparency' in img.info and img.palette.mode == 'RGB':
+        return _flatten_palette(img, background)
+    if (has_alpha(img) or img.mode == 'P' and img.palette.mode == 'RGBA') and img.mode not in ('RGBA', 'LA'):
+        # PA나 RGBA 팔레트는 픽셀마다 알파가 달라 한 번 펼쳐야 합니다
+        img = img.convert('RGBA')
+    if img.mode in ('RGBA', 'LA'):
+        flattened = Image.new('RGB', img.size, background)
+        flattened.paste(img, mask=img)
+        return flattened
+    return img if img.mode == 'RGB' else img.convert('RGB')
+
+
+def encoder_settings(save_format: str, preset: Optional[str] = None,
+                     overrides: Optional[dict] = None) -> dict:
+    """
+    프리셋과 직접 지정한 설정을 합쳐 Image.save에 넘길 인자를 만듭니다.
+
+    Args:
+        save_format: Pillow 저장 형식 ('PNG', 'WEBP', 'JPEG' 등)
+        preset: 'fastest', 'balanced', 'smallest' 중 하나 (None이면 DEFAULT_PRESET)
+        overrides: 프리셋 위에 덮어쓸 설정 (ENCODER_OPTIONS에 있는 키만 허용)
+
+    Returns:
+        Image.save 키워드 인자 dict
+    """
+    preset = preset or DEFAULT_PRESET
+    if preset not in ENCODER_PRESETS:
+        raise ValueError(f"지원하지 않는 인코더 프리셋입니다: {preset}")
+    settings = dict(ENCODER_PRESETS[preset].get(save_format, {}))
+    if overrides:
+        allowed = ENCODER_OPTIONS.get(save_format, ())
+        unknown = sorted(set(overrides) - set(allowed))
+        if unknown:
+            raise ValueError(f"{save_format}에서 지원하지 않는 인코더 설정입니다: {', '.join(unknown)}")
+        settings.update((name, value) for name, value in overrides.items() if value is not None)
+    return settings
+
+
+def can_passthrough(
+    data,
+    target_format: str,
+    max_size: Optional[int] = None,
+    scale: Optional[float] = None,
+    preset: Optional[str] = None,
+    encoder_options: Optional[dict] = None,
+    **_,
+) -> bool:
+    """
+    원본을 디코딩하지 않고 그대로 돌려줘도 되는지 확인합니다.
+
+    파일 시그니처로 본 실제 형식이 대상 형식과 같고, 크기 조정·기본이 아닌 프리셋·
+    인코더 설정 중 어느 것도 지정하지 않았으면 True입니다. 기본 프리셋으로는 같은 형식을
+    다시 인코딩하지 않습니다 (JPG·WEBP를 다시 인코딩하면 화질만 떨어집니다).
+    크기 조정 값이 있으면 헤더만 읽어 실제로 줄여야 하는지 봅니다.
+    """
+    target = target_format.lower().replace('jpeg', 'jpg')
+    if (preset or DEFAULT_PRESET) != DEFAULT_PRESET or encoder_options:
+        return False
+    if detect_format(data) != target:
+        return False
+    if max_size is None and scale is None:
+        return True
+    try:
+        return fit_size(Image.open(as_file(data)).size, max_size, scale) is None
+    except (OSError, ValueError):
+        return False
+
+
+def convert_image(
+    image_bytes: bytes,
+    original_format: str,
+    target_format: str,
+    max_size: Optional[int] = None,
+    scale: Optional[float] = None,
+    preset: Optional[str] = None,
+    encoder_options: Optional[dict] = None,
+    background=None,
+) -> bytes:
+    """
+    이미지를 원하는 포맷으로 변환합니다.
+    
+    Args:
+        image_bytes: 원본 이미지 바이트 데이터
+        original_format: 원본 확장자 (참고용. 실제 형식은 파일 내용으로 판단합니다)
+        target_format: 변환할 이미지 형식
+        max_size: 긴 변 최대 길이 (px). 더 크면 비율을 유지해 줄입니다.
+        scale: 줄일 배율 (0 < scale <= 1). max_size와 함께 주면 더 작은 쪽을 따릅니다.
+        preset: 인코더 프리셋 ('fastest', 'balanced', 'smallest'). None이면 'balanced'
+        encoder_options: 프리셋 위에 덮어쓸 형식별 설정 (예: {'quality': 95})
+        background: JPG로 바꿀 때 투명한 부분을 채울 색 ('#RRGGBB', 색 이름, (R, G, B)). None이면 흰색
+    
+    Returns:
+        변환된 이미지의 바이트 데이터
+    """
+    # 잘못된 설정은 디코딩 전에 알려 줍니다
+    save_format = target_format.upper()
+    if save_format == 'JPG':
+        save_format = 'JPEG'
+    save_options = encoder_settings(save_format, preset, encoder_options)
+    background = parse_background(background)
+    
+    # 이미 원하는 형식이면 원본 바이트를 그대로 돌려줍니다 (bytes는 복사하지 않습니다)
+    if can_passthrough(image_bytes, save_format, max_size, scale, preset, encoder_options):
+        with stage("passthrough", "image", bytes_in=len(image_bytes)) as record:
+            result = bytes(image_bytes)
+            record.bytes_out = len(result)
+        return result
+    
+    # 이미지 열기 (디코딩 시간을 따로 재기 위해 여기서 픽셀을 읽어 둡니다)
+    with stage("decode", "image", bytes_in=len(image_bytes)):
+        img = Image.open(as_file(image_bytes))
+        target_size = fit_size(img.size, max_size, scale)
+        if target_size is not None:
+            # JPEG는 DCT 스케일링으로 1/2, 1/4, 1/8 크기로 바로 디코딩해 원본 해상도를 만들지 않습니다
+            img.draft(img.mode, target_size)
+        img.load()
+    
+    if target_size is not None:
+        with stage("resize", "image"):
+            img = downscale(img, target_size)
+    
+    # JPG는 투명도를 지원하지 않으므로 배경색 위에 합성합니다
+    if save_format == 'JPEG' and img.mode != 'RGB':
+        with stage("flatten", "image"):
+            img = flatten_alpha(img, background)
+    
+    # 메모리에 저장
+    output_buffer = io.BytesIO()
+    
+    with stage("encode", "image") as record:
+        img.save(output_buffer, format=save_format, **save_options)
+        record.bytes_out = output_buffer.tell()
+    
+    output_buffer.seek(0)
+    return output_buffer.getvalue()
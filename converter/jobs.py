@@ -0,0 +1,366 @@
+"""
+백그라운드 변환 작업 관리
+변환을 Streamlit 스크립트 실행과 떼어 내 프로세스 전체가 공유하는 작업 스레드에서 실행합니다.
+
+- 세션마다 대기열을 따로 두고 돌아가며 하나씩 꺼내므로 한 세션이 작업 스레드를 독차지하지 않습니다
+- 작업을 시작하기 전에 메모리 예산(converter.governor)을 예약합니다. 자리가 없는 작업은 대기열에 둔 채
+  다른 세션의 작업을 먼저 실행하므로, 큰 작업 하나가 작업 스레드를 붙잡고 기다리지 않습니다
+- 결과는 임시 폴더의 파일로 보관하고 JOB_TTL이 지나면 지웁니다
+- 화면이 다시 실행되거나 연결이 끊겨도 작업은 계속되며, 같은 세션으로 돌아오면 결과를 받을 수 있습니다
+"""
+
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import deque
+from dataclasses import dataclass, field
+from typing import BinaryIO, Callable, Optional
+
+from converter.governor import ADMISSION_TIMEOUT, MemoryBudgetExceeded, MemoryGovernor, memory_governor
+from converter.metrics import StageRecord, registry
+
+
+logger = logging.getLogger("converter.jobs")
+
+# 동시에 실행하는 작업 수. 이미지 작업은 안에서 다시 프로세스 풀을 쓰므로 작게 둡니다.
+JOB_WORKERS = int(os.environ.get("CONVERTER_JOB_WORKERS", 2))
+
+# 끝난 작업의 결과를 보관하는 시간 (초)
+JOB_TTL = float(os.environ.get("CONVERTER_JOB_TTL", 3600))
+
+# 세션 하나와 프로세스 전체가 쌓아 둘 수 있는 대기·실행 중 작업 수
+MAX_PENDING_PER_SESSION = int(os.environ.get("CONVERTER_JOBS_PER_SESSION", 5))
+MAX_PENDING = int(os.environ.get("CONVERTER_JOBS_MAX_PENDING", 200))
+
+# 작업이 없을 때 만료된 결과를 정리하는 간격 (초)
+SWEEP_INTERVAL = 30
+
+# 메모리 자리를 기다리는 작업이 있을 때 다시 예약해 보는 간격 (초)
+ADMISSION_RETRY = 0.5
+
+_WAITING_MESSAGE = "다른 사용자의 변환이 끝나기를 기다리는 중입니다..."
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueueFull(RuntimeError):
+    """대기열이 가득 차 작업을 받을 수 없을 때 발생합니다."""
+
+
+@dataclass
+class JobOutput:
+    """작업 함수가 돌려주는 결과 설명. 내용은 작업에 넘긴 파일에 이미 기록되어 있습니다."""
+    file_name: str
+    mime: str
+    # ZIP 결과라면 항목 이름 (개별 다운로드용)
+    members: list = field(default_factory=list)
+    # 결과와 함께 보여 줄 안내 문구
+    notes: list = field(default_factory=list)
+    # 일부 파일 실패처럼 눈에 띄게 보여 줄 문구
+    warnings: list = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class Job:
+    """변환 작업 하나의 상태."""
+    id: str
+    session: str
+    kind: str
+    label: str
+    cost: int = 0
+    status: str = QUEUED
+    done: int = 0
+    total: int = 0
+    message: str = ""
+    output: Optional[JobOutput] = None
+    path: Optional[str] = None
+    size: int = 0
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    # 메모리 자리가 없어 처음 미뤄진 시각
+    waiting_since: Optional[float] = None
+    func: Optional[Callable] = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    @property
+    def ok(self) -> bool:
+        return self.status == DONE
+
+    def read(self) -> bytes:
+        """결과 파일 전체를 읽습니다."""
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def read_member(self, name: str) -> bytes:
+        """ZIP 결과에서 항목 하나를 꺼냅니다."""
+        with zipfile.ZipFile(self.path) as archive:
+            return archive.read(name)
+
+
+class JobManager:
+    """
+    세션 간에 공평하게 작업을 나눠 실행하는 공유 작업 관리자.
+
+    한 프로세스 안의 모든 Streamlit 세션이 같은 인스턴스를 공유하므로
+    모든 연산은 잠금으로 보호합니다. 작업 스레드는 첫 작업이 들어올 때 시작합니다.
+    """
+
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        ttl: float = JOB_TTL,
+        governor: MemoryGovernor = memory_governor,
+        directory: Optional[str] = None,
+        admission_timeout: float = ADMISSION_TIMEOUT,
+    ):
+        self.workers = max(1, workers)
+        self.ttl = ttl
+        self.governor = governor
+        self.admission_timeout = admission_timeout
+        self._directory = directory
+        self._cond = threading.Condition()
+        self._jobs: dict = {}
+        # 세션별 대기열과, 대기 중인 작업이 있는 세션의 순번
+        self._queues: dict = {}
+        self._rotation: deque = deque()
+        self._threads: list = []
+        self._completed = 0
+        self._failed = 0
+        self._expired = 0
+
+    # ---------- 공개 API ----------
+
+    def submit(self, session: str, kind: str, label: str,
+               func: Callable[[BinaryIO, Callable], JobOutput], cost: int = 0) -> Job:
+        """
+        작업을 대기열에 넣습니다.
+
+        Args:
+            session: 세션 식별자
+            kind: 작업 종류 ('image', 'data' 등). 지표와 화면 구분에 씁니다.
+            label: 화면에 보여 줄 작업 이름
+            func: func(output, progress)를 실행해 JobOutput을 돌려주는 함수.
+                output은 결과를 기록할 바이너리 파일, progress는 (완료 수, 전체 수, 문구)를 받습니다.
+            cost: 실행하는 동안 예약할 메모리 (바이트)
+
+        Raises:
+            MemoryBudgetExceeded: cost가 기다려도 예약할 수 없을 만큼 클 때
+            JobQueueFull: 세션이나 프로세스의 대기열이 가득 찼을 때
+        """
+        self.governor.check(cost)
+        with self._cond:
+            self._sweep()
+            pending = [job for job in self._jobs.values() if job.active]
+            if sum(job.session == session for job in pending) >= MAX_PENDING_PER_SESSION:
+                raise JobQueueFull(f"진행 중인 작업이 {MAX_PENDING_PER_SESSION}개입니다. 끝난 뒤 다시 시도해 주세요")
+            if len(pending) >= MAX_PENDING:
+                raise JobQueueFull("사용자가 많아 지금은 작업을 받을 수 없습니다. 잠시 후 다시 시도해 주세요")
+
+            job = Job(id=uuid.uuid4().hex, session=session, kind=kind, label=label, cost=cost, func=func)
+            self._jobs[job.id] = job
+            queue = self._queues.setdefault(session, deque())
+            if not queue:
+                self._rotation.append(session)
+            queue.append(job)
+            # 결과 폴더는 작업 스레드끼리 다투지 않도록 여기서 만듭니다
+            self.directory
+            self._start_workers()
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def jobs(self, session: str, kind: Optional[str] = None) -> list:
+        """세션의 작업을 만든 순서대로 반환합니다."""
+        with self._cond:
+            self._sweep()
+            return sorted(
+                (job for job in self._jobs.values()
+                 if job.session == session and (kind is None or job.kind == kind)),
+                key=lambda job: job.created,
+            )
+
+    def position(self, job: Job) -> int:
+        """대기 중인 작업보다 먼저 실행될 작업 수의 근사값 (세션을 돌아가며 꺼내는 순서 기준)."""
+        with self._cond:
+            queue = self._queues.get(job.session)
+            if job.status != QUEUED or not queue or job not in queue:
+                return 0
+            rounds = queue.index(job)
+            ahead = sum(min(len(other), rounds + 1) for name, other in self._queues.items() if name != job.session)
+            return rounds + ahead
+
+    def discard(self, job_id: str) -> None:
+        """끝난 작업의 결과를 지우거나 대기 중인 작업을 취소합니다. 실행 중인 작업은 그대로 둡니다."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status == RUNNING:
+                return
+            if job.status == QUEUED:
+                self._dequeue(job)
+            self._remove(job)
+
+    def stats(self) -> dict:
+        with self._cond:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                "queued": statuses.count(QUEUED),
+                "running": statuses.count(RUNNING),
+                "retained": statuses.count(DONE) + statuses.count(FAILED),
+                "waiting_sessions": len(self._rotation),
+                "completed": self._completed,
+                "failed": self._failed,
+                "expired": self._expired,
+            }
+
+    # ---------- 내부 구현 ----------
+
+    @property
+    def directory(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="converter-jobs-")
+            # 직접 만든 폴더만 프로세스가 끝날 때 지웁니다
+            atexit.register(shutil.rmtree, self._directory, ignore_errors=True)
+        elif not os.path.isdir(self._directory):
+            # 임시 폴더 정리 등으로 지워졌으면 다시 만듭니다
+            os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next_job(self) -> Optional[Job]:
+        """
+        대기 중인 세션을 돌아가며 메모리를 예약할 수 있는 작업을 하나 꺼냅니다 (잠금을 잡은 상태에서 호출).
+
+        세션마다 맨 앞 작업만 보므로 세션 안의 순서는 지킵니다. 자리가 없는 작업은 그대로 두고
+        다음 세션으로 넘어가며, admission_timeout 동안 자리를 얻지 못하면 실패로 끝냅니다.
+        """
+        now = time.time()
+        for session in list(self._rotation):
+            job = self._queues[session][0]
+            try:
+                admitted = self.governor.try_reserve(session, job.cost, first_attempt=job.waiting_since is None)
+            except MemoryBudgetExceeded as e:
+                self._dequeue(job)
+                self._fail(job, e)
+                continue
+            if admitted:
+                self._dequeue(job)
+                if job.session in self._queues:
+                    # 방금 꺼낸 세션은 순번의 맨 뒤로 보냅니다
+                    self._rotation.remove(job.session)
+                    self._rotation.append(job.session)
+                return job
+            if job.waiting_since is None:
+                job.waiting_since = now
+                job.message = _WAITING_MESSAGE
+            elif now - job.waiting_since > self.admission_timeout:
+                self._dequeue(job)
+                self._fail(job, self.governor.give_up(job.cost, self.admission_timeout))
+        return None
+
+    def _fail(self, job: Job, error: Exception) -> None:
+        """실행하지 못한 작업을 실패로 끝냅니다 (잠금을 잡은 상태에서 호출)."""
+        job.error = str(error) or type(error).__name__
+        job.status = FAILED
+        job.func = None
+        job.finished = time.time()
+        self._failed += 1
+
+    def _dequeue(self, job: Job) -> None:
+        queue = self._queues.get(job.session)
+        if queue is None:
+            return
+        queue.remove(job)
+        if not queue:
+            del self._queues[job.session]
+            self._rotation.remove(job.session)
+
+    def _remove(self, job: Job) -> None:
+        self._jobs.pop(job.id, None)
+        if job.path:
+            try:
+                os.unlink(job.path)
+            except OSError:
+                pass
+
+    def _sweep(self) -> None:
+        """보관 시간이 지난 결과를 지웁니다 (잠금을 잡은 상태에서 호출)."""
+        deadline = time.time() - self.ttl
+        for job in [job for job in self._jobs.values() if job.finished and job.finished < deadline]:
+            self._remove(job)
+            self._expired += 1
+
+    def _worker_loop(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    # 메모리를 기다리는 작업이 있으면 자주, 아니면 가끔 깨어나 다시 봅니다
+                    self._cond.wait(ADMISSION_RETRY if self._rotation else SWEEP_INTERVAL)
+                    self._sweep()
+                    job = self._next_job()
+                job.status = RUNNING
+                job.started = time.time()
+                job.message = ""
+            registry.record(StageRecord(kind=job.kind, stage="queue", seconds=job.started - job.created))
+            self._run(job)
+
+    def _run(self, job: Job) -> None:
+        """메모리를 예약해 둔 작업을 실행합니다. 어떤 이유로 실패해도 작업은 끝난 상태가 됩니다."""
+        def progress(done: int, total: int, message: str = "") -> None:
+            job.done, job.total, job.message = done, total, message
+
+        path, output, error = None, None, None
+        try:
+            fd, path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, 'w+b') as f:
+                output = job.func(f, progress)
+            size = os.path.getsize(path)
+        except Exception as e:
+            logger.warning("작업 %s 실패: %s", job.id, e, exc_info=True)
+            error = str(e) or type(e).__name__
+        finally:
+            self.governor.release(job.session, job.cost)
+            # 큰 원본을 붙잡고 있지 않도록 작업 함수를 놓아줍니다
+            job.func = None
+            # 화면은 잠금 없이 status를 보고 나머지 필드를 읽으므로, 결과를 모두 채운 뒤
+            # 마지막에 status를 바꿉니다
+            with self._cond:
+                job.finished = time.time()
+                if error is None and output is not None:
+                    job.output, job.path, job.size = output, path, size
+                    job.status = DONE
+                    self._completed += 1
+                else:
+                    job.error = error or "작업이 결과 없이 끝났습니다"
+                    job.status = FAILED
+                    self._failed += 1
+                    if path is not None:
+                        try:
+                            os.unlink(path)
+                        except OSError:
+                            pass
+                # 메모리를 기다리던 작업이 바로 자리를 얻을 수 있게 깨웁니다
+                self._cond.notify_all()
+
+
+# 프로세스 전체에서 공유하는 기본 작업 관리자
+job_manager = JobManager()
@@ -0,0 +1,324 @@
+"""
+단계별 성능 지표
+변환 경로의 각 단계(업로드, 디코딩, 알파 합성, 인코딩, 압축, 다운로드)마다
+소요 시간과 입출력 바이트를 기록하고 내보냅니다. 최대 할당량은 켜 두었을 때
+프로세스 전체 기준으로만 잽니다 (stage 참고).
+
+- 구조화 로그: 'converter.metrics' 로거에 단계마다 JSON 한 줄
+- Prometheus 텍스트: render_prometheus() / start_metrics_server()
+- 관리자 패널: snapshot()
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+logger = logging.getLogger("converter.metrics")
+
+# 최대 할당량 측정 여부. tracemalloc은 파이썬 코드를 느리게 하므로 기본값은 꺼짐입니다.
+# tracemalloc의 최대값은 프로세스에 하나뿐이라 단계별로 나눌 수 없습니다. 그래서 한 번에 한 단계만
+# (다른 단계가 재고 있지 않을 때 시작한 바깥 단계) 재며, 그 값도 그동안 프로세스 전체의 최대 할당량입니다.
+TRACE_ALLOCATIONS = os.environ.get("CONVERTER_METRICS_TRACEMALLOC", "") == "1"
+
+# 이 포트가 지정되면 /metrics 엔드포인트를 엽니다
+METRICS_PORT = int(os.environ.get("CONVERTER_METRICS_PORT", 0))
+
+# 소요 시간 히스토그램 구간 (초)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+@dataclass
+class StageRecord:
+    """단계 한 번의 측정값."""
+    kind: str
+    stage: str
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+    # 이 단계가 실행되는 동안 프로세스 전체의 최대 할당 증가량 (재지 않은 단계는 None)
+    peak_alloc: Optional[int] = None
+    error: bool = False
+
+
+class _StageStats:
+    """(종류, 단계)별 누적 통계."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+    def add(self, record: StageRecord) -> None:
+        self.count += 1
+        self.errors += int(record.error)
+        self.seconds += record.seconds
+        self.max_seconds = max(self.max_seconds, record.seconds)
+        self.bytes_in += record.bytes_in
+        self.bytes_out += record.bytes_out
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if record.seconds <= bound:
+                self.buckets[i] += 1
+
+
+class MetricsRegistry:
+    """프로세스 전체에서 공유하는 단계별 통계 저장소."""
+
+    def __init__(self):
+        self._stats: dict = {}
+        # 프로세스 전체의 최대 할당 증가량 (단계별로 나누지 않습니다)
+        self._peak_alloc = 0
+        self._lock = threading.Lock()
+
+    def record(self, record: StageRecord) -> None:
+        """측정값을 누적하고 구조화 로그를 남깁니다."""
+        with self._lock:
+            key = (record.kind, record.stage)
+            if key not in self._stats:
+                self._stats[key] = _StageStats()
+            self._stats[key].add(record)
+            if record.peak_alloc is not None:
+                self._peak_alloc = max(self._peak_alloc, record.peak_alloc)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps({"event": "stage", **asdict(record)}, ensure_ascii=False))
+
+    def merge(self, records: list) -> None:
+        """워커 프로세스에서 돌려받은 측정값을 합칩니다."""
+        for record in records:
+            self.record(record)
+
+    def snapshot(self) -> list:
+        """단계별 누적 통계를 dict 리스트로 반환합니다."""
+        with self._lock:
+            return [
+                {
+                    "kind": kind,
+                    "stage": stage,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "total_s": stats.seconds,
+                    "avg_ms": stats.seconds / stats.count * 1000 if stats.count else 0.0,
+                    "max_ms": stats.max_seconds * 1000,
+                    "bytes_in": stats.bytes_in,
+                    "bytes_out": stats.bytes_out,
+                }
+                for (kind, stage), stats in sorted(self._stats.items())
+            ]
+
+    def render_prometheus(self) -> str:
+        """Prometheus 텍스트 형식으로 내보냅니다."""
+        lines = [
+            "# HELP converter_stage_duration_seconds Time spent in each conversion stage.",
+            "# TYPE converter_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            items = sorted(self._stats.items())
+            for (kind, stage), stats in items:
+                labels = f'kind="{kind}",stage="{stage}"'
+                for bound, count in zip(DURATION_BUCKETS, stats.buckets):
+                    lines.append(f'converter_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'converter_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f"converter_stage_duration_seconds_sum{{{labels}}} {stats.seconds}")
+                lines.append(f"converter_stage_duration_seconds_count{{{labels}}} {stats.count}")
+
+            for name, attr, help_text in (
+                ("converter_stage_bytes_in_total", "bytes_in", "Bytes read by each stage."),
+                ("converter_stage_bytes_out_total", "bytes_out", "Bytes produced by each stage."),
+                ("converter_stage_errors_total", "errors", "Stage runs that raised an error."),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (kind, stage), stats in items:
+                    lines.append(f'{name}{{kind="{kind}",stage="{stage}"}} {getattr(stats, attr)}')
+
+            if TRACE_ALLOCATIONS:
+                lines.append("# HELP converter_process_peak_alloc_bytes Largest traced allocation peak in this process.")
+                lines.append("# TYPE converter_process_peak_alloc_bytes gauge")
+                lines.append(f"converter_process_peak_alloc_bytes {self._peak_alloc}")
+
+        lines.extend(_cache_metrics())
+        lines.extend(_governor_metrics())
+        lines.extend(_job_metrics())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._peak_alloc = 0
+
+
+def _cache_metrics() -> list:
+    """변환 결과 캐시의 적중률 지표."""
+    from converter.cache import conversion_cache
+
+    stats = conversion_cache.stats()
+    lines = []
+    for key in ("hits", "disk_hits", "misses", "evictions"):
+        lines.append(f"# TYPE converter_cache_{key}_total counter")
+        lines.append(f"converter_cache_{key}_total {stats[key]}")
+    for key in ("entries", "bytes", "disk_bytes"):
+        lines.append(f"# TYPE converter_cache_{key} gauge")
+        lines.append(f"converter_cache_{key} {stats[key]}")
+    return lines
+
+
+def _governor_metrics() -> list:
+    """메모리 예산 예약 현황과 승인 결과 지표."""
+    from converter.governor import memory_governor
+
+    stats = memory_governor.stats()
+    lines = []
+    for key in ("budget", "session_budget", "reserved"):
+        lines.append(f"# TYPE converter_memory_{key}_bytes gauge")
+        lines.append(f"converter_memory_{key}_bytes {stats[key]}")
+    lines.append("# TYPE converter_admission_waiting gauge")
+    lines.append(f"converter_admission_waiting {stats['waiting']}")
+    lines.append("# TYPE converter_admissions_total counter")
+    for key in ("admitted", "queued", "rejected"):
+        lines.append(f'converter_admissions_total{{result="{key}"}} {stats[key]}')
+    return lines
+
+
+def _job_metrics() -> list:
+    """백그라운드 작업 대기열 지표."""
+    from converter.jobs import job_manager
+
+    stats = job_manager.stats()
+    lines = ["# TYPE converter_jobs gauge"]
+    for key in ("queued", "running", "retained"):
+        lines.append(f'converter_jobs{{status="{key}"}} {stats[key]}')
+    lines.append("# TYPE converter_jobs_finished_total counter")
+    for key in ("completed", "failed", "expired"):
+        lines.append(f'converter_jobs_finished_total{{result="{key}"}} {stats[key]}')
+    return lines
+
+
+registry = MetricsRegistry()
+
+_capture = threading.local()
+
+# tracemalloc 최대값을 재설정하고 읽는 단계 (한 번에 하나)
+_trace_lock = threading.Lock()
+_trace_owner: Optional[StageRecord] = None
+
+
+def _start_trace(record: StageRecord) -> Optional[int]:
+    """다른 단계가 재고 있지 않으면 이 단계가 최대값을 재설정하고 시작 할당량을 돌려줍니다."""
+    global _trace_owner
+    with _trace_lock:
+        if _trace_owner is not None:
+            return None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        _trace_owner = record
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _stop_trace(record: StageRecord, start_alloc: int) -> None:
+    global _trace_owner
+    with _trace_lock:
+        record.peak_alloc = max(tracemalloc.get_traced_memory()[1] - start_alloc, 0)
+        _trace_owner = None
+
+
+@contextmanager
+def stage(name: str, kind: str, bytes_in: int = 0):
+    """
+    한 단계의 소요 시간과 할당량을 잽니다.
+
+    할당량(CONVERTER_METRICS_TRACEMALLOC=1)은 다른 단계가 재고 있지 않을 때만 재므로
+    안쪽 단계나 다른 스레드에서 동시에 실행된 단계는 peak_alloc이 None입니다.
+
+    사용 예:
+        with stage("encode", "image", bytes_in=len(data)) as record:
+            output = encode(...)
+            record.bytes_out = len(output)
+    """
+    record = StageRecord(kind=kind, stage=name, bytes_in=bytes_in)
+    start_alloc = _start_trace(record) if TRACE_ALLOCATIONS else None
+    started = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record.error = True
+        raise
+    finally:
+        record.seconds = time.perf_counter() - started
+        if start_alloc is not None:
+            _stop_trace(record, start_alloc)
+        captured = getattr(_capture, "records", None)
+        if captured is not None:
+            captured.append(record)
+        else:
+            registry.record(record)
+
+
+@contextmanager
+def capture():
+    """
+    이 스레드의 측정값을 레지스트리 대신 리스트에 모읍니다.
+
+    워커 프로세스에서 측정값을 결과와 함께 돌려보낼 때 사용합니다.
+    """
+    previous = getattr(_capture, "records", None)
+    _capture.records = []
+    try:
+        yield _capture.records
+    finally:
+        _capture.records = previous
+
+
+def render_prometheus() -> str:
+    """기본 레지스트리를 Prometheus 텍스트 형식으로 내보냅니다."""
+    return registry.render_prometheus()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 스크레이프 요청마다 stderr에 남기지 않습니다
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "127.0.0.1") -> Optional[ThreadingHTTPServer]:
+    """
+    /metrics 엔드포인트를 백그라운드 스레드로 엽니다.
+
+    Streamlit은 위젯 조작마다 스크립트를 다시 실행하므로 여러 번 호출돼도
+    서버는 프로세스당 한 번만 시작합니다. port가 0이면 아무것도 하지 않습니다.
+    """
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            thread = threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True)
+            thread.start()
+        return _server
@@ -0,0 +1,130 @@
+"""
+공유 프로세스 풀
+이미지 일괄 변환(converter.batch)과 시트 변환(converter.sheets)이 같이 쓰는 워커 풀과,
+큰 원본을 공유 메모리로 워커에 넘기는 페이로드를 다룹니다.
+"""
+
+import itertools
+import multiprocessing
+import threading
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Optional
+
+from converter.utils import MAX_WORKERS
+
+# 이 크기 이상의 원본은 피클링 대신 공유 메모리로 워커에 전달합니다
+SHARED_MEMORY_THRESHOLD = 1 * 1024 * 1024
+
+# 워커가 비정상 종료되어 끝내지 못한 작업의 오류 메시지
+BROKEN_POOL_ERROR = "워커 프로세스가 비정상 종료되었습니다"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """
+    프로세스 전체에서 공유하는 워커 풀을 반환합니다.
+
+    풀은 MAX_WORKERS개로 한 번만 만들고, 배치마다 동시에 제출하는 수는
+    submit_limited로 제한합니다. 다른 배치가 쓰고 있는 풀을 크기 때문에 갈아 끼우지 않습니다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Streamlit 서버는 멀티스레드이므로 fork 대신 spawn을 사용합니다
+            _pool = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def reset_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    워커가 비정상 종료된 풀을 버립니다. 다음 요청 때 새로 만듭니다.
+
+    같은 풀을 쓰던 다른 배치가 먼저 새 풀로 바꿨으면 새 풀은 그대로 둡니다.
+    깨진 풀의 작업은 이미 모두 실패했으므로 기다리지 않고 닫습니다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def submit_limited(pool: ProcessPoolExecutor, func, jobs, limit: int):
+    """
+    jobs의 (인덱스, 인자 튜플)을 pool에서 func(*인자)로 실행하고, 끝나는 순서대로
+    (인덱스, future)를 내보냅니다.
+
+    끝나지 않은 작업이 limit개를 넘지 않게 하나씩 제출하므로 공유 풀에서도 배치마다
+    max_workers를 지키고, jobs의 순서(큰 파일 먼저)대로 워커에 들어갑니다.
+    인자는 제출할 때 꺼내므로 jobs를 제너레이터로 주면 페이로드도 그때 만들어집니다.
+    """
+    jobs = iter(jobs)
+    running = {}
+
+    def submit() -> None:
+        for idx, args in itertools.islice(jobs, limit - len(running)):
+            running[pool.submit(func, *args)] = idx
+
+    try:
+        submit()
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield running.pop(future), future
+            submit()
+    finally:
+        # 중간에 멈추면 아직 시작하지 않은 작업은 취소합니다
+        for future in running:
+            future.cancel()
+
+
+@contextmanager
+def attach(payload):
+    """워커에서 페이로드를 버퍼로 엽니다. 공유 메모리는 복사 없이 붙어서 읽습니다."""
+    if isinstance(payload, bytes):
+        yield payload
+        return
+
+    # (공유 메모리 이름, 크기) 형태
+    shm_name, size = payload
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = shm.buf[:size]
+        try:
+            yield view
+        finally:
+            view.release()
+    finally:
+        shm.close()
+
+
+def _to_shared(data) -> shared_memory.SharedMemory:
+    """원본 버퍼를 공유 메모리 블록에 한 번만 복사합니다."""
+    view = memoryview(data).cast('B')
+    shm = shared_memory.SharedMemory(create=True, size=len(view))
+    shm.buf[:len(view)] = view
+    return shm
+
+
+def make_payload(data, segments: list):
+    """작은 원본은 bytes로, 큰 원본은 공유 메모리로 넘길 페이로드를 만듭니다."""
+    size = memoryview(data).nbytes
+    if size < SHARED_MEMORY_THRESHOLD:
+        return bytes(data)
+    shm = _to_shared(data)
+    segments.append(shm)
+    return shm.name, size
+
+
+def free_payloads(segments: list) -> None:
+    """make_payload가 만든 공유 메모리 블록을 해제합니다."""
+    for shm in segments:
+        shm.close()
+        shm.unlink()
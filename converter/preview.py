@@ -0,0 +1,124 @@
+"""
+CSV/Excel 미리보기
+표시할 앞부분 행만 읽고, 전체 행 수는 파싱 없이 빠르게 셉니다.
+전체 파싱은 실제로 변환할 때 한 번만 합니다.
+"""
+
+import codecs
+from dataclasses import dataclass
+from typing import Optional
+
+import openpyxl
+import pandas as pd
+
+from converter.data import COLUMNAR_FORMATS
+from converter.utils import as_file
+
+
+# 미리보기로 읽는 행 수
+PREVIEW_ROWS = 10
+
+# 줄 수를 셀 때 한 번에 훑는 크기 (바이트)
+COUNT_CHUNK_BYTES = 4 * 1024 * 1024
+
+
+@dataclass
+class DataPreview:
+    """미리보기 결과."""
+    frame: pd.DataFrame
+    # 헤더를 뺀 데이터 행 수 (알 수 없으면 None)
+    rows: Optional[int]
+    # 따옴표 안 줄바꿈 등으로 실제 행 수와 다를 수 있으면 False
+    exact: bool = True
+
+
+def count_csv_rows(data, encoding: str = 'utf-8', quotechar: str = '"', header: bool = True) -> tuple:
+    """
+    CSV를 파싱하지 않고 줄바꿈 수로 행 수를 셉니다.
+
+    따옴표가 있는 파일은 값 안의 줄바꿈 때문에 실제보다 많게 셀 수 있어
+    근사치로 표시합니다.
+
+    Returns:
+        (행 수, 정확한지 여부)
+    """
+    view = memoryview(data).cast('B')
+    total = len(view)
+    if not total:
+        return 0, True
+
+    if encoding.lower().replace('_', '-').startswith('utf-16'):
+        # 두 바이트 문자의 한쪽이 0x0A일 수 있으므로 디코딩해서 셉니다
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        lines, has_quote, last = 0, False, ''
+        for start in range(0, total, COUNT_CHUNK_BYTES):
+            text = decoder.decode(bytes(view[start:start + COUNT_CHUNK_BYTES]))
+            lines += text.count('\n')
+            has_quote = has_quote or quotechar in text
+            last = text[-1:] or last
+        ends_with_newline = last == '\n'
+    else:
+        quote = quotechar.encode(encoding)
+        lines, has_quote = 0, False
+        for start in range(0, total, COUNT_CHUNK_BYTES):
+            chunk = bytes(view[start:start + COUNT_CHUNK_BYTES])
+            lines += chunk.count(b'\n')
+            has_quote = has_quote or quote in chunk
+        ends_with_newline = view[total - 1] == 0x0A
+
+    # 마지막 줄에 줄바꿈이 없어도 한 행입니다
+    if not ends_with_newline:
+        lines += 1
+    rows = max(lines - 1, 0) if header else lines
+    return rows, not has_quote
+
+
+def count_xlsx_rows(data, sheet_name: Optional[str] = None) -> Optional[int]:
+    """
+    시트의 dimension 정보로 데이터 행 수를 읽습니다 (sheet_name이 없으면 첫 시트).
+
+    dimension이 없는 파일은 행을 한 번 훑어 셉니다 (셀 객체는 만들지 않습니다).
+    """
+    workbook = openpyxl.load_workbook(as_file(data), read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        max_row = sheet.max_row
+        if max_row is None:
+            max_row = sum(1 for _ in sheet.iter_rows(values_only=True))
+        return max(max_row - 1, 0)
+    finally:
+        workbook.close()
+
+
+def preview_data(data, source_format: str, rows: int = PREVIEW_ROWS, **read_options) -> DataPreview:
+    """
+    앞부분 행만 읽은 미리보기와 전체 행 수를 반환합니다.
+
+    Args:
+        data: 원본 바이트 데이터 (bytes 또는 memoryview)
+        source_format: 원본 형식 ('csv', 'xlsx', 'xls', 'parquet', 'feather', 'arrow')
+        rows: 미리보기로 읽을 행 수
+        **read_options: CSV 읽기 설정 (CsvDialect.read_csv_kwargs()) 또는 Excel의 sheet_name
+
+    Returns:
+        DataPreview
+    """
+    if source_format.lower() == 'csv':
+        frame = pd.read_csv(as_file(data), nrows=rows, **read_options)
+        total, exact = count_csv_rows(
+            data,
+            encoding=read_options.get('encoding', 'utf-8'),
+            quotechar=read_options.get('quotechar', '"'),
+            header=read_options.get('header', 0) is not None,
+        )
+        return DataPreview(frame=frame, rows=total, exact=exact)
+
+    if source_format.lower() in COLUMNAR_FORMATS:
+        # 행 수는 파일 메타데이터에 기록되어 있습니다
+        from converter.columnar import preview_columnar
+        frame, total = preview_columnar(data, source_format.lower(), rows)
+        return DataPreview(frame=frame, rows=total)
+
+    sheet_name = read_options.get('sheet_name')
+    frame = pd.read_excel(as_file(data), engine='openpyxl', nrows=rows, sheet_name=sheet_name or 0)
+    return DataPreview(frame=frame, rows=count_xlsx_rows(data, sheet_name))
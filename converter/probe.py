@@ -0,0 +1,285 @@
+"""
+변환 전 헤더 검사
+픽셀이나 셀을 읽기 전에 파일 앞부분만 보고 형식과 크기를 알아내고,
+필요한 메모리와 변환 시간을 추정합니다. 한도를 넘는 파일은 디코딩하기 전에 거절하고,
+추정 시간은 오래 걸리는 파일부터 워커에 보내는 순서로 씁니다.
+
+- 이미지: Image.open은 헤더만 읽습니다 (load()를 부르기 전에는 픽셀을 디코딩하지 않습니다)
+- XLSX: ZIP 목록과 시트 XML 앞부분의 <dimension>만 읽습니다
+"""
+
+import posixpath
+import re
+import warnings
+import zipfile
+from dataclasses import dataclass, field
+from typing import Optional
+from xml.etree import ElementTree
+
+from converter.governor import SESSION_BUDGET, estimate_data_cost, image_cost
+from converter.utils import MAX_IMAGE_PIXELS, as_file, env_megabytes, format_bytes
+
+
+# 파일 하나를 변환할 때 허용하는 예상 메모리 (기본값: 세션 예산)
+MAX_FILE_MEMORY = env_megabytes("CONVERTER_MAX_FILE_MEMORY_MB", SESSION_BUDGET)
+
+# 변환 시간 추정용 처리량 (1코어, 1920x1080 balanced 프리셋 측정, 초당 픽셀 수).
+#   디코딩: JPEG 250 MP/s, PNG 95 MP/s, WEBP 65 MP/s
+#   인코딩: JPEG 100 MP/s, PNG 12 MP/s, WEBP 11 MP/s
+IMAGE_DECODE_RATE = {'JPEG': 250e6, 'PNG': 95e6, 'WEBP': 65e6}
+IMAGE_ENCODE_RATE = {'JPEG': 100e6, 'PNG': 12e6, 'WEBP': 11e6}
+IMAGE_DEFAULT_RATE = 50e6
+
+# XLSX는 셀 수, 나머지는 입력 크기로 봅니다 (XLSX→CSV 25만 셀/초, CSV→XLSX 18 MB/초)
+XLSX_CELLS_PER_SECOND = 250_000
+DATA_BYTES_PER_SECOND = 18 * 1024 * 1024
+
+# dimension이 없는 시트는 XML 크기로 셀 수를 짐작합니다 (openpyxl이 쓴 시트는 셀당 약 37바이트)
+XLSX_XML_BYTES_PER_CELL = 32
+
+# <dimension>을 찾으려고 시트 XML 앞부분에서 읽는 최대 크기 (보통 첫 수백 바이트 안에 있습니다)
+DIMENSION_SEARCH_BYTES = 64 * 1024
+
+_DIMENSION = re.compile(rb'<(?:\w+:)?dimension\s+ref="([A-Z]*)(\d*)(?::([A-Z]+)(\d+))?"')
+_SHEET_DATA = re.compile(rb'<(?:\w+:)?sheetData[\s/>]')
+
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+@dataclass
+class ProbeResult:
+    """헤더 검사 결과."""
+    name: str
+    # 감지한 형식 (이미지는 Pillow 형식 이름 'PNG', 'JPEG' 등, 데이터는 확장자 'xlsx', 'csv' 등)
+    format: Optional[str]
+    # 파일 크기 (바이트)
+    size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    mode: Optional[str] = None
+    frames: int = 1
+    # XLSX 시트별 (이름, 행 수, 열 수, 셀 수). dimension이 없는 시트는 행·열이 None이고
+    # 셀 수는 압축을 푼 XML 크기로 짐작한 값입니다
+    sheets: list = field(default_factory=list)
+    # 변환할 시트의 셀 수 (XLSX가 아니면 None)
+    cells: Optional[int] = None
+    # 변환에 필요한 예상 메모리 (바이트)와 예상 시간 (초)
+    memory: int = 0
+    seconds: float = 0.0
+    # 거절한 이유 (변환할 수 있으면 None)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def pixels(self) -> Optional[int]:
+        if self.width is None or self.height is None:
+            return None
+        return self.width * self.height
+
+
+def _check_memory(result: ProbeResult, max_memory: int) -> ProbeResult:
+    if result.error is None and result.memory > max_memory:
+        result.error = (
+            f"'{result.name}'의 예상 메모리 {format_bytes(result.memory)}가 "
+            f"파일 하나에 허용하는 {format_bytes(max_memory)}를 넘습니다"
+        )
+    return result
+
+
+def probe_image(
+    name: str,
+    data,
+    target_format: str,
+    max_size: Optional[int] = None,
+    scale: Optional[float] = None,
+    preset: Optional[str] = None,
+    encoder_options: Optional[dict] = None,
+    max_pixels: int = MAX_IMAGE_PIXELS,
+    max_memory: int = MAX_FILE_MEMORY,
+    **_,
+) -> ProbeResult:
+    """
+    이미지 헤더만 읽어 크기·모드·프레임 수와 변환 비용을 알아냅니다.
+
+    픽셀 수가 max_pixels를 넘는 파일은 그대로 담을 수 있어도 거절합니다
+    (썸네일을 만들 때도 디코딩하지 않게 하려는 것입니다).
+    원본을 그대로 담을 파일은 메모리와 시간이 0입니다.
+
+    Args:
+        name: 파일명 (거절 메시지에 씁니다)
+        data: 원본 바이트 데이터 (bytes 또는 memoryview)
+        target_format: 변환할 이미지 형식
+        max_size, scale, preset, encoder_options: convert_image와 같은 크기 조정·인코더 설정
+        max_pixels: 허용하는 최대 픽셀 수
+        max_memory: 허용하는 최대 예상 메모리 (바이트)
+
+    Returns:
+        ProbeResult. 읽을 수 없는 파일은 format이 None이고 error가 채워집니다.
+    """
+    from PIL import Image
+
+    from converter.image import can_passthrough
+
+    result = ProbeResult(name=name, format=None, size=memoryview(data).nbytes)
+    try:
+        with warnings.catch_warnings():
+            # 한도는 아래에서 직접 검사합니다
+            warnings.simplefilter('ignore', Image.DecompressionBombWarning)
+            img = Image.open(as_file(data))
+    except Image.DecompressionBombError:
+        result.error = f"'{name}'은(는) 픽셀 수가 너무 많아 열 수 없습니다"
+        return result
+    except Exception:
+        result.error = f"'{name}'은(는) 읽을 수 있는 이미지 파일이 아닙니다"
+        return result
+
+    result.format = img.format
+    result.width, result.height = img.size
+    result.mode = img.mode
+    result.frames = getattr(img, 'n_frames', 1)
+    if result.pixels > max_pixels:
+        result.error = (
+            f"'{name}'({result.width:,}x{result.height:,}, {result.pixels / 1e6:,.0f}MP)은(는) "
+            f"최대 {max_pixels / 1e6:,.0f}MP까지 변환할 수 있습니다"
+        )
+        return result
+
+    if can_passthrough(data, target_format, max_size, scale, preset, encoder_options):
+        return result
+
+    try:
+        result.memory, decoded_pixels, output_pixels = image_cost(img, target_format, max_size, scale)
+    except ValueError as e:
+        result.error = str(e)
+        return result
+    save_format = target_format.upper().replace('JPG', 'JPEG')
+    result.seconds = (
+        decoded_pixels / IMAGE_DECODE_RATE.get(img.format, IMAGE_DEFAULT_RATE)
+        + output_pixels / IMAGE_ENCODE_RATE.get(save_format, IMAGE_DEFAULT_RATE)
+    )
+    return _check_memory(result, max_memory)
+
+
+def _column_number(letters: bytes) -> int:
+    number = 0
+    for letter in letters:
+        number = number * 26 + letter - ord('A') + 1
+    return number
+
+
+def _sheet_dimension(archive: zipfile.ZipFile, member: str) -> tuple:
+    """시트 XML 앞부분의 <dimension>에서 (행 수, 열 수)를 읽습니다. 없으면 (None, None)."""
+    head = b''
+    with archive.open(member) as f:
+        while len(head) < DIMENSION_SEARCH_BYTES:
+            chunk = f.read(4096)
+            if not chunk:
+                break
+            head += chunk
+            match = _DIMENSION.search(head)
+            if match:
+                first_col, first_row, last_col, last_row = match.groups()
+                if last_row is None:
+                    # 'A1'처럼 한 칸만 적힌 경우: 빈 시트이거나 크기를 기록하지 않은 파일입니다
+                    return None, None
+                rows = int(last_row) - int(first_row or 1) + 1
+                columns = _column_number(last_col) - _column_number(first_col or b'A') + 1
+                return rows, columns
+            if _SHEET_DATA.search(head):
+                break
+    return None, None
+
+
+def _workbook_sheets(archive: zipfile.ZipFile) -> list:
+    """통합 문서의 (시트 이름, 시트 XML 경로)를 순서대로 반환합니다."""
+    workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+    relations = ElementTree.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+    targets = {}
+    for relation in relations.iter(f"{_PACKAGE_REL_NS}Relationship"):
+        target = relation.get('Target', '')
+        # 상대 경로는 xl/ 기준, '/'로 시작하면 패키지 루트 기준입니다
+        targets[relation.get('Id')] = (
+            target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+        )
+    return [
+        (sheet.get('name'), targets.get(sheet.get(f"{_REL_NS}id")))
+        for sheet in workbook.iter(f"{_MAIN_NS}sheet")
+    ]
+
+
+def probe_sheets(data) -> list:
+    """
+    XLSX의 시트별 크기를 셀을 읽지 않고 알아냅니다.
+
+    Returns:
+        [(시트 이름, 행 수, 열 수, 셀 수), ...] (통합 문서의 시트 순서).
+        dimension이 없는 시트는 행·열이 None이고 셀 수는 압축을 푼 XML 크기로 짐작합니다.
+    """
+    sheets = []
+    with zipfile.ZipFile(as_file(data)) as archive:
+        members = {info.filename: info for info in archive.infolist()}
+        for sheet_name, member in _workbook_sheets(archive):
+            if member not in members:
+                sheets.append((sheet_name, None, None, 0))
+                continue
+            rows, columns = _sheet_dimension(archive, member)
+            if rows is not None:
+                cells = rows * columns
+            else:
+                cells = members[member].file_size // XLSX_XML_BYTES_PER_CELL
+            sheets.append((sheet_name, rows, columns, cells))
+    return sheets
+
+
+def probe_data(
+    name: str,
+    data,
+    source_format: str,
+    target_format: str,
+    stream: bool = False,
+    compact: bool = False,
+    sheet_name: Optional[str] = None,
+    max_memory: int = MAX_FILE_MEMORY,
+) -> ProbeResult:
+    """
+    CSV/Excel/컬럼 형식 파일의 크기와 변환 비용을 셀을 읽지 않고 추정합니다.
+
+    XLSX는 시트 크기를 읽어 셀 수로 메모리와 시간을 추정합니다
+    (sheet_name이 있으면 그 시트만, 없으면 첫 시트를 변환한다고 봅니다).
+
+    Args:
+        name: 파일명 (거절 메시지에 씁니다)
+        data: 원본 바이트 데이터 (bytes 또는 memoryview)
+        source_format: 원본 형식 ('csv', 'xlsx', 'parquet' 등)
+        target_format: 변환할 형식
+        stream, compact: estimate_data_cost와 같은 변환 방식
+        sheet_name: 변환할 시트
+        max_memory: 허용하는 최대 예상 메모리 (바이트)
+
+    Returns:
+        ProbeResult
+    """
+    source_format = source_format.lower()
+    size = memoryview(data).nbytes
+    result = ProbeResult(name=name, format=source_format, size=size)
+
+    if source_format == 'xlsx':
+        try:
+            result.sheets = probe_sheets(data)
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+            result.error = f"'{name}'은(는) 올바른 Excel 파일이 아닙니다"
+            return result
+        chosen = [sheet for sheet in result.sheets if sheet[0] == sheet_name] or result.sheets[:1]
+        result.cells = chosen[0][3] if chosen else 0
+        result.seconds = result.cells / XLSX_CELLS_PER_SECOND
+    else:
+        result.seconds = size / DATA_BYTES_PER_SECOND
+
+    result.memory = estimate_data_cost(size, source_format, target_format, stream=stream,
+                                       compact=compact, cells=None if stream else result.cells)
+    return _check_memory(result, max_memory)
@@ -0,0 +1,718 @@
+"""
+변환 HTTP API
+
+    python -m converter.server --port 8600
+    uvicorn converter.server:app --port 8600
+
+Streamlit 화면과 같은 변환을 다른 서비스가 HTTP로 호출할 수 있게 합니다.
+외부 서비스 없이 이 프로세스 하나로 동작합니다.
+
+    POST /convert/image?to=webp&max_size=1200      본문: 이미지           → 변환된 이미지
+    POST /convert/images?to=jpg                    multipart 파일 여러 개 → ZIP 스트림
+    POST /convert/data?to=xlsx&name=보고서.csv      본문: 데이터 파일      → 변환된 파일
+    POST /convert/data/batch?to=parquet            multipart 파일 여러 개 → ZIP 스트림
+    GET  /health                                   작업 스레드·메모리 예산 현황 (JSON)
+    GET  /metrics                                  Prometheus 지표
+
+- 요청 본문은 받는 대로 임시 파일에 기록하고, 결과도 조각으로 나눠 보냅니다
+- 변환은 이벤트 루프 밖의 정해진 수의 작업 스레드에서 메모리 예산(converter.governor)을 예약한 뒤 실행합니다
+- 밀린 요청이 한도를 넘으면 기다리게 하지 않고 바로 429와 Retry-After로 거절합니다
+- ZIP 결과는 파일이 변환되는 대로 흘려보내므로 마지막 파일을 기다리지 않고 받기 시작합니다
+- 이미지는 헤더만 읽어(converter.probe) 픽셀·메모리 한도를 넘으면 디코딩하기 전에 거절하고,
+  여러 파일이면 오래 걸리는 파일부터 변환합니다
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import mmap
+import os
+import posixpath
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from urllib.parse import quote
+
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.datastructures import UploadFile
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from converter.archive import StreamingZipWriter
+from converter.batch import convert_images_parallel
+from converter.cache import conversion_cache
+from converter.cli import (
+    DATA_SOURCES,
+    ENCODER_PRESETS,
+    IMAGE_TARGETS,
+    convert_file,
+    parse_encoder_option,
+)
+from converter.columnar import COLUMNAR_CODECS
+from converter.governor import (
+    MemoryBudgetExceeded,
+    estimate_batch_cost,
+    estimate_data_cost,
+    memory_governor,
+)
+from converter.image import encoder_settings, parse_background
+from converter.jobs import JobQueueFull
+from converter.metrics import StageRecord, registry, render_prometheus
+from converter.probe import probe_image
+from converter.utils import MAX_WORKERS, get_file_extension, replace_extension
+
+
+logger = logging.getLogger("converter.server")
+
+# 동시에 변환하는 요청 수
+API_WORKERS = int(os.environ.get("CONVERTER_API_WORKERS", 0)) or MAX_WORKERS
+
+# 실행 중인 요청을 포함해 받아 둘 수 있는 요청 수 (프로세스 전체 / 클라이언트 하나)
+API_MAX_PENDING = int(os.environ.get("CONVERTER_API_MAX_PENDING", 0)) or API_WORKERS * 4
+API_MAX_PER_CLIENT = int(os.environ.get("CONVERTER_API_MAX_PER_CLIENT", 8))
+
+# 요청 하나로 받을 수 있는 최대 크기와 파일 수
+MAX_UPLOAD_BYTES = int(os.environ.get("CONVERTER_API_MAX_UPLOAD_MB", 200)) * 1024 * 1024
+MAX_BATCH_FILES = int(os.environ.get("CONVERTER_API_MAX_FILES", 1000))
+
+# 429 응답에 넣는 재시도 대기 시간 (초)
+RETRY_AFTER = int(os.environ.get("CONVERTER_API_RETRY_AFTER", 1))
+
+# ZIP 스트림을 보내는 조각 크기와, 클라이언트가 느릴 때 쌓아 두는 조각 수
+CHUNK_BYTES = 64 * 1024
+PIPE_CHUNKS = 16
+
+# 일부 파일이 실패한 ZIP에 넣는 실패 목록 항목 이름
+ERRORS_MEMBER = "errors.json"
+
+# 이보다 큰 본문은 임시 파일에 내려 두고 메모리 매핑으로 읽습니다
+SPOOL_BYTES = 1 * 1024 * 1024
+
+# ZIP 항목 이름에 쓸 수 없는 문자 (제어 문자와 Windows 예약 문자)
+_UNSAFE_NAME_CHARS = re.compile(r'[\x00-\x1f\x7f\\/:*?"<>|]')
+
+MIME_TYPES = {
+    'png': "image/png",
+    'jpg': "image/jpeg",
+    'webp': "image/webp",
+    'xlsx': "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    'csv': "text/csv",
+    'parquet': "application/vnd.apache.parquet",
+    'feather': "application/vnd.apache.arrow.file",
+    'arrow': "application/vnd.apache.arrow.file",
+    'zip': "application/zip",
+}
+
+
+# ==================== 작업 스레드와 대기열 한도 ====================
+
+class RequestLimiter:
+    """
+    변환 요청을 정해진 수의 작업 스레드에서 실행합니다.
+
+    작업 스레드가 모두 바쁘면 요청은 실행기의 대기열에서 기다리지만, 받아 둔 요청이
+    프로세스나 클라이언트의 한도를 넘으면 본문을 읽기 전에 JobQueueFull로 거절합니다.
+    """
+
+    def __init__(self, workers: int = API_WORKERS, max_pending: int = API_MAX_PENDING,
+                 max_per_client: int = API_MAX_PER_CLIENT):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.max_per_client = max(1, max_per_client)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="api-worker")
+        self._lock = threading.Lock()
+        self._clients: dict = {}
+        self._pending = 0
+        self._running = 0
+        self._admitted = 0
+        self._rejected = 0
+
+    def admit(self, client: str) -> "_Ticket":
+        """
+        요청 하나를 받습니다. with 블록을 벗어날 때까지 run()을 부르지 않으면 자리를 돌려줍니다.
+
+        Raises:
+            JobQueueFull: 받아 둔 요청이 한도에 도달했을 때
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise JobQueueFull("요청이 많아 지금은 변환할 수 없습니다. 잠시 후 다시 시도해 주세요")
+            if self._clients.get(client, 0) >= self.max_per_client:
+                self._rejected += 1
+                raise JobQueueFull(f"진행 중인 요청이 {self.max_per_client}개입니다. 끝난 뒤 다시 시도해 주세요")
+            self._pending += 1
+            self._clients[client] = self._clients.get(client, 0) + 1
+            self._admitted += 1
+        return _Ticket(self, client)
+
+    def _release(self, client: str) -> None:
+        with self._lock:
+            self._pending -= 1
+            remaining = self._clients[client] - 1
+            if remaining:
+                self._clients[client] = remaining
+            else:
+                del self._clients[client]
+
+    def _call(self, submitted: float, func, *args):
+        started = time.perf_counter()
+        registry.record(StageRecord(kind="api", stage="queue", seconds=started - submitted))
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": self._running,
+                "clients": len(self._clients),
+                "admitted": self._admitted,
+                "rejected": self._rejected,
+            }
+
+
+class _Ticket:
+    """RequestLimiter가 받은 요청 하나의 자리. 작업이 끝나거나 작업 없이 with 블록을 벗어나면 돌려줍니다."""
+
+    def __init__(self, limiter: RequestLimiter, client: str):
+        self.limiter = limiter
+        self.client = client
+        self._running = False
+        self._released = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self._running:
+            self.release()
+
+    def run(self, func, *args) -> asyncio.Future:
+        """func(*args)를 작업 스레드에서 실행합니다. 요청마다 한 번만 부릅니다."""
+        self._running = True
+        future = asyncio.get_running_loop().run_in_executor(
+            self.limiter._executor, self.limiter._call, time.perf_counter(), func, *args
+        )
+        future.add_done_callback(lambda _: self.release())
+        return future
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.limiter._release(self.client)
+
+
+class _ResponsePipe(io.RawIOBase):
+    """
+    작업 스레드가 기록한 내용을 이벤트 루프의 응답으로 흘려보내는 쓰기 전용 파일.
+
+    조각이 PIPE_CHUNKS개 쌓이면 쓰는 쪽이 기다리므로 느린 클라이언트 때문에
+    결과가 메모리에 쌓이지 않습니다. 연결이 끊기면 다음 쓰기에서 BrokenPipeError가 납니다.
+    """
+
+    _END = object()
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(PIPE_CHUNKS)
+        self._buffer = bytearray()
+        self._aborted = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        if self._aborted:
+            raise BrokenPipeError("클라이언트 연결이 끊겼습니다")
+        self._buffer += b
+        if len(self._buffer) >= CHUNK_BYTES:
+            self._send(bytes(self._buffer))
+            self._buffer.clear()
+        return memoryview(b).nbytes
+
+    def _send(self, item) -> None:
+        asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
+
+    def produce(self, func, *args) -> None:
+        """작업 스레드에서 func(*args)를 실행하고 끝(또는 오류)을 알립니다. func는 이 파일에 기록합니다."""
+        try:
+            func(*args)
+        except BaseException as e:
+            if not self._aborted:
+                self._send(e)
+            return
+        if not self._aborted:
+            if self._buffer:
+                self._send(bytes(self._buffer))
+            self._send(self._END)
+
+    async def first(self):
+        """첫 조각을 기다립니다. 기록을 시작하기 전에 난 오류는 여기서 발생합니다."""
+        item = await self._queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def chunks(self, first):
+        try:
+            item = first
+            while item is not self._END:
+                yield item
+                item = await self._queue.get()
+                if isinstance(item, BaseException):
+                    # 응답 상태는 이미 보냈으므로 연결을 끊어 클라이언트가 불완전한 결과임을 알게 합니다
+                    logger.warning("스트림 도중 변환 실패: %s", item)
+                    raise item
+        finally:
+            self.abort()
+
+    def abort(self) -> None:
+        """더 읽지 않습니다. 기다리던 작업 스레드를 깨워 다음 쓰기에서 멈추게 합니다."""
+        self._aborted = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+
+# ==================== 요청 해석 ====================
+
+def _client(request: Request) -> str:
+    """대기열 한도와 메모리 예산을 나눌 클라이언트 식별자."""
+    client = request.headers.get("x-client-id")
+    if not client:
+        client = request.client.host if request.client else "local"
+    return f"api:{client}"
+
+
+def _target(request: Request, allowed) -> str:
+    target = request.query_params.get("to", "").lower()
+    if target == 'jpeg':
+        target = 'jpg'
+    if target not in allowed:
+        raise HTTPException(400, f"'to'에는 {', '.join(allowed)} 중 하나를 지정해 주세요")
+    return target
+
+
+def _number(request: Request, name: str, kind):
+    value = request.query_params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return kind(value)
+    except ValueError:
+        raise HTTPException(400, f"'{name}' 값이 올바르지 않습니다: {value}")
+
+
+def _image_options(request: Request, target: str) -> dict:
+    """이미지 변환 설정을 읽고, 파일을 받기 전에 잘못된 설정을 알려 줍니다."""
+    params = request.query_params
+    preset = params.get("preset") or None
+    if preset is not None and preset not in ENCODER_PRESETS:
+        raise HTTPException(400, f"'preset'에는 {', '.join(ENCODER_PRESETS)} 중 하나를 지정해 주세요")
+    scale = _number(request, "scale", float)
+    if scale is not None and not 0 < scale <= 1:
+        raise HTTPException(400, "'scale'은 0보다 크고 1 이하여야 합니다")
+    try:
+        encoder_options = dict(parse_encoder_option(text) for text in params.getlist("option")) or None
+        encoder_settings('JPEG' if target == 'jpg' else target.upper(), preset, encoder_options)
+        parse_background(params.get("background"))
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        raise HTTPException(400, str(e))
+    return {
+        'max_size': _number(request, "max_size", int),
+        'scale': scale,
+        'preset': preset,
+        'encoder_options': encoder_options,
+        'background': params.get("background"),
+    }
+
+
+def _data_codec(request: Request, target: str) -> Optional[str]:
+    codec = request.query_params.get("codec", "").lower() or None
+    if codec is not None and codec not in COLUMNAR_CODECS.get(target, ()):
+        raise HTTPException(400, f"{target}에서 지원하지 않는 압축 코덱입니다: {codec}")
+    return codec
+
+
+def _check_source(source_format: str, target: str, name: str) -> None:
+    if source_format not in DATA_SOURCES[target]:
+        raise HTTPException(415, f"'{name}'은(는) {target}로 변환할 수 없는 형식입니다")
+
+
+def _check_length(request: Request) -> None:
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES:
+        raise HTTPException(413, f"요청이 {MAX_UPLOAD_BYTES // 1024 // 1024} MB를 넘습니다")
+
+
+async def _receive(request: Request, output) -> int:
+    """요청 본문을 받는 대로 output에 기록합니다. 한 번에 한 조각만 메모리에 둡니다."""
+    _check_length(request)
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise HTTPException(413, f"요청이 {MAX_UPLOAD_BYTES // 1024 // 1024} MB를 넘습니다")
+        # 페이지 캐시에 쓰는 짧은 기록이라 이벤트 루프에서 바로 씁니다
+        output.write(chunk)
+    if not size:
+        raise HTTPException(400, "요청 본문이 비어 있습니다")
+    return size
+
+
+async def _receive_files(request: Request) -> list:
+    """multipart 요청의 파일들. 본문은 Starlette가 받는 대로 임시 파일에 내려 둡니다."""
+    _check_length(request)
+    form = await request.form(max_files=MAX_BATCH_FILES)
+    uploads = [value for _, value in form.multi_items() if isinstance(value, UploadFile)]
+    if not uploads:
+        await form.close()
+        raise HTTPException(400, "multipart 요청에 파일이 없습니다")
+    if sum(upload.size or 0 for upload in uploads) > MAX_UPLOAD_BYTES:
+        await form.close()
+        raise HTTPException(413, f"요청이 {MAX_UPLOAD_BYTES // 1024 // 1024} MB를 넘습니다")
+    return uploads
+
+
+def _mapped(spool, size: int):
+    """
+    임시 파일에 받은 본문을 읽기 전용 버퍼로 엽니다.
+
+    큰 본문은 메모리 매핑하므로 프로세스 메모리로 복사하지 않고, 헤더만 읽는
+    probe_image는 앞쪽 몇 페이지만 건드립니다. 매핑은 버퍼를 다 쓰면 함께 닫히므로
+    spool은 바로 닫아도 됩니다.
+    """
+    if size <= SPOOL_BYTES:
+        spool.seek(0)
+        return spool.read()
+    return memoryview(mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _member_name(name: Optional[str], fallback: str) -> str:
+    """클라이언트가 보낸 파일명에서 경로를 떼고 ZIP 항목 이름에 쓸 수 없는 문자를 바꿉니다."""
+    name = posixpath.basename((name or "").replace("\\", "/"))
+    name = _UNSAFE_NAME_CHARS.sub("_", name).strip(" .")
+    return name or fallback
+
+
+def _unique_name(name: str, taken: set) -> str:
+    """이미 쓴 ZIP 항목 이름이면 'a (2).webp'처럼 번호를 붙입니다."""
+    stem, dot, extension = name.rpartition('.') if '.' in name else (name, '', '')
+    candidate, number = name, 1
+    while candidate.lower() in taken:
+        number += 1
+        candidate = f"{stem} ({number}){dot}{extension}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+def _attachment(filename: str) -> dict:
+    return {"Content-Disposition": f"attachment; filename*=utf-8''{quote(filename)}"}
+
+
+# ==================== 변환 (작업 스레드에서 실행) ====================
+
+def _reserved(client: str, cost: int, func, *args):
+    """메모리 예산을 예약한 동안 func(*args)를 실행합니다."""
+    with memory_governor.reserve(client, cost):
+        return func(*args)
+
+
+def _convert_one_image(name: str, data, target: str, options: dict):
+    result = convert_images_parallel(
+        [(name, get_file_extension(name), data)], target, cache=conversion_cache, **options
+    )[0]
+    if not result.ok:
+        raise ValueError(result.error)
+    return result.data
+
+
+def _zip_images(output, files: list, target: str, options: dict, priorities: list, rejected: dict) -> None:
+    taken = {ERRORS_MEMBER}
+    with StreamingZipWriter(fileobj=output) as archive:
+        def collect(result):
+            if result.ok:
+                archive.add(_unique_name(replace_extension(result.name, target), taken), result.data)
+                result.data = None
+
+        results = convert_images_parallel(
+            files, target, on_result=collect, cache=conversion_cache, priorities=priorities, **options
+        )
+        failures = {**rejected, **{result.name: result.error for result in results if not result.ok}}
+        if len(failures) == len(results) + len(rejected):
+            raise ValueError("모든 파일 변환에 실패했습니다")
+        if failures:
+            archive.add(ERRORS_MEMBER, json.dumps(failures, ensure_ascii=False, indent=2).encode())
+
+
+def _zip_data(output, uploads: list, target: str, codec: Optional[str]) -> None:
+    workdir = tempfile.mkdtemp(prefix="converter-api-")
+    failures, taken = {}, {ERRORS_MEMBER}
+    try:
+        with StreamingZipWriter(fileobj=output) as archive:
+            for i, upload in enumerate(uploads):
+                name = _member_name(upload.filename, f"file{i}")
+                source_format = get_file_extension(name)
+                if source_format not in DATA_SOURCES[target]:
+                    failures[name] = f"{target}로 변환할 수 없는 형식입니다"
+                    continue
+                source = os.path.join(workdir, f"{i}.{source_format}")
+                destination = os.path.join(workdir, f"{i}.{target}")
+                with open(source, 'wb') as f:
+                    upload.file.seek(0)
+                    shutil.copyfileobj(upload.file, f)
+                upload.file.close()
+                try:
+                    convert_file(source, destination, target, codec)
+                except Exception as e:
+                    failures[name] = str(e) or type(e).__name__
+                    continue
+                finally:
+                    os.unlink(source)
+                archive.add_file(_unique_name(replace_extension(name, target), taken), destination)
+                os.unlink(destination)
+            if len(failures) == len(uploads):
+                raise ValueError("모든 파일 변환에 실패했습니다")
+            if failures:
+                archive.add(ERRORS_MEMBER, json.dumps(failures, ensure_ascii=False, indent=2).encode())
+    finally:
+        for upload in uploads:
+            upload.file.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _data_cost(size: int, source_format: str, target: str) -> int:
+    # convert_file은 CSV 원본과 XLSX → CSV를 일정한 메모리로 변환합니다
+    stream = source_format == 'csv' or (source_format == 'xlsx' and target == 'csv')
+    return estimate_data_cost(size, source_format, target, stream=stream)
+
+
+# ==================== 엔드포인트 ====================
+
+async def _finish(future):
+    """작업 결과를 기다리며 변환 실패를 422 응답으로 바꿉니다."""
+    try:
+        return await future
+    except (HTTPException, MemoryBudgetExceeded, JobQueueFull):
+        raise
+    except Exception as e:
+        logger.warning("변환 실패: %s", e, exc_info=True)
+        raise HTTPException(422, str(e) or type(e).__name__)
+
+
+async def _zip_response(ticket: _Ticket, filename: str, cost: int, func, *args) -> Response:
+    """func(output, *args)가 기록하는 ZIP을 변환되는 대로 보냅니다."""
+    pipe = _ResponsePipe(asyncio.get_running_loop())
+    ticket.run(pipe.produce, _reserved, ticket.client, cost, func, pipe, *args)
+    try:
+        first = await _finish(pipe.first())
+    except BaseException:
+        pipe.abort()
+        raise
+    return StreamingResponse(pipe.chunks(first), media_type=MIME_TYPES['zip'], headers=_attachment(filename))
+
+
+async def convert_image_endpoint(request: Request) -> Response:
+    target = _target(request, IMAGE_TARGETS)
+    options = _image_options(request, target)
+    name = _member_name(request.query_params.get("name"), "image")
+    client = _client(request)
+    with request.app.state.limiter.admit(client) as ticket:
+        # 본문은 SPOOL_BYTES까지만 메모리에 두고 나머지는 임시 파일에 내려 둡니다
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES) as spool:
+            size = await _receive(request, spool)
+            data = _mapped(spool, size)
+        probe = probe_image(name, data, target, **options)
+        if not probe.ok:
+            # 픽셀 한도를 넘거나 읽을 수 없는 파일은 디코딩하기 전에 거절합니다
+            raise HTTPException(413 if probe.format else 415, probe.error)
+        memory_governor.check(probe.memory)
+        result = await _finish(
+            ticket.run(_reserved, client, probe.memory, _convert_one_image, name, data, target, options)
+        )
+    return Response(result, media_type=MIME_TYPES[target], headers=_attachment(replace_extension(name, target)))
+
+
+async def convert_images_endpoint(request: Request) -> Response:
+    target = _target(request, IMAGE_TARGETS)
+    options = _image_options(request, target)
+    client = _client(request)
+    with request.app.state.limiter.admit(client) as ticket:
+        uploads = await _receive_files(request)
+        files, probes, rejected, status = [], [], {}, 415
+        for i, upload in enumerate(uploads):
+            name = _member_name(upload.filename, f"image{i}")
+            # 파일을 하나씩 열어 헤더만 읽으므로 모든 파일을 메모리에 올리지 않습니다
+            data = _mapped(upload.file, upload.size or 0)
+            await upload.close()
+            # 한도를 넘는 파일은 변환하지 않고 errors.json에 이유만 남깁니다
+            probe = probe_image(name, data, target, **options)
+            if not probe.ok:
+                rejected[name] = probe.error
+                status = 413 if probe.format else status
+                continue
+            files.append((name, get_file_extension(name), data))
+            probes.append(probe)
+        if not files:
+            raise HTTPException(status, next(iter(rejected.values())))
+        cost = estimate_batch_cost([probe.memory for probe in probes])
+        memory_governor.check(cost)
+        return await _zip_response(
+            ticket, "converted_images.zip", cost, _zip_images, files, target, options,
+            [probe.seconds for probe in probes], rejected,
+        )
+
+
+async def convert_data_endpoint(request: Request) -> Response:
+    target = _target(request, tuple(DATA_SOURCES))
+    codec = _data_codec(request, target)
+    source_format = request.query_params.get("from", "").lower()
+    name = request.query_params.get("name") or f"data.{source_format}"
+    source_format = source_format or get_file_extension(name)
+    _check_source(source_format, target, name)
+    client = _client(request)
+    with request.app.state.limiter.admit(client) as ticket:
+        workdir = tempfile.mkdtemp(prefix="converter-api-")
+        try:
+            source = os.path.join(workdir, f"source.{source_format}")
+            destination = os.path.join(workdir, f"result.{target}")
+            with open(source, 'wb') as f:
+                size = await _receive(request, f)
+            cost = _data_cost(size, source_format, target)
+            memory_governor.check(cost)
+            await _finish(ticket.run(_reserved, client, cost, convert_file, source, destination, target, codec))
+        except BaseException:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise
+    # 결과 파일을 조각으로 나눠 보내고 다 보낸 뒤 지웁니다
+    return FileResponse(
+        destination, media_type=MIME_TYPES[target], filename=replace_extension(name, target),
+        background=BackgroundTask(shutil.rmtree, workdir, ignore_errors=True),
+    )
+
+
+async def convert_data_batch_endpoint(request: Request) -> Response:
+    target = _target(request, tuple(DATA_SOURCES))
+    codec = _data_codec(request, target)
+    client = _client(request)
+    with request.app.state.limiter.admit(client) as ticket:
+        uploads = await _receive_files(request)
+        # 파일을 하나씩 변환하므로 가장 큰 파일 하나만큼 예약합니다
+        cost = max(
+            _data_cost(upload.size or 0, get_file_extension(upload.filename or ""), target) for upload in uploads
+        )
+        memory_governor.check(cost)
+        return await _zip_response(ticket, f"converted_{target}.zip", cost, _zip_data, uploads, target, codec)
+
+
+async def health(request: Request) -> Response:
+    return JSONResponse({
+        "status": "ok",
+        "requests": request.app.state.limiter.stats(),
+        "memory": memory_governor.stats(),
+    })
+
+
+async def metrics(request: Request) -> Response:
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+# ==================== 오류 응답 ====================
+
+async def _error(request: Request, status: int, message: str, headers: Optional[dict] = None) -> Response:
+    """
+    오류 응답을 만듭니다.
+
+    본문을 다 받기 전에 거절하면 연결이 끊겨 클라이언트가 응답을 읽지 못하므로,
+    남은 본문은 저장하지 않고 흘려 버립니다. 한도를 넘는 본문은 그대로 끊습니다.
+    """
+    declared = request.headers.get("content-length", "")
+    if not (declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES):
+        try:
+            async for _ in request.stream():
+                pass
+        except Exception:
+            pass
+    return JSONResponse({"error": message}, status_code=status, headers=headers)
+
+
+async def _http_error(request: Request, exc: HTTPException) -> Response:
+    return await _error(request, exc.status_code, exc.detail, exc.headers)
+
+
+async def _queue_full(request: Request, exc: JobQueueFull) -> Response:
+    return await _error(request, 429, str(exc), {"Retry-After": str(RETRY_AFTER)})
+
+
+async def _over_budget(request: Request, exc: MemoryBudgetExceeded) -> Response:
+    # 기다려도 예약할 수 없는 크기면 413, 자리가 나지 않아 기다리다 포기했으면 429
+    if exc.requested > memory_governor.session_budget:
+        return await _error(request, 413, str(exc))
+    return await _error(request, 429, str(exc), {"Retry-After": str(RETRY_AFTER)})
+
+
+def create_app(limiter: Optional[RequestLimiter] = None) -> Starlette:
+    """변환 API 앱을 만듭니다. limiter를 주지 않으면 환경 변수 설정으로 만듭니다."""
+    app = Starlette(
+        routes=[
+            Route("/convert/image", convert_image_endpoint, methods=["POST"]),
+            Route("/convert/images", convert_images_endpoint, methods=["POST"]),
+            Route("/convert/data", convert_data_endpoint, methods=["POST"]),
+            Route("/convert/data/batch", convert_data_batch_endpoint, methods=["POST"]),
+            Route("/health", health),
+            Route("/metrics", metrics),
+        ],
+        exception_handlers={
+            HTTPException: _http_error,
+            JobQueueFull: _queue_full,
+            MemoryBudgetExceeded: _over_budget,
+        },
+    )
+    app.state.limiter = limiter or RequestLimiter()
+    return app
+
+
+# `uvicorn converter.server:app`으로 실행할 때 쓰는 기본 앱
+app = create_app()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m converter.server", description="변환 HTTP API를 실행합니다.")
+    parser.add_argument("--host", default="127.0.0.1", help="받을 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8600, help="받을 포트 (기본값: 8600)")
+    parser.add_argument("-j", "--workers", type=int, default=API_WORKERS,
+                        help=f"동시에 변환하는 요청 수 (기본값: {API_WORKERS})")
+    parser.add_argument("--max-pending", type=int, default=API_MAX_PENDING,
+                        help=f"실행 중인 요청을 포함해 받아 둘 요청 수. 넘으면 429 (기본값: {API_MAX_PENDING})")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    import uvicorn
+
+    args = build_parser().parse_args(argv)
+    limiter = RequestLimiter(workers=args.workers, max_pending=args.max_pending)
+    logging.basicConfig(level=logging.INFO)
+    uvicorn.run(create_app(limiter), host=args.host, port=args.port, log_level="info")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
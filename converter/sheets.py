@@ -0,0 +1,152 @@
+"""
+Excel 여러 시트 변환
+통합 문서의 시트마다 CSV를 하나씩 만들어 ZIP 하나에 담습니다.
+시트는 프로세스 풀에서 병렬로 변환하고, 원본은 공유 메모리로 한 번만 넘깁니다.
+"""
+
+import os
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, Sequence
+
+import openpyxl
+
+from converter import metrics
+from converter.archive import StreamingZipWriter
+from converter.batch import BatchResult
+from converter.data import xlsx_to_csv_stream
+from converter.metrics import stage
+from converter.pool import BROKEN_POOL_ERROR, attach, free_payloads, get_pool, make_payload, reset_pool, submit_limited
+from converter.utils import MAX_WORKERS, as_file
+
+
+def list_sheets(data) -> list:
+    """통합 문서의 시트 이름을 순서대로 반환합니다 (셀은 읽지 않습니다)."""
+    workbook = openpyxl.load_workbook(as_file(data), read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def _sheet_to_file(data, sheet_name: str, encoding: str) -> str:
+    """시트 하나를 임시 CSV 파일로 기록하고 경로를 반환합니다."""
+    fd, path = tempfile.mkstemp(suffix='.csv')
+    try:
+        # 원본 파일 객체를 직접 닫아 공유 메모리 뷰를 바로 놓아줍니다
+        with os.fdopen(fd, 'wb') as output, as_file(data) as source:
+            with stage("sheet", "csv", bytes_in=memoryview(data).nbytes) as record:
+                record.bytes_out = xlsx_to_csv_stream(source, output, sheet_name=sheet_name, encoding=encoding)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _sheet_worker(payload, sheet_name: str, encoding: str) -> tuple:
+    """
+    워커 프로세스에서 실행되는 시트 변환 함수.
+
+    큰 CSV를 피클링해 돌려보내지 않도록 임시 파일 경로만 돌려보냅니다.
+
+    Returns:
+        (임시 파일 경로, 오류 메시지, 측정값 리스트)
+    """
+    path, error = None, None
+    with metrics.capture() as records, attach(payload) as data:
+        # 예외의 traceback이 공유 메모리 뷰를 붙잡지 않도록 attach 안에서 처리합니다
+        try:
+            path = _sheet_to_file(data, sheet_name, encoding)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+    return path, error, records
+
+
+def sheets_to_csv_zip(
+    data,
+    archive: StreamingZipWriter,
+    sheet_names: Optional[Sequence[str]] = None,
+    encoding: str = 'utf-8-sig',
+    max_workers: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int, str], None]] = None,
+    priorities: Optional[Sequence[float]] = None,
+) -> list:
+    """
+    여러 시트를 각각 CSV로 변환해 archive에 '시트이름.csv'로 추가합니다.
+
+    Args:
+        data: XLSX 바이트 데이터 (bytes 또는 memoryview)
+        archive: CSV를 추가할 StreamingZipWriter
+        sheet_names: 변환할 시트 이름 (None이면 모든 시트)
+        encoding: CSV 인코딩
+        max_workers: 최대 워커 수 (None이면 MAX_WORKERS)
+        on_progress: (완료 수, 전체 수, 시트 이름)을 받는 진행률 콜백
+        priorities: 시트별 예상 변환 시간이나 셀 수 (converter.probe). 주면 큰 시트부터
+            워커에 보냅니다. ZIP 안의 순서는 그대로 시트 순서입니다.
+
+    Returns:
+        시트 순서대로 정렬된 BatchResult 리스트 (data는 항상 None)
+    """
+    if sheet_names is None:
+        sheet_names = list_sheets(data)
+    total = len(sheet_names)
+    results = [BatchResult(index=i, name=name) for i, name in enumerate(sheet_names)]
+    paths = {}
+    done = 0
+    order = list(range(total))
+    if priorities is not None:
+        order.sort(key=lambda idx: priorities[idx], reverse=True)
+
+    def finish(idx: int, path: Optional[str]) -> None:
+        nonlocal done
+        done += 1
+        if on_progress:
+            on_progress(done, total, results[idx].name)
+        if path is not None:
+            paths[idx] = path
+
+    workers = min(max_workers or MAX_WORKERS, MAX_WORKERS, total)
+    pool = None
+    segments = []
+    try:
+        if workers <= 1:
+            for idx in order:
+                name = sheet_names[idx]
+                path = None
+                try:
+                    path = _sheet_to_file(data, name, encoding)
+                except Exception as e:
+                    results[idx].error = str(e) or type(e).__name__
+                finish(idx, path)
+        else:
+            # 모든 워커가 같은 원본을 읽으므로 공유 메모리에 한 번만 복사합니다
+            pool = get_pool()
+            payload = make_payload(data, segments)
+            jobs = ((idx, (payload, sheet_names[idx], encoding)) for idx in order)
+            for idx, future in submit_limited(pool, _sheet_worker, jobs, workers):
+                path = None
+                try:
+                    path, results[idx].error, records = future.result()
+                    metrics.registry.merge(records)
+                except BrokenProcessPool:
+                    results[idx].error = BROKEN_POOL_ERROR
+                except Exception as e:
+                    results[idx].error = str(e) or type(e).__name__
+                finish(idx, path)
+
+        # 워커가 끝나는 순서와 관계없이 ZIP 안의 순서는 시트 순서를 따릅니다
+        for idx in sorted(paths):
+            with stage("zip", "csv"):
+                archive.add_file(f"{results[idx].name}.csv", paths[idx])
+    except BrokenProcessPool:
+        for result in results:
+            if result.error is None and result.index not in paths:
+                result.error = BROKEN_POOL_ERROR
+    finally:
+        for path in paths.values():
+            os.unlink(path)
+        free_payloads(segments)
+
+    if pool is not None and any(r.error == BROKEN_POOL_ERROR for r in results):
+        reset_pool(pool)
+    return results
@@ -0,0 +1,173 @@
+"""
+CSV 인코딩·구분자 감지
+파일 앞부분 샘플만 보고 읽기 설정을 정해, 본문은 한 번만 파싱합니다.
+"""
+
+import codecs
+import csv
+import re
+from dataclasses import dataclass, field
+
+
+# 감지에 사용하는 샘플 크기 (바이트)
+SNIFF_SAMPLE_BYTES = 64 * 1024
+
+# 앞부분이 모두 ASCII일 때 비ASCII 바이트를 찾아보는 범위 (바이트).
+# 이 안에서 찾지 못하면 앞부분 샘플로 고르고, 틀렸으면 읽을 때 다음 후보로 다시 읽습니다.
+SNIFF_SCAN_BYTES = 4 * 1024 * 1024
+
+# 시도할 인코딩 순서 (cp949는 euc-kr의 상위 집합이라 euc-kr은 따로 시도하지 않습니다)
+CANDIDATE_ENCODINGS = ('utf-8', 'cp949')
+
+# 감지 대상 구분자
+CANDIDATE_DELIMITERS = ',;\t|'
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+_NUMBER = re.compile(r'^\s*[-+]?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?\s*$')
+
+
+@dataclass
+class CsvDialect:
+    """감지된 CSV 읽기 설정."""
+    encoding: str = 'utf-8'
+    delimiter: str = ','
+    quotechar: str = '"'
+    has_header: bool = True
+    # 인코딩 후보 중 샘플을 해석하지 못해 제외된 것들
+    rejected_encodings: list = field(default_factory=list)
+
+    def read_csv_kwargs(self) -> dict:
+        """pandas.read_csv에 넘길 인자를 반환합니다."""
+        return {
+            'encoding': self.encoding,
+            'sep': self.delimiter,
+            'quotechar': self.quotechar,
+            'header': 0 if self.has_header else None,
+        }
+
+
+def _sample_window(view: memoryview, sample_bytes: int) -> bytes:
+    """
+    인코딩 판별용 샘플을 고릅니다.
+
+    앞부분이 모두 ASCII면 어떤 인코딩으로도 해석되므로, SNIFF_SCAN_BYTES 안에서 처음 나오는
+    비ASCII 바이트 주변을 함께 봅니다 (파싱 없이 바이트만 훑습니다).
+    """
+    head = bytes(view[:sample_bytes])
+    if not head.isascii() or len(view) <= sample_bytes:
+        return head
+    match = _NON_ASCII.search(view[:SNIFF_SCAN_BYTES])
+    if match is None:
+        return head
+    start = max(match.start() - 16, 0)
+    return bytes(view[start:start + sample_bytes])
+
+
+def detect_encoding(data, sample_bytes: int = SNIFF_SAMPLE_BYTES) -> tuple:
+    """
+    샘플을 디코딩해 보고 인코딩을 고릅니다.
+
+    Returns:
+        (인코딩, 제외된 인코딩 리스트)
+    """
+    view = memoryview(data).cast('B')
+    for bom, encoding in _BOMS:
+        if bytes(view[:len(bom)]) == bom:
+            return encoding, []
+
+    sample = _sample_window(view, sample_bytes)
+    rejected = []
+    for encoding in CANDIDATE_ENCODINGS:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않습니다
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            decoder.decode(sample, final=False)
+        except UnicodeDecodeError:
+            rejected.append(encoding)
+            continue
+        return encoding, rejected
+    return CANDIDATE_ENCODINGS[0], rejected
+
+
+def read_with_fallback(read, read_options: dict, rewind=None):
+    """
+    read(read_options)를 실행하고, 샘플로 고른 인코딩이 뒤쪽 바이트를 해석하지 못하면
+    CANDIDATE_ENCODINGS의 다음 후보로 바꿔 다시 실행합니다.
+
+    Args:
+        read: 읽기 설정 dict를 받아 파일을 읽는 함수
+        read_options: CsvDialect.read_csv_kwargs()와 같은 읽기 설정
+        rewind: 다시 읽기 전에 부를 함수 (원본을 처음으로 돌리고 쓰다 만 결과를 지우는 등)
+
+    Raises:
+        UnicodeDecodeError: 남은 후보로도 읽지 못했을 때
+    """
+    encoding = read_options.get('encoding') or CANDIDATE_ENCODINGS[0]
+    names = [codecs.lookup(candidate).name for candidate in CANDIDATE_ENCODINGS]
+    try:
+        position = names.index(codecs.lookup(encoding).name)
+    except (LookupError, ValueError):
+        # 직접 고른 다른 인코딩이면 다시 시도하지 않습니다
+        return read(read_options)
+    for fallback in CANDIDATE_ENCODINGS[position + 1:]:
+        try:
+            return read(read_options)
+        except UnicodeDecodeError:
+            read_options = {**read_options, 'encoding': fallback}
+            if rewind is not None:
+                rewind()
+    return read(read_options)
+
+
+def _looks_like_header(sniffer: csv.Sniffer, text: str, delimiter: str) -> bool:
+    """첫 행에 숫자 값이 있고 Sniffer도 헤더가 아니라고 볼 때만 헤더 없음으로 판단합니다."""
+    first_line = text.split('\n', 1)[0]
+    first_row = next(csv.reader([first_line], delimiter=delimiter), [])
+    if not any(_NUMBER.match(value) for value in first_row):
+        return True
+    try:
+        return sniffer.has_header(text)
+    except csv.Error:
+        return True
+
+
+def sniff_csv(data, sample_bytes: int = SNIFF_SAMPLE_BYTES) -> CsvDialect:
+    """
+    CSV 앞부분 샘플로 인코딩, 구분자, 따옴표, 헤더 여부를 감지합니다.
+
+    Args:
+        data: CSV 바이트 데이터 (bytes 또는 memoryview)
+        sample_bytes: 감지에 사용할 샘플 크기
+
+    Returns:
+        CsvDialect
+    """
+    encoding, rejected = detect_encoding(data, sample_bytes)
+    view = memoryview(data).cast('B')
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    text = decoder.decode(bytes(view[:sample_bytes]), final=False)
+
+    # 샘플 끝의 잘린 행은 버립니다
+    if len(view) > sample_bytes and '\n' in text:
+        text = text[:text.rindex('\n') + 1]
+    text = text.lstrip('\ufeff')
+
+    dialect = CsvDialect(encoding=encoding, rejected_encodings=rejected)
+    if not text.strip():
+        return dialect
+
+    sniffer = csv.Sniffer()
+    try:
+        sniffed = sniffer.sniff(text, delimiters=CANDIDATE_DELIMITERS)
+        dialect.delimiter = sniffed.delimiter
+        dialect.quotechar = sniffed.quotechar or '"'
+    except csv.Error:
+        pass
+    dialect.has_header = _looks_like_header(sniffer, text, dialect.delimiter)
+    return dialect
@@ -0,0 +1,67 @@
+"""
+미리보기용 썸네일 생성
+원본 해상도와 관계없이 작은 이미지만 디코딩·인코딩해 화면에 보냅니다.
+"""
+
+import io
+
+from PIL import Image
+
+from converter.cache import ConversionCache, make_cache_key
+from converter.image import downscale, fit_size, has_alpha
+from converter.utils import as_file
+
+
+# 썸네일의 긴 변 최대 길이 (px)
+THUMBNAIL_MAX_SIZE = 320
+
+# 썸네일 전용 캐시 (변환 결과 캐시와 예산을 나눠 씁니다)
+thumbnail_cache = ConversionCache(max_bytes=32 * 1024 * 1024)
+
+
+
+def render_thumbnail(data, max_size: int = THUMBNAIL_MAX_SIZE) -> bytes:
+    """
+    축소 디코딩으로 썸네일을 만듭니다.
+
+    Args:
+        data: 원본 이미지 바이트 데이터 (bytes 또는 memoryview)
+        max_size: 썸네일의 긴 변 최대 길이
+
+    Returns:
+        썸네일 이미지 바이트 데이터 (투명도가 있으면 PNG, 아니면 JPEG)
+    """
+    img = Image.open(as_file(data))
+    alpha = has_alpha(img)
+
+    # JPEG는 DCT 스케일링으로 1/2, 1/4, 1/8 크기로 바로 디코딩합니다
+    img.draft('RGB', (max_size, max_size))
+    display_mode = 'RGBA' if alpha else 'RGB'
+
+    target_size = fit_size(img.size, max_size)
+    if target_size is not None:
+        img = downscale(img, target_size, display_mode)
+    elif img.mode != display_mode:
+        img = img.convert(display_mode)
+
+    output_buffer = io.BytesIO()
+    if alpha:
+        img.save(output_buffer, format='PNG', compress_level=1)
+    else:
+        img.save(output_buffer, format='JPEG', quality=80)
+    return output_buffer.getvalue()
+
+
+def make_thumbnail(data, max_size: int = THUMBNAIL_MAX_SIZE) -> bytes:
+    """
+    내용 해시로 캐시된 썸네일을 반환합니다.
+
+    Args:
+        data: 원본 이미지 바이트 데이터 (bytes 또는 memoryview)
+        max_size: 썸네일의 긴 변 최대 길이
+
+    Returns:
+        썸네일 이미지 바이트 데이터
+    """
+    key = make_cache_key(data, "THUMBNAIL", max_size=max_size)
+    return thumbnail_cache.get_or_compute(key, lambda: render_thumbnail(data, max_size))
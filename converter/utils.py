@@ -0,0 +1,119 @@
+"""
+공용 유틸리티
+무거운 라이브러리를 가져오지 않으므로 CLI 시작 시간에 영향을 주지 않습니다.
+"""
+
+import io
+import os
+from typing import Optional
+
+
+# 배포 환경별 최대 워커 수 (CONVERTER_MAX_WORKERS 환경 변수로 제한)
+MAX_WORKERS = int(os.environ.get("CONVERTER_MAX_WORKERS", 0)) or (os.cpu_count() or 1)
+
+# 이미지 한 장의 최대 픽셀 수 (기본값: 1억 화소, RGBA로 약 400 MB).
+# converter.probe가 디코딩하기 전에 거절하는 한도이자, converter.image가 Pillow의
+# Image.MAX_IMAGE_PIXELS(디컴프레션 폭탄 검사)에 넣는 값입니다.
+MAX_IMAGE_PIXELS = int(os.environ.get("CONVERTER_MAX_IMAGE_PIXELS", 100_000_000))
+
+
+def env_megabytes(name: str, default: int) -> int:
+    """MB 단위 환경 변수를 바이트로 읽습니다. 없으면 default(바이트)를 반환합니다."""
+    value = os.environ.get(name)
+    return int(value) * 1024 * 1024 if value else default
+
+
+def format_bytes(size: int) -> str:
+    """바이트 수를 오류 메시지에 쓰는 'N MB' 문자열로 바꿉니다."""
+    return f"{size / 1024 / 1024:,.0f} MB"
+
+
+def get_file_extension(filename: str) -> str:
+    """파일명에서 확장자를 추출합니다."""
+    return filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+
+
+# 파일 첫 바이트 시그니처 → 형식 (확장자 이름)
+_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'II*\x00', 'tiff'),
+    (b'MM\x00*', 'tiff'),
+    (b'BM', 'bmp'),
+)
+
+
+def detect_format(data) -> Optional[str]:
+    """
+    확장자 대신 파일 앞부분의 시그니처로 이미지 형식을 알아냅니다.
+
+    Returns:
+        'png', 'jpg', 'webp', 'gif', 'tiff', 'bmp' 중 하나. 알 수 없으면 None
+    """
+    head = bytes(memoryview(data).cast('B')[:16])
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'webp'
+    for signature, fmt in _SIGNATURES:
+        if head.startswith(signature):
+            return fmt
+    return None
+
+
+def replace_extension(filename: str, extension: str) -> str:
+    """파일명의 확장자를 바꿉니다."""
+    return filename.rsplit('.', 1)[0] + '.' + extension.lower()
+
+
+class MemoryReader(io.RawIOBase):
+    """
+    bytes/memoryview 위에서 동작하는 읽기 전용 파일 객체.
+    
+    io.BytesIO는 memoryview를 받으면 전체를 복사하므로, 공유 메모리처럼
+    큰 버퍼를 복사 없이 Pillow에 넘길 때 사용합니다.
+    """
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast('B')
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        end = min(self._pos + len(b), len(self._view))
+        size = end - self._pos
+        b[:size] = self._view[self._pos:end]
+        self._pos = end
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = len(self._view) + offset
+        else:
+            raise ValueError(f"잘못된 whence 값: {whence}")
+        self._pos = max(self._pos, 0)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        self._view.release()
+        super().close()
+
+
+def as_file(data):
+    """바이트 데이터를 Pillow/pandas가 읽을 수 있는 파일 객체로 감쌉니다."""
+    if isinstance(data, bytes):
+        # bytes는 BytesIO가 복사 없이 공유합니다
+        return io.BytesIO(data)
+    return MemoryReader(data)
@@ -0,0 +1,9 @@
+"""
+pytest 공용 설정
+저장소 루트에서 `python -m pytest`로 실행합니다.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,100 @@
+"""converter.data: 스트리밍 CSV↔XLSX 변환이 전체 파싱 변환과 같은 결과를 내는지 확인합니다."""
+
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+from converter.data import convert_data, csv_to_xlsx_stream, iter_xlsx_to_csv
+
+
+def _csv(rows: int = 250) -> bytes:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(rows),
+        'value': rng.normal(size=rows).round(4),
+        'name': [f"항목 {i % 17}" for i in range(rows)],
+        'flag': rng.integers(0, 2, size=rows).astype(bool),
+    })
+    df.loc[::7, 'value'] = np.nan
+    return df.to_csv(index=False).encode()
+
+
+def _read_sheets(buffer) -> list:
+    buffer.seek(0)
+    return list(pd.read_excel(buffer, sheet_name=None, engine='openpyxl').values())
+
+
+def test_csv_to_xlsx_stream_matches_full_conversion():
+    data = _csv()
+    expected = _read_sheets(io.BytesIO(convert_data(data, 'csv', 'xlsx')))
+    output = io.BytesIO()
+    # 블록 경계를 여러 번 지나도록 작은 청크로 읽습니다
+    result = csv_to_xlsx_stream(io.BytesIO(data), output, chunk_rows=40)
+    assert result == {'rows': 250, 'sheets': 1}
+    pd.testing.assert_frame_equal(_read_sheets(output)[0], expected[0])
+
+
+def test_csv_to_xlsx_stream_continues_on_new_sheets():
+    data = _csv()
+    output = io.BytesIO()
+    result = csv_to_xlsx_stream(io.BytesIO(data), output, chunk_rows=40, max_rows_per_sheet=101)
+    assert result == {'rows': 250, 'sheets': 3}
+    sheets = _read_sheets(output)
+    assert [len(sheet) for sheet in sheets] == [100, 100, 50]
+    # 새 시트마다 헤더를 반복합니다
+    combined = pd.concat(sheets, ignore_index=True)
+    pd.testing.assert_frame_equal(combined, pd.read_csv(io.BytesIO(data)))
+
+
+def test_iter_xlsx_to_csv_matches_to_csv():
+    df = pd.DataFrame({
+        'n': [1, 2, 3],
+        'x': [1.5, None, 3.25],
+        's': ['a', None, '다'],
+        'date': pd.to_datetime(['2024-01-01', '2024-02-03', None]),
+        'time': pd.to_datetime(['2024-01-01 10:00:00', '2024-01-02 11:30:00', '2024-01-03 12:00:00']),
+    })
+    source = io.BytesIO()
+    df.to_excel(source, index=False)
+    expected = convert_data(source.getvalue(), 'xlsx', 'csv')
+
+    source.seek(0)
+    streamed = b''.join(iter_xlsx_to_csv(source, chunk_bytes=16))
+    assert streamed.decode('utf-8-sig').replace('\r\n', '\n') == expected.decode('utf-8-sig').replace('\r\n', '\n')
+
+
+def test_iter_xlsx_to_csv_names_blank_headers_and_drops_trailing_blank_rows():
+    source = io.BytesIO()
+    pd.DataFrame([[1, 2, 3], [None, None, None], [4, 5, 6], [None, None, None]],
+                 columns=['a', None, 'c']).to_excel(source, index=False)
+    source.seek(0)
+    text = b''.join(iter_xlsx_to_csv(source)).decode('utf-8-sig').splitlines()
+    assert text == ['a,Unnamed: 1,c', '1,2,3', ',,', '4,5,6']
+
+
+def _workbook(rows) -> bytes:
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def _assert_same_as_full_parse(data: bytes):
+    expected = convert_data(data, 'xlsx', 'csv').decode('utf-8-sig').replace('\r\n', '\n')
+    streamed = b''.join(iter_xlsx_to_csv(io.BytesIO(data))).decode('utf-8-sig').replace('\r\n', '\n')
+    assert streamed == expected
+    return streamed.splitlines()
+
+
+def test_iter_xlsx_to_csv_mangles_duplicate_headers():
+    lines = _assert_same_as_full_parse(_workbook([['a', 'a', 'a.1', None, None], ['x', 'y', 'z', 'u', 'v']]))
+    assert lines[0] == 'a,a.2,a.1,Unnamed: 3,Unnamed: 4'
+
+
+def test_iter_xlsx_to_csv_extends_header_to_widest_row():
+    lines = _assert_same_as_full_parse(_workbook([['a', 'b'], ['p', 'q'], ['r', 's', 't', None, 'u']]))
+    assert lines == ['a,b,Unnamed: 2,Unnamed: 3,Unnamed: 4', 'p,q,,,', 'r,s,t,,u']
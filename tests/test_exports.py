@@ -0,0 +1,18 @@
+"""converter 패키지: 지연 가져오기 목록의 모든 이름이 실제로 있는지 확인합니다."""
+
+import importlib
+
+import pytest
+
+import converter
+
+
+@pytest.mark.parametrize('name', converter.__all__)
+def test_every_export_resolves(name):
+    assert getattr(converter, name) is getattr(importlib.import_module(converter._EXPORTS[name]), name)
+
+
+def test_star_import():
+    namespace = {}
+    exec("from converter import *", namespace)
+    assert set(converter.__all__) <= set(namespace)
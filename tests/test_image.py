@@ -0,0 +1,67 @@
+"""converter.image: 원본을 그대로 돌려주는 조건(can_passthrough)을 확인합니다."""
+
+import io
+
+import pytest
+from PIL import Image
+
+from converter.image import DEFAULT_PRESET, can_passthrough, convert_image
+
+
+def _encode(fmt: str, size=(64, 48), mode: str = 'RGB') -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, 'red').save(buffer, fmt)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope='module')
+def jpeg() -> bytes:
+    return _encode('JPEG')
+
+
+@pytest.mark.parametrize('target', ['jpg', 'JPG', 'jpeg', 'JPEG'])
+def test_same_format_without_options_passes_through(jpeg, target):
+    assert can_passthrough(jpeg, target)
+
+
+def test_default_preset_passes_through(jpeg):
+    assert can_passthrough(jpeg, 'jpg', preset=DEFAULT_PRESET)
+
+
+@pytest.mark.parametrize('options', [
+    {'preset': 'smallest'},
+    {'preset': 'fastest'},
+    {'encoder_options': {'quality': 95}},
+    {'preset': DEFAULT_PRESET, 'encoder_options': {'progressive': True}},
+])
+def test_encoder_settings_force_reencoding(jpeg, options):
+    assert not can_passthrough(jpeg, 'jpg', **options)
+
+
+def test_format_comes_from_signature_not_target(jpeg):
+    assert not can_passthrough(jpeg, 'png')
+    assert not can_passthrough(jpeg, 'webp')
+    assert can_passthrough(_encode('PNG'), 'png')
+    assert can_passthrough(_encode('WEBP'), 'webp')
+
+
+@pytest.mark.parametrize('max_size, scale, expected', [
+    (64, None, True),      # 긴 변이 이미 한도 안
+    (1000, None, True),
+    (32, None, False),     # 줄여야 함
+    (None, 1.0, True),
+    (None, 0.5, False),
+])
+def test_resize_checks_header_size(jpeg, max_size, scale, expected):
+    assert can_passthrough(jpeg, 'jpg', max_size=max_size, scale=scale) is expected
+
+
+def test_unreadable_data_does_not_pass_through():
+    assert not can_passthrough(b'not an image', 'jpg')
+    # 시그니처만 맞고 헤더가 깨진 파일은 크기를 확인할 수 없으므로 변환 단계에서 오류를 냅니다
+    assert not can_passthrough(b'\xff\xd8\xff' + b'\x00' * 16, 'jpg', max_size=10)
+
+
+def test_convert_image_returns_original_only_when_passing_through(jpeg):
+    assert convert_image(jpeg, 'jpg', 'jpg') == jpeg
+    assert convert_image(jpeg, 'jpg', 'jpg', preset='smallest') != jpeg
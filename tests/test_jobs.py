@@ -0,0 +1,171 @@
+"""converter.jobs: 작업이 실패해도 작업 스레드와 메모리 예약이 남지 않는지 확인합니다."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from converter import jobs
+from converter.governor import MemoryBudgetExceeded, MemoryGovernor
+from converter.jobs import DONE, FAILED, JobManager, JobOutput, JobQueueFull
+
+
+def _wait(job, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while job.active:
+        assert time.monotonic() < deadline, f"작업이 끝나지 않았습니다: {job}"
+        time.sleep(0.01)
+
+
+def _write(content: bytes = b"ok"):
+    def func(output, progress):
+        output.write(content)
+        return JobOutput(file_name="result.bin", mime="application/octet-stream")
+    return func
+
+
+@pytest.fixture
+def governor() -> MemoryGovernor:
+    return MemoryGovernor(budget=100, session_budget=100)
+
+
+@pytest.fixture
+def manager(governor, tmp_path) -> JobManager:
+    return JobManager(workers=1, governor=governor, directory=str(tmp_path), admission_timeout=0.3)
+
+
+def test_successful_job_keeps_result_and_releases_memory(manager, governor):
+    job = manager.submit("s1", "data", "ok", _write(b"hello"), cost=60)
+    _wait(job)
+    assert job.status == DONE
+    assert job.read() == b"hello"
+    assert governor.stats()["reserved"] == 0
+
+
+def test_failing_function_marks_job_failed_and_releases_memory(manager, governor, tmp_path):
+    def broken(output, progress):
+        output.write(b"partial")
+        raise ValueError("깨진 파일")
+
+    job = manager.submit("s1", "data", "broken", broken, cost=60)
+    _wait(job)
+    assert job.status == FAILED
+    assert job.error == "깨진 파일"
+    assert job.func is None
+    assert governor.stats()["reserved"] == 0
+    # 실패한 작업의 부분 결과는 남기지 않습니다
+    assert list(tmp_path.iterdir()) == []
+
+    # 작업 스레드는 살아 있어 다음 작업을 실행합니다
+    after = manager.submit("s1", "data", "after", _write(), cost=60)
+    _wait(after)
+    assert after.status == DONE
+    assert manager.stats()["failed"] == 1
+    assert manager.stats()["completed"] == 1
+
+
+def test_temp_file_error_fails_job_without_killing_worker(manager, governor):
+    with mock.patch("converter.jobs.tempfile.mkstemp", side_effect=OSError("디스크가 가득 찼습니다")):
+        job = manager.submit("s1", "data", "no-disk", _write(), cost=60)
+        _wait(job)
+    assert job.status == FAILED
+    assert "디스크" in job.error
+    assert governor.stats()["reserved"] == 0
+
+    after = manager.submit("s1", "data", "after", _write(), cost=60)
+    _wait(after)
+    assert after.status == DONE
+
+
+def test_cost_over_session_budget_is_rejected_on_submit(manager):
+    with pytest.raises(MemoryBudgetExceeded):
+        manager.submit("s1", "image", "huge", _write(), cost=1000)
+    assert manager.stats()["queued"] == 0
+
+
+def test_job_waiting_for_memory_fails_after_admission_timeout(governor, tmp_path):
+    manager = JobManager(workers=2, governor=governor, directory=str(tmp_path), admission_timeout=0.3)
+    release = threading.Event()
+
+    def hold(output, progress):
+        release.wait(10)
+        return _write()(output, progress)
+
+    holder = manager.submit("s1", "image", "holder", hold, cost=80)
+    deadline = time.monotonic() + 5
+    while holder.status != jobs.RUNNING:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    # 다른 세션의 작은 작업은 큰 작업이 기다리는 동안에도 먼저 실행됩니다
+    waiting = manager.submit("s2", "image", "waiting", _write(), cost=50)
+    small = manager.submit("s3", "image", "small", _write(), cost=20)
+    _wait(small)
+    assert small.status == DONE
+
+    _wait(waiting)
+    release.set()
+    _wait(holder)
+    assert waiting.status == FAILED
+    assert waiting.error
+    assert holder.status == DONE
+    assert governor.stats()["reserved"] == 0
+
+
+def test_session_queue_limit(manager, monkeypatch):
+    monkeypatch.setattr(jobs, "MAX_PENDING_PER_SESSION", 1)
+    release = threading.Event()
+
+    def hold(output, progress):
+        release.wait(10)
+        return _write()(output, progress)
+
+    first = manager.submit("s1", "data", "first", hold)
+    try:
+        with pytest.raises(JobQueueFull):
+            manager.submit("s1", "data", "second", _write())
+        # 다른 세션은 받을 수 있습니다
+        other = manager.submit("s2", "data", "other", _write())
+    finally:
+        release.set()
+    _wait(first)
+    _wait(other)
+    assert first.status == DONE and other.status == DONE
+
+
+def test_discard_cancels_queued_job(governor, tmp_path):
+    manager = JobManager(workers=1, governor=governor, directory=str(tmp_path))
+    release = threading.Event()
+
+    def hold(output, progress):
+        release.wait(10)
+        return _write()(output, progress)
+
+    running = manager.submit("s1", "data", "running", hold)
+    queued = manager.submit("s1", "data", "queued", _write())
+    manager.discard(queued.id)
+    release.set()
+    _wait(running)
+    assert manager.get(queued.id) is None
+    assert running.status == DONE
+
+
+def test_done_job_is_complete_when_first_seen(manager, governor):
+    # 화면은 잠금 없이 status만 보고 결과 필드를 읽으므로 DONE이 보일 때는 모두 채워져 있어야 합니다
+    job = manager.submit("s1", "data", "ok", _write(b"hello"), cost=60)
+    deadline = time.monotonic() + 10
+    while job.status != DONE:
+        assert job.status != FAILED and time.monotonic() < deadline
+    assert job.finished is not None
+    assert job.path and job.size == 5 and job.output is not None
+    assert job.func is None
+    assert governor.stats()["reserved"] == 0
+
+
+def test_function_without_output_fails(manager, tmp_path):
+    job = manager.submit("s1", "data", "none", lambda output, progress: None)
+    _wait(job)
+    assert job.status == FAILED
+    assert job.error
+    assert list(tmp_path.iterdir()) == []
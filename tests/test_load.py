@@ -0,0 +1,17 @@
+"""benchmarks.load: 화면 없는 direct 모드로 세션 하나가 시나리오를 끝까지 도는지 확인합니다."""
+
+from benchmarks.load import OPERATIONS, _format_level, run_level
+
+
+def test_direct_mode_single_session(tmp_path, monkeypatch):
+    # run_level이 캐시를 끄려고 바꾸는 환경 변수를 테스트가 끝나면 되돌립니다
+    monkeypatch.setenv('CONVERTER_CACHE_BYTES', '0')
+    options = {'cache': False, 'cache_dir': str(tmp_path), 'csv_rows': 500, 'xlsx_rows': 200}
+
+    result = run_level('direct', 1, 1, options)
+
+    assert result['errors'] == []
+    assert result['failed'] == 0
+    assert result['latency']['count'] == len(OPERATIONS)
+    assert all(result['operations'][operation]['count'] == 1 for operation in OPERATIONS)
+    assert _format_level(result)
@@ -0,0 +1,78 @@
+"""converter.sniff: 샘플로 고른 인코딩이 틀려도 다음 후보로 다시 읽는지 확인합니다."""
+
+import io
+
+import pandas as pd
+import pytest
+
+from converter import sniff
+from converter.data import csv_to_xlsx_stream, read_dataframe
+from converter.sniff import CANDIDATE_ENCODINGS, detect_encoding, read_with_fallback, sniff_csv
+
+
+def _ascii_prefixed_cp949(ascii_rows: int) -> bytes:
+    lines = ["id,name"] + [f"{i},item{i}" for i in range(ascii_rows)] + [f"{ascii_rows},한글"]
+    return ("\n".join(lines) + "\n").encode('cp949')
+
+
+def test_detects_cp949_after_ascii_prefix():
+    data = _ascii_prefixed_cp949(10_000)
+    assert len(data) > sniff.SNIFF_SAMPLE_BYTES
+    assert detect_encoding(data)[0] == 'cp949'
+
+
+def test_scan_for_non_ascii_is_bounded(monkeypatch):
+    data = _ascii_prefixed_cp949(10_000)
+    monkeypatch.setattr(sniff, 'SNIFF_SCAN_BYTES', sniff.SNIFF_SAMPLE_BYTES)
+    # 한도 밖의 한글은 보지 않으므로 앞부분만 보고 utf-8로 고릅니다
+    assert detect_encoding(data)[0] == 'utf-8'
+
+
+def test_read_falls_back_when_sample_guess_is_wrong(monkeypatch):
+    data = _ascii_prefixed_cp949(10_000)
+    monkeypatch.setattr(sniff, 'SNIFF_SCAN_BYTES', sniff.SNIFF_SAMPLE_BYTES)
+    options = sniff_csv(data).read_csv_kwargs()
+    assert options['encoding'] == 'utf-8'
+    df = read_dataframe(data, 'csv', **options)
+    assert df['name'].iloc[-1] == '한글'
+
+
+def test_stream_fallback_rewinds_partial_output(monkeypatch):
+    data = _ascii_prefixed_cp949(10_000)
+    monkeypatch.setattr(sniff, 'SNIFF_SCAN_BYTES', sniff.SNIFF_SAMPLE_BYTES)
+    source, output = io.BytesIO(data), io.BytesIO()
+
+    def rewind():
+        source.seek(0)
+        output.seek(0)
+        output.truncate()
+
+    result = read_with_fallback(
+        lambda options: csv_to_xlsx_stream(source, output, chunk_rows=1000, **options),
+        sniff_csv(data).read_csv_kwargs(), rewind,
+    )
+    assert result['rows'] == 10_001
+    output.seek(0)
+    assert pd.read_excel(output)['name'].iloc[-1] == '한글'
+
+
+def test_undecodable_data_still_raises():
+    data = b"id,name\n1," + bytes([0x80, 0xff, 0xff]) + b"\n"
+    with pytest.raises(UnicodeDecodeError):
+        read_with_fallback(lambda options: pd.read_csv(io.BytesIO(data), **options), {'encoding': 'utf-8'})
+
+
+def test_explicit_other_encoding_is_not_retried():
+    calls = []
+
+    def read(options):
+        calls.append(options['encoding'])
+        raise UnicodeDecodeError('latin-1', b'', 0, 1, 'test')
+
+    with pytest.raises(UnicodeDecodeError):
+        read_with_fallback(read, {'encoding': 'utf-16'})
+    assert calls == ['utf-16']
+
+
+def test_candidates_have_no_unreachable_subset():
+    assert 'euc-kr' not in CANDIDATE_ENCODINGS
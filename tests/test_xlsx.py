@@ -0,0 +1,125 @@
+"""converter.xlsx: 빠른 XLSX 작성기가 to_excel과 같은 내용을 쓰는지 확인합니다."""
+
+import io
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from converter.data import csv_to_xlsx_stream, merge_csvs_to_xlsx
+from converter.xlsx import write_xlsx
+
+
+def _mixed_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'int': [1, -2, 3, 40_000_000_000],
+        'float': [1.5, np.nan, -0.25, 1e-9],
+        'bool': [True, False, True, False],
+        'text': ['가나다', 'line\nbreak', ' 앞 공백', 'tab\tand <xml> & "quote"'],
+        'shared': ['a', 'b', 'a', None],
+        'date': pd.to_datetime(['2024-01-01', '2024-02-29', None, '1999-12-31']),
+        'datetime': pd.to_datetime(['2024-01-01 10:00:00', '2024-01-02 23:59:59', '2024-01-03 00:00:00', None]),
+        'mixed': [1, 'two', 3.5, None],
+    })
+
+
+def _round_trip(write) -> pd.DataFrame:
+    buffer = io.BytesIO()
+    write(buffer)
+    buffer.seek(0)
+    return pd.read_excel(buffer, engine='openpyxl')
+
+
+def test_write_xlsx_matches_to_excel():
+    df = _mixed_frame()
+    expected = _round_trip(lambda out: df.to_excel(out, index=False, engine='xlsxwriter'))
+    actual = _round_trip(lambda out: write_xlsx(df, out))
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+_SPECIAL_TEXT = [
+    '=1+1', '{=SUM(A1:A2*B1:B2)}', '=UNIQUE(A1:A3)', 'plain', 'http://example.com/a b#part',
+    'mailto:someone@example.com', 'internal:Sheet1!A1', 'external:c:\\data\\x.xlsx', None,
+]
+
+
+def _cells(buffer) -> list:
+    buffer.seek(0)
+    sheet = openpyxl.load_workbook(buffer).worksheets[0]
+    return [
+        (
+            # 배열 수식은 객체로 읽히므로 범위와 수식을 비교합니다
+            (cell.value.ref, cell.value.text) if hasattr(cell.value, 'text') else cell.value,
+            cell.data_type,
+            cell.hyperlink and (cell.hyperlink.target, cell.hyperlink.location),
+        )
+        for row in sheet.iter_rows() for cell in row
+    ]
+
+
+def test_write_xlsx_writes_formulas_and_urls_like_to_excel():
+    # xlsxwriter처럼 '='로 시작하는 문자열은 수식으로, URL은 하이퍼링크로 씁니다
+    df = pd.DataFrame({'=1+1': _SPECIAL_TEXT, 'shared': ['a', 'http://example.com'] * 4 + ['=A1']})
+    expected, actual = io.BytesIO(), io.BytesIO()
+    df.to_excel(expected, index=False, engine='xlsxwriter')
+    write_xlsx(df, actual)
+    assert _cells(actual) == _cells(expected)
+    assert ('=1+1', 'f', None) in _cells(actual)
+
+
+def test_csv_to_xlsx_stream_writes_formulas_and_urls_like_xlsxwriter():
+    df = pd.DataFrame({'text': _SPECIAL_TEXT})
+    expected, actual = io.BytesIO(), io.BytesIO()
+    df.to_excel(expected, index=False, engine='xlsxwriter')
+    csv_to_xlsx_stream(io.BytesIO(df.to_csv(index=False).encode()), actual)
+    assert _cells(actual) == _cells(expected)
+
+
+def test_write_xlsx_falls_back_for_multiindex_columns():
+    df = pd.DataFrame([[1, 2]], columns=pd.MultiIndex.from_tuples([('a', 'x'), ('a', 'y')]))
+    with pytest.raises(NotImplementedError):
+        # to_excel도 index=False인 다중 헤더는 쓰지 못합니다. 같은 오류를 내야 합니다
+        write_xlsx(df, io.BytesIO())
+
+
+def _header_cells(buffer) -> list:
+    buffer.seek(0)
+    sheet = openpyxl.load_workbook(buffer).worksheets[0]
+    return list(sheet[1])
+
+
+def test_header_style_of_each_xlsx_path():
+    csv = b"a,b\n1,x\n2,y\n"
+    outputs = []
+    for write in (
+        lambda out: write_xlsx(pd.read_csv(io.BytesIO(csv)), out),
+        lambda out: pd.read_csv(io.BytesIO(csv)).to_excel(out, index=False, engine='xlsxwriter'),
+        lambda out: csv_to_xlsx_stream(io.BytesIO(csv), out),
+        lambda out: merge_csvs_to_xlsx([('a', io.BytesIO(csv), {})], out),
+    ):
+        buffer = io.BytesIO()
+        write(buffer)
+        outputs.append([(cell.value, bool(cell.font.b), cell.border.left.style) for cell in _header_cells(buffer)])
+    # write_xlsx는 to_excel과 같은 헤더, 스트리밍과 병합은 지금까지처럼 굵게 테두리를 둘러 씁니다
+    assert outputs[0] == outputs[1]
+    assert outputs[2] == [('a', True, 'thin'), ('b', True, 'thin')]
+    assert outputs[3] == outputs[2]
+
+
+def test_csv_to_xlsx_stream_repeats_header_on_new_sheet():
+    csv = b"n,s\n" + b"".join(f"{i},=A{i}\n".encode() for i in range(5))
+    buffer = io.BytesIO()
+    result = csv_to_xlsx_stream(io.BytesIO(csv), buffer, chunk_rows=2, max_rows_per_sheet=3)
+    buffer.seek(0)
+    sheets = openpyxl.load_workbook(buffer).worksheets
+    assert result == {'rows': 5, 'sheets': 3}
+    assert [[cell.value for cell in row] for row in sheets[2].iter_rows()] == [['n', 's'], [4, '=A4']]
+    assert [cell.data_type for cell in sheets[1]['B']] == ['s', 'f', 'f']
+
+
+def test_write_xlsx_falls_back_for_tz_aware_dates():
+    df = pd.DataFrame({'t': pd.to_datetime(['2024-01-01 10:00']).tz_localize('Asia/Seoul')})
+    with pytest.raises(ValueError, match='timezones'):
+        # 빠른 경로가 못 쓰는 값은 to_excel에 넘겨 같은 오류를 냅니다
+        write_xlsx(df, io.BytesIO())